@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Compares the ways of dumping numpy arrays, like sampled curves:
+as a list of floats (what yamlns did before), and with each
+arrays style, timing dump and load and measuring the output.
+
+Usage: python benchmarks/arrays.py [rows] [columns]
+"""
+
+import sys
+import time
+import numpy
+from yamlns import namespace
+
+
+def measure(call):
+    start = time.perf_counter()
+    result = call()
+    return time.perf_counter() - start, result
+
+
+def main(rows="2000", columns="24"):
+    array = numpy.random.default_rng(1).random((int(rows), int(columns)))
+    print(
+        "{:8} {:8} {:>8} {:>8} {:>10}".format(
+            "arrays", "engine", "dump", "load", "size"
+        )
+    )
+    cases = [("list", "nodes", namespace(curve=[float(x) for x in array.ravel()]))]
+    cases += [
+        (arrays, engine, namespace(curve=array))
+        for arrays in ("plain", "tagged", "base64")
+        for engine in ("nodes", "events")
+    ]
+    for arrays, engine, data in cases:
+        style = "plain" if arrays == "list" else arrays
+        dumpTime, content = measure(lambda: data.dump(engine=engine, arrays=style))
+        loadTime, _ = measure(lambda: namespace.loads(content))
+        print(
+            "{:8} {:8} {:7.2f}s {:7.2f}s {:10}".format(
+                arrays, engine, dumpTime, loadTime, len(content)
+            )
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Compares loading a list of readings as namespaces and as a columnarlist:
+memory held, load time and the time to add up a field.
+
+Usage: python benchmarks/columnar.py [count]
+"""
+
+import sys
+import time
+import tracemalloc
+from yamlns import namespace
+
+
+def sampleYaml(count):
+    return "".join(
+        "- meter: M{:04}\n"
+        "  day: 2024-{:02}-{:02}\n"
+        "  hours: {}\n"
+        "  kwh: {}.{:02}\n".format(i % 1000, i % 12 + 1, i % 28 + 1, i % 24, i, i % 100)
+        for i in range(count)
+    )
+
+
+def measure(load):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    data = load()
+    elapsed = time.perf_counter() - start
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return data, after - before, elapsed
+
+
+def main(count="20000"):
+    count = int(count)
+    content = sampleYaml(count)
+
+    rows, rowBytes, rowTime = measure(lambda: namespace.loads(content))
+    columns, columnBytes, columnTime = measure(
+        lambda: namespace.loads(content, columnar=True)
+    )
+    print(
+        "namespaces:  {:6.0f} bytes/row  load {:6.2f}s".format(
+            rowBytes / count, rowTime
+        )
+    )
+    print(
+        "columnar:    {:6.0f} bytes/row  load {:6.2f}s".format(
+            columnBytes / count, columnTime
+        )
+    )
+    print("Ratio:       {:6.1f}x".format(rowBytes / columnBytes))
+
+    start = time.perf_counter()
+    rowTotal = sum(row.kwh for row in rows)
+    rowSum = time.perf_counter() - start
+    start = time.perf_counter()
+    columnTotal = columns.column("kwh").sum()
+    columnSum = time.perf_counter() - start
+    print("sum kwh: namespaces {:.3f}s columnar {:.3f}s".format(rowSum, columnSum))
+
+    assert rowTotal == columnTotal
+    assert columns.dump() == content
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
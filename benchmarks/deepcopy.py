@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Compares the structural `namespace.deepcopy()` with
+the former round trip through YAML text.
+
+Usage: python benchmarks/deepcopy.py [megabytes]
+"""
+
+import sys
+import time
+import decimal
+from yamlns import namespace
+from yamlns.dateutils import Date
+
+
+def sampleRecord(i):
+    return namespace(
+        code="A{:06}".format(i),
+        owner=namespace(name="John Doe", vat="ES12345678Z"),
+        date=Date("2024-01-31"),
+        lines=[
+            namespace(concept="energy", kwh=decimal.Decimal("123.45"), price=3),
+            namespace(concept="power", kwh=decimal.Decimal("0.5"), price=4),
+        ],
+    )
+
+
+def sampleDocument(megabytes):
+    "Builds a document that dumps to about the given size"
+    recordSize = len(namespace(records=[sampleRecord(0)]).dump()) - len("records:\n")
+    count = int(megabytes * 1024 * 1024 / recordSize)
+    return namespace(records=[sampleRecord(i) for i in range(count)])
+
+
+def timeit(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main(megabytes="10"):
+    data = sampleDocument(float(megabytes))
+    print("Document: {:.1f} MB".format(len(data.dump()) / 1024 / 1024))
+
+    yamlTime, yamlCopy = timeit(lambda data: data.loads(data.dump()), data)
+    print("YAML round trip: {:8.3f} s".format(yamlTime))
+
+    nativeTime, nativeCopy = timeit(namespace.deepcopy, data)
+    print("deepcopy():      {:8.3f} s".format(nativeTime))
+    print("Speed up:        {:8.1f}x".format(yamlTime / nativeTime))
+    assert nativeCopy == yamlCopy == data
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
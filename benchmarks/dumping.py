@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Compares the default node based dumper with the event based one
+on a big document: wall time and memory peak.
+
+Usage: python benchmarks/dumping.py [count]
+"""
+
+import io
+import sys
+import time
+import tracemalloc
+from loading import sampleYaml
+from yamlns import namespace
+
+
+def measure(dump):
+    start = time.perf_counter()
+    dump()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    dump()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(count="20000"):
+    count = int(count)
+    data = namespace.loads(sampleYaml(count), engine="events")
+    outputs = {}
+    for engine in ("nodes", "events"):
+        output = outputs[engine] = io.StringIO()
+
+        def dump():
+            output.seek(0)
+            output.truncate()
+            data.dump(output, engine=engine)
+
+        elapsed, peak = measure(dump)
+        print("{:7} {:6.2f}s  peak {:6.1f} MB".format(engine, elapsed, peak / 1e6))
+    assert outputs["nodes"].getvalue() == outputs["events"].getvalue()
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Compares loading and dumping JSON through the YAML machinery
+with the json module based functions.
+
+Usage: python benchmarks/json_loading.py [count]
+"""
+
+import sys
+import time
+from yamlns import namespace
+from loading import sampleYaml
+
+
+def measure(call):
+    start = time.perf_counter()
+    result = call()
+    return time.perf_counter() - start, result
+
+
+def main(count="20000"):
+    count = int(count)
+    data = namespace.loads(sampleYaml(count))
+    content = data.dump_json()
+    yamlTime, viaYaml = measure(lambda: namespace.loads(content))
+    jsonTime, viaJson = measure(lambda: namespace.loads_json(content))
+    assert viaYaml == viaJson
+    print("load  yaml {:6.2f}s  json {:6.2f}s".format(yamlTime, jsonTime))
+    yamlTime, _ = measure(lambda: data.dump())
+    jsonTime, _ = measure(lambda: data.dump_json())
+    print("dump  yaml {:6.2f}s  json {:6.2f}s".format(yamlTime, jsonTime))
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
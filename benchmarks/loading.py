@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Compares the default node based loader with the event based one
+on a big document: wall time and memory peak.
+
+Usage: python benchmarks/loading.py [count]
+"""
+
+import sys
+import time
+import tracemalloc
+from yamlns import namespace
+
+
+def sampleYaml(count):
+    return "contracts:\n" + "".join(
+        "- code: A{:06}\n"
+        "  owner:\n"
+        "    name: John Doe\n"
+        "    vat: ES12345678Z\n"
+        "  start: 2024-01-{:02}\n"
+        "  power: {}.{:03}\n"
+        "  active: true\n"
+        "  periods: [{}, {}, {}]\n".format(
+            i, i % 28 + 1, i % 10, i % 1000, i, i + 1, i + 2
+        )
+        for i in range(count)
+    )
+
+
+def measure(load):
+    start = time.perf_counter()
+    data = load()
+    elapsed = time.perf_counter() - start
+    del data
+    tracemalloc.start()
+    data = load()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return data, elapsed, current, peak
+
+
+def main(count="20000"):
+    count = int(count)
+    content = sampleYaml(count)
+    print("Document: {:.1f} MB".format(len(content) / 1e6))
+    results = {}
+    for engine in ("nodes", "events"):
+        data, elapsed, current, peak = measure(
+            lambda: namespace.loads(content, engine=engine)
+        )
+        results[engine] = data
+        print(
+            "{:7} {:6.2f}s  result {:6.1f} MB  peak {:6.1f} MB".format(
+                engine, elapsed, current / 1e6, peak / 1e6
+            )
+        )
+    assert results["nodes"] == results["events"]
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of namespace attribute and item access,
+and memory per instance.
+
+Compares the dict backed `namespace` with the OrderedDict backed
+`orderednamespace` and with a copy of the 0.12 implementation.
+
+Usage: python benchmarks/namespace_access.py
+"""
+
+import sys
+import timeit
+import tracemalloc
+from collections import OrderedDict
+from yamlns import namespace, orderednamespace
+
+
+class legacynamespace(OrderedDict):
+    "namespace as implemented in yamlns 0.12"
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError as e:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        if name.startswith("_"):
+            super(legacynamespace, self).__setattr__(name, value)
+        else:
+            self[name] = value
+
+    def __getitem__(self, name):
+        if not hasattr(name, "split"):
+            return super(legacynamespace, self).__getitem__(name)
+        parts = name.split(".", 1)
+        result = super(legacynamespace, self).__getitem__(parts[0])
+        if parts[1:]:
+            return result[parts[1]]
+        return result
+
+    def __setitem__(self, name, value):
+        if not hasattr(name, "split"):
+            return super(legacynamespace, self).__setitem__(name, value)
+        parts = name.split(".", 1)
+        if not parts[1:]:
+            return super(legacynamespace, self).__setitem__(parts[0], value)
+        level = self.setdefault(parts[0], legacynamespace())
+        level[parts[1]] = value
+
+
+classes = [legacynamespace, orderednamespace, namespace]
+
+cases = [
+    ("getattr", "data.name"),
+    ("setattr", "data.name = 'value'"),
+    ("getitem", "data['name']"),
+    ("setitem", "data['name'] = 'value'"),
+    ("getitem dotted", "data['sub.name']"),
+]
+
+
+def timePerCall(cls, statement, number=200000):
+    data = cls(name="value", price=3, code="A", sub=cls(name="value"))
+    timer = timeit.Timer(statement, globals=dict(data=data))
+    return min(timer.repeat(repeat=5, number=number)) / number
+
+
+def bytesPerInstance(cls, count=20000):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    items = [cls(name="value", price=3, code="A", date=None) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del items
+    return total / count
+
+
+def main():
+    header = "{:16}".format("") + "".join(
+        "{:>18}".format(cls.__name__) for cls in classes
+    )
+    print(header)
+    for name, statement in cases:
+        print(
+            "{:16}".format(name)
+            + "".join(
+                "{:>15.1f} ns".format(timePerCall(cls, statement) * 1e9)
+                for cls in classes
+            )
+        )
+    print(
+        "{:16}".format("bytes/instance")
+        + "".join("{:>18.0f}".format(bytesPerInstance(cls)) for cls in classes)
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Compares the floats policies of the loader on a numeric dense
+document, like hourly meter curves: loading, summing every value
+after loading, and dumping it back.
+
+Usage: python benchmarks/numeric.py [count]
+"""
+
+import sys
+import time
+from yamlns import namespace
+
+
+def sampleCurves(count):
+    lines = []
+    for i in range(count):
+        lines.append(u"- meter: M{:05d}".format(i))
+        lines.append(u"  day: 2024-01-{:02d}".format(i % 28 + 1))
+        lines.append(
+            u"  kwh: [{}]".format(
+                u", ".join(u"{}.{:03d}".format(h, (i * h) % 1000) for h in range(24))
+            )
+        )
+    return u"\n".join(lines) + u"\n"
+
+
+def measure(call):
+    start = time.perf_counter()
+    result = call()
+    return time.perf_counter() - start, result
+
+
+def main(count="5000"):
+    count = int(count)
+    content = sampleCurves(count)
+    print(
+        "{:8} {:8} {:>8} {:>8} {:>8}".format("engine", "floats", "load", "sum", "dump")
+    )
+    for engine in ("nodes", "events"):
+        for floats in ("decimal", "float", "lazy"):
+            loadTime, data = measure(
+                lambda: namespace.loads(content, floats=floats, engine=engine)
+            )
+            sumTime, _ = measure(
+                lambda: [sum(record.kwh[1:], record.kwh[0]) for record in data]
+            )
+            dumpTime, _ = measure(lambda: namespace.dump(data, engine=engine))
+            print(
+                "{:8} {:8} {:7.2f}s {:7.2f}s {:7.2f}s".format(
+                    engine, floats, loadTime, sumTime, dumpTime
+                )
+            )
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Compares compiled queries with the equivalent hand written loops.
+
+Usage: python benchmarks/query.py [contracts]
+"""
+
+import sys
+import timeit
+import decimal
+from yamlns import namespace
+
+
+def sampleDocument(contracts):
+    return namespace(
+        contracts=[
+            namespace(
+                name="C{:06}".format(i),
+                active=i % 3 != 0,
+                periods=[
+                    namespace(month=month, kwh=decimal.Decimal(i % 97 + month))
+                    for month in range(12)
+                ],
+            )
+            for i in range(contracts)
+        ]
+    )
+
+
+def handWildcard(data):
+    return [period.kwh for contract in data.contracts for period in contract.periods]
+
+
+def handFilter(data):
+    return [
+        period.kwh
+        for contract in data.contracts
+        if contract.active
+        for period in contract.periods
+        if period.kwh > 50
+    ]
+
+
+def handPaths(data):
+    return [
+        (["contracts", i, "periods", j, "kwh"], period.kwh)
+        for i, contract in enumerate(data.contracts)
+        for j, period in enumerate(contract.periods)
+    ]
+
+
+def report(name, hand, query, data, **kwds):
+    compiled = namespace.compileQuery(query)
+    assert hand(data) == list(compiled.find(data, **kwds))
+    repeat = 5
+    handTime = min(timeit.repeat(lambda: hand(data), number=1, repeat=repeat))
+    queryTime = min(
+        timeit.repeat(
+            lambda: list(compiled.find(data, **kwds)), number=1, repeat=repeat
+        )
+    )
+    print(
+        "{:10} loops: {:7.3f} s  query: {:7.3f} s  ratio: {:4.1f}x  {}".format(
+            name, handTime, queryTime, queryTime / handTime, query
+        )
+    )
+
+
+def main(contracts="20000"):
+    data = sampleDocument(int(contracts))
+    report("wildcards", handWildcard, "contracts.*.periods.*.kwh", data)
+    report(
+        "filters",
+        handFilter,
+        "contracts[?active].periods[?kwh > 50].kwh",
+        data,
+    )
+    report("paths", handPaths, "contracts.*.periods.*.kwh", data, paths=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
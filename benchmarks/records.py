@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Compares the memory and access time of namespaces
+and slotted records generated with `recordClass`.
+
+Usage: python benchmarks/records.py [count]
+"""
+
+import sys
+import timeit
+import decimal
+import tracemalloc
+from yamlns import namespace
+from yamlns.records import recordClass
+
+
+def sampleRecord(i):
+    return namespace(
+        code="A{:06}".format(i),
+        owner=namespace(name="John Doe", vat="ES12345678Z"),
+        kwh=decimal.Decimal(i),
+    )
+
+
+def measure(build, count):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = build(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return items, (after - before) / count
+
+
+def main(count="100000"):
+    count = int(count)
+    # Shared leaves, so just containers are measured
+    samples = [sampleRecord(i) for i in range(count)]
+    Contract = recordClass(samples[0], "Contract")
+
+    namespaces, namespaceBytes = measure(
+        lambda count: [
+            namespace(code=s.code, owner=namespace(s.owner), kwh=s.kwh) for s in samples
+        ],
+        count,
+    )
+    records, recordBytes = measure(
+        lambda count: [
+            Contract(code=s.code, owner=s.owner, kwh=s.kwh) for s in samples
+        ],
+        count,
+    )
+    print("namespace: {:6.0f} bytes/record".format(namespaceBytes))
+    print("record:    {:6.0f} bytes/record".format(recordBytes))
+    print("Ratio:     {:6.1f}x".format(namespaceBytes / recordBytes))
+
+    for name, items in (("namespace", namespaces), ("record", records)):
+        item = items[0]
+        print(
+            "{:10} attribute: {:5.0f} ns  nested: {:5.0f} ns  dotted: {:5.0f} ns".format(
+                name,
+                timeit.timeit(lambda: item.code, number=100000) * 1e4,
+                timeit.timeit(lambda: item.owner.vat, number=100000) * 1e4,
+                timeit.timeit(lambda: item["owner.vat"], number=100000) * 1e4,
+            )
+        )
+    assert records[5] == namespaces[5]
+    assert records[5].dump() == namespaces[5].dump()
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Compares loading a big YAML file with reading its binary sidecar.
+
+Usage: python benchmarks/sidecar.py [count]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from yamlns import namespace
+from loading import sampleYaml
+
+
+def measure(call):
+    start = time.perf_counter()
+    result = call()
+    return time.perf_counter() - start, result
+
+
+def main(count="20000"):
+    count = int(count)
+    folder = tempfile.mkdtemp()
+    try:
+        source = os.path.join(folder, "sample.yaml")
+        with open(source, "w") as f:
+            f.write(sampleYaml(count))
+        yamlTime, expected = measure(lambda: namespace.load(source))
+        writeTime, _ = measure(lambda: namespace.load(source, sidecar=True))
+        readTime, result = measure(lambda: namespace.load(source, sidecar=True))
+        assert result == expected
+        print(
+            "yaml {:6.2f}s  writing sidecar {:6.2f}s  reading sidecar {:6.2f}s"
+            " ({:.0f}x faster)".format(
+                yamlTime, writeTime, readTime, yamlTime / readTime
+            )
+        )
+        print(
+            "yaml {:6.1f} MB  sidecar {:6.1f} MB".format(
+                os.path.getsize(source) / 1e6,
+                os.path.getsize(os.path.join(folder, "sample.yamlc")) / 1e6,
+            )
+        )
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Measures dumps and loads per second of small documents,
+where the per call setup dominates, for each engine.
+
+Usage: python benchmarks/small_documents.py [count]
+"""
+
+import sys
+import time
+from yamlns import namespace
+
+sample = namespace(
+    id=1,
+    name="meter",
+    kwh=namespace(p1=1.5, p2=2.25),
+    periods=[1, 2, 3],
+)
+
+
+def rate(count, call):
+    start = time.perf_counter()
+    for _ in range(count):
+        call()
+    return count / (time.perf_counter() - start)
+
+
+def main(count="20000"):
+    count = int(count)
+    text = sample.dump()
+    for engine in ("nodes", "events"):
+        dumps = rate(count, lambda: sample.dump(engine=engine))
+        loads = rate(count, lambda: namespace.loads(text, engine=engine))
+        print("{:7} dumps {:8.0f}/s  loads {:8.0f}/s".format(engine, dumps, loads))
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
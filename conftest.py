@@ -0,0 +1,18 @@
+import sys
+
+# Module doctests show Python 3 reprs and print with end='',
+# they are checked just in Python 3
+collect_ignore = []
+if sys.version_info < (3,):
+    collect_ignore += [
+        "yamlns/caching.py",
+        "yamlns/columnar.py",
+        "yamlns/eventdumper.py",
+        "yamlns/eventloader.py",
+        "yamlns/jsonio.py",
+        "yamlns/records.py",
+        "yamlns/sidecar.py",
+        "yamlns/streaming.py",
+    ]
+
+# vim: sw=4 ts=4 noet
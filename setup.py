@@ -19,6 +19,7 @@ setup(
 	entry_points=dict(
 		console_scripts = [
 			'json2yaml = yamlns.cli.json2yaml:main',
+			'yaml2json = yamlns.cli.yaml2json:main',
 			'nstemplate = yamlns.cli.nstemplate:main',
 			'nstemplate.py = yamlns.cli.nstemplate:deprecated', # backwards compatibility
 		],
@@ -1 +1,3 @@
-from .core import ns, namespace
+from .core import ns, namespace, orderednamespace
+from .frozen import frozennamespace
+from .fingerprint import trackednamespace
@@ -0,0 +1,224 @@
+"""
+Caches of parsed YAML documents.
+
+A ParseCache keeps the results of parsing the same texts
+over and over, like templates, fixtures or canned responses.
+A FileCache keeps the results of loading the same files,
+parsing them again only when they change.
+Callers never share mutable results with the caches:
+they get a structural copy or, if the cache is frozen,
+a shared immutable result.
+
+>>> from yamlns import ns
+>>> cache = ParseCache()
+>>> first = ns.loads('a: 1', cache=cache)
+>>> first.a = 2
+>>> ns.loads('a: 1', cache=cache)
+namespace({'a': 1})
+>>> cache.hits, cache.misses
+(1, 1)
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from .compat import text
+
+_missing = object()
+
+
+def _digest(content):
+    return hashlib.sha256(content.encode("utf8")).digest()
+
+
+class _DocumentCache(object):
+    """
+    Thread safe LRU of loaded documents.
+    Each entry keeps the result, its size in bytes
+    and a signature that must match for the entry to be valid.
+    """
+
+    def __init__(self, maxBytes, frozen):
+        self.maxBytes = maxBytes
+        self.frozen = frozen
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def _check(self, columnar):
+        if self.frozen and columnar:
+            raise ValueError("Columnar results cannot be frozen")
+
+    def _copy(self, result):
+        if self.frozen:
+            return result
+        from .copying import deepcopy
+
+        return deepcopy(result)
+
+    def _get(self, key, signature):
+        "Returns the entry result if valid, or _missing. Call it locked"
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            if entry[2] == signature:
+                self._entries[key] = entry
+                self.hits += 1
+                return entry[0]
+            self.size -= entry[1]
+        self.misses += 1
+        return _missing
+
+    def _put(self, key, result, size, signature):
+        "Stores the result, prepared for sharing, and returns it"
+        if self.frozen:
+            from .frozen import freeze
+
+            result = freeze(result)
+        if size > self.maxBytes:
+            return result
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:  # Loaded meanwhile by another thread
+                self.size -= previous[1]
+            self._entries[key] = result, size, signature
+            self.size += size
+            while self.size > self.maxBytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= evicted[1]
+                self.evictions += 1
+        return result
+
+    def clear(self):
+        "Drops every entry, keeping the counters"
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self):
+        "Returns the counters and sizes as a namespace"
+        from .core import namespace
+
+        with self._lock:
+            return namespace(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                entries=len(self._entries),
+                size=self.size,
+                maxBytes=self.maxBytes,
+            )
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ParseCache(_DocumentCache):
+    """
+    LRU cache of loaded documents keyed by a hash
+    of the YAML text and the load options.
+
+    Entries are accounted by the size in bytes of their text,
+    the least recently used ones are evicted to keep the total
+    under `maxBytes`. Texts bigger than that are not cached.
+
+    If `frozen` is set, results are frozen once
+    (see yamlns.frozen.freeze) and shared by every hit.
+    Otherwise each call returns a deep copy of the cached result.
+
+    Counters `hits`, `misses` and `evictions`
+    and the current `size` are available.
+    """
+
+    def __init__(self, maxBytes=16 << 20, frozen=False):
+        super(ParseCache, self).__init__(maxBytes, frozen)
+
+    def loads(self, cls, content, columnar=False, engine="nodes", floats="decimal"):
+        """
+        Returns what cls.loads(content, **options) would return,
+        parsing the content only if it is not cached.
+        """
+        self._check(columnar)
+        content = text(content)
+        key = (cls, _digest(content), columnar, engine, floats)
+        with self._lock:
+            result = self._get(key, None)
+        if result is _missing:
+            result = cls.loads(content, columnar=columnar, engine=engine, floats=floats)
+            size = len(content.encode("utf8"))
+            result = self._put(key, result, size, None)
+        return self._copy(result)
+
+
+def _signature(stat):
+    "What changes in the stat of a file when it is modified or replaced"
+    mtime = getattr(stat, "st_mtime_ns", stat.st_mtime)  # Py2
+    return mtime, stat.st_size, stat.st_ino
+
+
+class FileCache(_DocumentCache):
+    """
+    LRU cache of documents loaded from files, keyed by
+    their resolved path and the load options.
+
+    Entries are validated at every load with the modification
+    time, size and inode of the file, so the file is read
+    and parsed again only when it has been modified or replaced.
+
+    Sizes are accounted, results are isolated and
+    counters are kept as in ParseCache.
+    """
+
+    def __init__(self, maxBytes=256 << 20, frozen=False):
+        super(FileCache, self).__init__(maxBytes, frozen)
+
+    def load(self, cls, source, **options):
+        """
+        Returns what cls.load(source, **options) would return,
+        loading the file only if it changed.
+        """
+        return self.loadMany(cls, [source], **options)[0]
+
+    def loadMany(self, cls, sources, columnar=False, engine="nodes", floats="decimal"):
+        """
+        Returns the list of documents loaded from the paths in sources.
+        The files are checked together, with a single pass of
+        stat calls and a single lookup in the cache.
+        """
+        self._check(columnar)
+        for source in sources:
+            if hasattr(source, "read"):
+                raise ValueError("Only files given by path can be cached")
+        paths = [os.path.realpath(str(source)) for source in sources]
+        stats = [os.stat(path) for path in paths]
+        keys = [(cls, path, columnar, engine, floats) for path in paths]
+        signatures = [_signature(stat) for stat in stats]
+        with self._lock:
+            results = [
+                self._get(key, signature) for key, signature in zip(keys, signatures)
+            ]
+        for i, result in enumerate(results):
+            if result is not _missing:
+                continue
+            result = cls.load(paths[i], columnar=columnar, engine=engine, floats=floats)
+            results[i] = self._put(keys[i], result, stats[i].st_size, signatures[i])
+        return [self._copy(result) for result in results]
+
+    def invalidate(self, path=None):
+        "Forgets the documents loaded from path, or every one if None"
+        if path is None:
+            return self.clear()
+        path = os.path.realpath(str(path))
+        with self._lock:
+            for key in [key for key in self._entries if key[1] == path]:
+                self.size -= self._entries.pop(key)[1]
+
+
+# Process wide FileCache
+fileCache = FileCache()
+
+
+# vim: sw=4 ts=4 noet
@@ -0,0 +1,303 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+import io
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from decimal import Decimal
+from .core import namespace
+from .frozen import frozennamespace
+from .fingerprint import trackednamespace
+from .columnar import columnarlist
+from .caching import ParseCache, FileCache
+
+yamlContent = u"""\
+name: template
+records:
+- kwh: 1.5
+- kwh: 2.5
+"""
+
+
+class ParseCache_Test(unittest.TestCase):
+
+    def test_miss_parses(self):
+        cache = ParseCache()
+        result = namespace.loads(yamlContent, cache=cache)
+        self.assertEqual(result, namespace.loads(yamlContent))
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+    def test_hit(self):
+        cache = ParseCache()
+        namespace.loads(yamlContent, cache=cache)
+        result = namespace.loads(yamlContent, cache=cache)
+        self.assertEqual(result, namespace.loads(yamlContent))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_copies_isolateCallers(self):
+        cache = ParseCache()
+        first = namespace.loads(yamlContent, cache=cache)
+        first.name = "changed"
+        first.records[0].kwh = 0
+        second = namespace.loads(yamlContent, cache=cache)
+        self.assertEqual(second, namespace.loads(yamlContent))
+        self.assertIsNot(second, first)
+        self.assertIsNot(second.records, first.records)
+
+    def test_frozen_shared(self):
+        cache = ParseCache(frozen=True)
+        first = namespace.loads(yamlContent, cache=cache)
+        second = namespace.loads(yamlContent, cache=cache)
+        self.assertIs(first, second)
+        self.assertIsInstance(first, frozennamespace)
+        self.assertEqual(first.records[1].kwh, Decimal("2.5"))
+        with self.assertRaises(TypeError):
+            first.name = "changed"
+
+    def test_frozen_columnar_fails(self):
+        with self.assertRaises(ValueError) as ctx:
+            namespace.loads(yamlContent, cache=ParseCache(frozen=True), columnar=True)
+        self.assertEqual(format(ctx.exception), "Columnar results cannot be frozen")
+
+    def test_lazy_fails(self):
+        with self.assertRaises(ValueError) as ctx:
+            namespace.loads(yamlContent, cache=ParseCache(), lazy=True)
+        self.assertEqual(format(ctx.exception), "Lazy loads cannot be cached")
+
+    def test_options_inKey(self):
+        cache = ParseCache()
+        namespace.loads(yamlContent, cache=cache)
+        result = namespace.loads(yamlContent, cache=cache, columnar=True)
+        self.assertIsInstance(result.records, columnarlist)
+        self.assertEqual(result.records[1].kwh, Decimal("2.5"))
+        namespace.loads(yamlContent, cache=cache, engine="events")
+        self.assertEqual((cache.hits, cache.misses), (0, 3))
+
+    def test_class_inKey(self):
+        cache = ParseCache()
+        namespace.loads(yamlContent, cache=cache)
+        result = trackednamespace.loads(yamlContent, cache=cache)
+        self.assertIsInstance(result, trackednamespace)
+        self.assertEqual(cache.misses, 2)
+
+    def test_bytesContent(self):
+        cache = ParseCache()
+        namespace.loads(u"a: caña\n", cache=cache)
+        result = namespace.loads(u"a: caña\n".encode("utf8"), cache=cache)
+        self.assertEqual(result, namespace(a=u"caña"))
+        self.assertEqual(cache.hits, 1)
+
+    def test_size_inBytes(self):
+        cache = ParseCache()
+        namespace.loads(u"a: caña\n", cache=cache)
+        self.assertEqual(cache.size, 9)
+
+    def test_eviction_leastRecentlyUsed(self):
+        cache = ParseCache(maxBytes=15)
+        namespace.loads(u"a: 1\n", cache=cache)
+        namespace.loads(u"b: 1\n", cache=cache)
+        namespace.loads(u"c: 1\n", cache=cache)
+        namespace.loads(u"a: 1\n", cache=cache)  # b is now the oldest
+        namespace.loads(u"d: 1\n", cache=cache)
+        self.assertEqual((cache.evictions, cache.size, len(cache)), (1, 15, 3))
+        namespace.loads(u"a: 1\n", cache=cache)
+        namespace.loads(u"b: 1\n", cache=cache)
+        self.assertEqual((cache.hits, cache.misses), (2, 5))
+
+    def test_tooBig_notCached(self):
+        cache = ParseCache(maxBytes=4)
+        self.assertEqual(namespace.loads(u"a: 1\n", cache=cache), namespace(a=1))
+        self.assertEqual((len(cache), cache.size, cache.evictions), (0, 0, 0))
+
+    def test_clear(self):
+        cache = ParseCache()
+        namespace.loads(yamlContent, cache=cache)
+        cache.clear()
+        namespace.loads(yamlContent, cache=cache)
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+
+    def test_stats(self):
+        cache = ParseCache(maxBytes=100)
+        namespace.loads(u"a: 1\n", cache=cache)
+        namespace.loads(u"a: 1\n", cache=cache)
+        self.assertEqual(
+            cache.stats(),
+            namespace(hits=1, misses=1, evictions=0, entries=1, size=5, maxBytes=100),
+        )
+
+    def test_threads(self):
+        cache = ParseCache()
+        results = []
+
+        def load():
+            for i in range(20):
+                results.append(namespace.loads(u"a: {}\n".format(i % 5), cache=cache))
+
+        threads = [threading.Thread(target=load) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(results), 80)
+        self.assertEqual(cache.hits + cache.misses, 80)
+        self.assertEqual((len(cache), cache.size), (5, 25))
+
+
+class FileCache_Test(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, name, content, mtime=None):
+        filename = os.path.join(self.dir, name)
+        with io.open(filename, "w", encoding="utf8") as f:
+            f.write(content)
+        if mtime is not None:
+            os.utime(filename, (mtime, mtime))
+        return filename
+
+    def test_miss_loads(self):
+        cache = FileCache()
+        filename = self.write("a.yaml", yamlContent)
+        result = namespace.load(filename, cache=cache)
+        self.assertEqual(result, namespace.loads(yamlContent))
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        self.assertEqual(cache.size, len(yamlContent))
+
+    def test_unchanged_hit(self):
+        cache = FileCache()
+        filename = self.write("a.yaml", yamlContent)
+        namespace.load(filename, cache=cache)
+        result = namespace.load(filename, cache=cache)
+        self.assertEqual(result, namespace.loads(yamlContent))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_copies_isolateCallers(self):
+        cache = FileCache()
+        filename = self.write("a.yaml", yamlContent)
+        namespace.load(filename, cache=cache).records[0].kwh = 0
+        result = namespace.load(filename, cache=cache)
+        self.assertEqual(result.records[0].kwh, Decimal("1.5"))
+
+    def test_frozen_shared(self):
+        cache = FileCache(frozen=True)
+        filename = self.write("a.yaml", yamlContent)
+        first = namespace.load(filename, cache=cache)
+        self.assertIsInstance(first, frozennamespace)
+        self.assertIs(namespace.load(filename, cache=cache), first)
+
+    def test_modified_reloads(self):
+        cache = FileCache()
+        filename = self.write("a.yaml", u"a: 1\n", mtime=1000)
+        namespace.load(filename, cache=cache)
+        self.write("a.yaml", u"a: 2\n", mtime=2000)
+        self.assertEqual(namespace.load(filename, cache=cache), namespace(a=2))
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (0, 2, 1))
+
+    def test_sizeChanged_reloads(self):
+        cache = FileCache()
+        filename = self.write("a.yaml", u"a: 1\n", mtime=1000)
+        namespace.load(filename, cache=cache)
+        self.write("a.yaml", u"a: 10\n", mtime=1000)
+        self.assertEqual(namespace.load(filename, cache=cache), namespace(a=10))
+        self.assertEqual(cache.size, 6)
+
+    def test_replaced_reloads(self):
+        cache = FileCache()
+        filename = self.write("a.yaml", u"a: 1\n", mtime=1000)
+        namespace.load(filename, cache=cache)
+        other = self.write("b.yaml", u"a: 2\n", mtime=1000)
+        os.rename(other, filename)
+        self.assertEqual(namespace.load(filename, cache=cache), namespace(a=2))
+
+    def test_resolvedPath(self):
+        cache = FileCache()
+        filename = self.write("a.yaml", yamlContent)
+        namespace.load(filename, cache=cache)
+        namespace.load(os.path.join(self.dir, ".", "a.yaml"), cache=cache)
+        self.assertEqual(cache.hits, 1)
+
+    def test_openFile_fails(self):
+        filename = self.write("a.yaml", yamlContent)
+        with io.open(filename, encoding="utf8") as f:
+            with self.assertRaises(ValueError) as ctx:
+                namespace.load(f, cache=FileCache())
+        self.assertEqual(
+            format(ctx.exception), "Only files given by path can be cached"
+        )
+
+    def test_lazy_fails(self):
+        filename = self.write("a.yaml", yamlContent)
+        with self.assertRaises(ValueError):
+            namespace.load(filename, cache=FileCache(), lazy=True)
+
+    def test_options_inKey(self):
+        cache = FileCache()
+        filename = self.write("a.yaml", yamlContent)
+        namespace.load(filename, cache=cache)
+        result = namespace.load(filename, cache=cache, columnar=True)
+        self.assertIsInstance(result.records, columnarlist)
+        self.assertEqual(result.records[1].kwh, Decimal("2.5"))
+        self.assertEqual(cache.misses, 2)
+
+    def test_missingFile_fails(self):
+        with self.assertRaises(OSError):
+            namespace.load(os.path.join(self.dir, "missing.yaml"), cache=FileCache())
+
+    def test_invalidate_path(self):
+        cache = FileCache()
+        a = self.write("a.yaml", u"a: 1\n")
+        b = self.write("b.yaml", u"b: 1\n")
+        namespace.load(a, cache=cache)
+        namespace.load(a, cache=cache, engine="events")
+        namespace.load(b, cache=cache)
+        cache.invalidate(a)
+        self.assertEqual((len(cache), cache.size), (1, 5))
+
+    def test_invalidate_all(self):
+        cache = FileCache()
+        namespace.load(self.write("a.yaml", u"a: 1\n"), cache=cache)
+        cache.invalidate()
+        self.assertEqual((len(cache), cache.size), (0, 0))
+
+    def test_eviction(self):
+        cache = FileCache(maxBytes=10)
+        for name in "abc":
+            namespace.load(self.write(name + ".yaml", u"a: 1\n"), cache=cache)
+        self.assertEqual((cache.evictions, len(cache)), (1, 2))
+
+    def test_loadMany(self):
+        cache = FileCache()
+        a = self.write("a.yaml", u"a: 1\n")
+        b = self.write("b.yaml", u"b: 1\n")
+        namespace.load(a, cache=cache)
+        self.assertEqual(
+            namespace.loadMany([a, b, a], cache=cache),
+            [namespace(a=1), namespace(b=1), namespace(a=1)],
+        )
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+    def test_loadMany_withoutCache(self):
+        a = self.write("a.yaml", u"a: 1\n")
+        self.assertEqual(namespace.loadMany([a, a]), [namespace(a=1)] * 2)
+
+    def test_trackedNamespace(self):
+        cache = FileCache()
+        filename = self.write("a.yaml", yamlContent)
+        result = trackednamespace.load(filename, cache=cache)
+        self.assertIsInstance(result, trackednamespace)
+        trackednamespace.load(filename, cache=cache)
+        self.assertEqual(cache.hits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: sw=4 ts=4 noet
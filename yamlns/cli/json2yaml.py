@@ -1,5 +1,31 @@
 import sys
-from ..core import ns
+from ..core import ns, _dump
+
+
+def loads(content):
+    """Loads content with the json module if it looks like JSON,
+    or as YAML otherwise.
+    """
+    if content.lstrip()[:1] in ("{", "["):
+        try:
+            return ns.loads_json(content)
+        except ValueError:  # YAML flow collections
+            pass
+    return ns.loads(content)
+
+
+def bufferedStdout():  # pragma: no cover
+    "Standard output with a big write buffer"
+    import io
+
+    sys.stdout.flush()
+    return io.open(
+        sys.stdout.fileno(),
+        "w",
+        encoding="utf8",
+        buffering=1 << 20,
+        closefd=False,
+    )
 
 
 def main():  # pragma: no cover
@@ -8,7 +34,20 @@ def main():  # pragma: no cover
     parser = argparse.ArgumentParser(
         description="Converts JSON into pretty printed YAML.",
     )
+    parser.add_argument(
+        "--lines",
+        action="store_true",
+        help="reads JSON Lines, or concatenated JSON values, "
+        "incrementally and writes a YAML document for each one",
+    )
     args = parser.parse_args()
 
-    data = ns.load(sys.stdin)
-    data.dump(sys.stdout)
+    if args.lines:
+        from ..jsonio import iterJson
+
+        with bufferedStdout() as output:
+            ns.dump_all(iterJson(sys.stdin), output)
+        return
+
+    data = loads(sys.stdin.read())
+    _dump(data, sys.stdout)
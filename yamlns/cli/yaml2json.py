@@ -0,0 +1,17 @@
+import sys
+from ..core import ns
+from ..jsonio import dumpJsonLines
+from .json2yaml import bufferedStdout
+
+
+def main():  # pragma: no cover
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Converts a stream of YAML documents into JSON Lines, "
+        "a document at a time.",
+    )
+    args = parser.parse_args()
+
+    with bufferedStdout() as output:
+        dumpJsonLines(ns.load_all(sys.stdin), output)
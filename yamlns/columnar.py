@@ -0,0 +1,735 @@
+"""
+Column oriented storage for lists of namespaces with the same fields.
+
+Each field is kept in a single compact column:
+`array.array` of machine integers, floats or booleans,
+`Decimal` as integer mantissas and exponents, dates as ordinals,
+and a plain list for any other value.
+Rows are views that behave like namespaces,
+columns provide the values as numpy arrays for vectorised maths.
+
+>>> from yamlns import ns
+>>> readings = columnarlist([
+...     ns(meter='A', day=Date(2024, 1, 1), kwh=Decimal('10.5')),
+...     ns(meter='B', day=Date(2024, 1, 1), kwh=Decimal('7.25')),
+... ])
+>>> readings[1].kwh
+Decimal('7.25')
+>>> readings.column('kwh').sum()
+Decimal('17.75')
+>>> print(readings.dump(), end='')
+- meter: A
+  day: 2024-01-01
+  kwh: 10.5
+- meter: B
+  day: 2024-01-01
+  kwh: 7.25
+"""
+
+import array
+import datetime
+import yaml
+from decimal import Decimal
+from .core import namespace, _base, _strtypes, _dump
+from .dateutils import Date
+from .paths import compilePath
+from .serialization import NamespaceYamlDumper, NamespaceYAMLLoader
+
+try:
+    from collections.abc import Mapping, MutableSequence
+except ImportError:  # Py2
+    from collections import Mapping, MutableSequence
+
+
+class _Missing(object):
+    "Marks a field absent in a row"
+
+    def __repr__(self):
+        return "<missing>"
+
+
+_missing = _Missing()
+
+# Py2 array has no "q", its "l" is 64 bits wide on LP64 systems
+try:
+    array.array("q")
+    _int64 = "q"
+except ValueError:
+    _int64 = "l"
+_intBits = array.array(_int64).itemsize * 8
+_decimalDigits = 18 if _intBits == 64 else 9
+
+
+class Column(object):
+    """
+    The values of a field for all the rows.
+    Indexing and iterating give the values as stored in the rows.
+    `array` is the storage backend and `asarray()` returns
+    the values as a numpy array.
+
+    This base class keeps any value in a list.
+    """
+
+    kind = "object"
+
+    def __init__(self, values=()):
+        self._data = list(values)
+
+    def accepts(self, value):
+        "Whether the column can store the value"
+        return True
+
+    def _encode(self, value):
+        return value
+
+    def _decode(self, stored):
+        return stored
+
+    def _empty(self):
+        "An empty column of the same kind"
+        return type(self)()
+
+    @property
+    def array(self):
+        "The storage of the column"
+        return self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        return (None if value is _missing else value for value in self._values())
+
+    def _values(self):
+        "Decoded values, _missing for absent ones"
+        return iter(self._data)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        value = self._get(position)
+        return None if value is _missing else value
+
+    def _get(self, position):
+        return self._decode(self._data[position])
+
+    def _set(self, position, value):
+        self._data[position] = self._encode(value)
+
+    def _insert(self, position, value):
+        self._data.insert(position, self._encode(value))
+
+    def _delete(self, position):
+        del self._data[position]
+
+    def _slice(self, positions):
+        result = self._empty()
+        result._data = self._data[positions]
+        return result
+
+    def asarray(self):
+        "The values as a numpy array, missing values as None"
+        import numpy
+
+        return numpy.array(list(self), dtype=object)
+
+    def __array__(self, dtype=None, copy=None):
+        result = self.asarray()
+        return result if dtype is None else result.astype(dtype)
+
+    def sum(self):
+        "Sum of the present values"
+        values = [value for value in self if value is not None]
+        return sum(values[1:], values[0]) if values else 0
+
+    def __repr__(self):
+        return "{}({!r})".format(type(self).__name__, list(self))
+
+
+class _ArrayColumn(Column):
+    "Values of a single type stored in an array.array"
+
+    typecode = None
+    dtype = None
+    pytype = None
+
+    def __init__(self, values=()):
+        encode = self._encode
+        self._data = array.array(self.typecode, [encode(value) for value in values])
+
+    def accepts(self, value):
+        return type(value) is self.pytype
+
+    def _values(self):
+        decode = self._decode
+        return (decode(value) for value in self._data)
+
+    def asarray(self):
+        import numpy
+
+        return numpy.array(self._data, dtype=self.dtype)
+
+    def sum(self):
+        return sum(self)
+
+
+class IntColumn(_ArrayColumn):
+    kind = "int"
+    typecode = _int64
+    dtype = "int64"
+    pytype = int
+
+    def accepts(self, value):
+        limit = 1 << (_intBits - 1)
+        return type(value) is int and -limit <= value < limit
+
+
+class FloatColumn(_ArrayColumn):
+    kind = "float"
+    typecode = "d"
+    dtype = "float64"
+    pytype = float
+
+    def sum(self):
+        import math
+
+        return math.fsum(self._data)
+
+
+class BoolColumn(_ArrayColumn):
+    kind = "bool"
+    typecode = "b"
+    dtype = "bool"
+    pytype = bool
+
+    def _decode(self, stored):
+        return bool(stored)
+
+
+class DateColumn(_ArrayColumn):
+    """Dates stored as ordinals.
+    As numpy arrays they are `datetime64[D]`.
+    """
+
+    kind = "date"
+    typecode = "i"
+    dtype = "datetime64[D]"
+
+    def __init__(self, values=(), pytype=Date):
+        self.pytype = pytype
+        super(DateColumn, self).__init__(values)
+
+    def _empty(self):
+        return type(self)(pytype=self.pytype)
+
+    def _encode(self, value):
+        return value.toordinal()
+
+    def _decode(self, stored):
+        return self.pytype.fromordinal(stored)
+
+    def asarray(self):
+        import numpy
+
+        epoch = datetime.date(1970, 1, 1).toordinal()
+        days = numpy.array(self._data, dtype="int64") - epoch
+        return days.astype(self.dtype)
+
+    def sum(self):
+        raise TypeError("Dates cannot be added")
+
+
+class DecimalColumn(Column):
+    """
+    Finite decimals stored as integer mantissas and exponents,
+    so the textual form, like trailing zeros, is kept.
+    As numpy arrays they are approximated as floats,
+    while `sum()` is exact.
+    """
+
+    kind = "decimal"
+
+    def __init__(self, values=()):
+        self._data = array.array(_int64)
+        self._exponents = array.array("b")
+        for value in values:
+            self._append(value)
+
+    def accepts(self, value):
+        if type(value) is not Decimal or not value.is_finite():
+            return False
+        sign, digits, exponent = value.as_tuple()
+        if sign and not any(digits):  # negative zero
+            return False
+        return -128 <= exponent < 128 and len(digits) <= _decimalDigits
+
+    def _append(self, value):
+        exponent = value.as_tuple().exponent
+        self._data.append(int(value.scaleb(-exponent)))
+        self._exponents.append(exponent)
+
+    def _get(self, position):
+        return Decimal(self._data[position]).scaleb(self._exponents[position])
+
+    def _values(self):
+        return (
+            Decimal(mantissa).scaleb(exponent)
+            for mantissa, exponent in zip(self._data, self._exponents)
+        )
+
+    def _set(self, position, value):
+        exponent = value.as_tuple().exponent
+        self._data[position] = int(value.scaleb(-exponent))
+        self._exponents[position] = exponent
+
+    def _insert(self, position, value):
+        exponent = value.as_tuple().exponent
+        self._data.insert(position, int(value.scaleb(-exponent)))
+        self._exponents.insert(position, exponent)
+
+    def _delete(self, position):
+        del self._data[position]
+        del self._exponents[position]
+
+    def _slice(self, positions):
+        result = self._empty()
+        result._data = self._data[positions]
+        result._exponents = self._exponents[positions]
+        return result
+
+    @property
+    def exponents(self):
+        "The storage of the exponents, `array` holds the mantissas"
+        return self._exponents
+
+    def asarray(self):
+        import numpy
+
+        mantissas = numpy.array(self._data, dtype="float64")
+        exponents = numpy.array(self._exponents, dtype="float64")
+        return mantissas * 10.0**exponents
+
+    def sum(self):
+        if not self._data:
+            return Decimal(0)
+        scale = min(self._exponents)
+        total = sum(
+            mantissa * 10 ** (exponent - scale)
+            for mantissa, exponent in zip(self._data, self._exponents)
+        )
+        return Decimal(total).scaleb(scale)
+
+
+_columnTypes = {
+    int: IntColumn,
+    float: FloatColumn,
+    bool: BoolColumn,
+    Decimal: DecimalColumn,
+    Date: DateColumn,
+    datetime.date: lambda values: DateColumn(values, pytype=datetime.date),
+}
+
+
+def _column(values):
+    """Returns the most compact column able to hold the values"""
+    kinds = set(type(value) for value in values)
+    if len(kinds) == 1:
+        factory = _columnTypes.get(kinds.pop())
+        if factory is not None:
+            column = factory([])
+            if all(column.accepts(value) for value in values):
+                return factory(values)
+    return Column(values)
+
+
+def _collect(rows):
+    """
+    Takes an iterable of iterables of (field, value) pairs
+    and returns a dict of the values for each field,
+    in order of first appearance, _missing for absent fields,
+    the number of rows, and the field order of each row,
+    None for the rows following the order of the fields.
+    """
+    fields = _base()
+    order = {}
+    orders = []
+    length = 0
+    for pairs in rows:
+        rowFields = []
+        last = -1
+        ordered = True
+        for field, value in pairs:
+            values = fields.get(field)
+            if values is None:
+                values = fields[field] = [_missing] * length
+                order[field] = len(order)
+            if order[field] < last:
+                ordered = False
+            last = order[field]
+            if len(values) > length:  # repeated key
+                values[length] = value
+            else:
+                rowFields.append(field)
+                values.append(value)
+        length += 1
+        orders.append(None if ordered else tuple(rowFields))
+        for values in fields.values():
+            if len(values) < length:
+                values.append(_missing)
+    return fields, length, orders
+
+
+class columnarrow(Mapping):
+    """
+    View of a row of a columnarlist, behaving like a namespace.
+    Setting values writes them into the columns.
+    It refers to the row by position, so inserting
+    or removing previous rows moves the view.
+    """
+
+    __slots__ = ("_table", "_position")
+
+    def __init__(self, table, position):
+        object.__setattr__(self, "_table", table)
+        object.__setattr__(self, "_position", position)
+
+    def __getitem__(self, key):
+        column = self._table._columns.get(key)
+        if column is not None:
+            value = column._get(self._position)
+            if value is not _missing:
+                return value
+        elif type(key) in _strtypes and "." in key:
+            return compilePath(key).get(self)
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if type(key) in _strtypes and "." in key and key not in self._table._columns:
+            return compilePath(key).set(self, value)
+        self._table._setValue(self._position, key, value)
+
+    def __delitem__(self, key):
+        if key not in self:
+            if type(key) in _strtypes and "." in key:
+                return compilePath(key).delete(self)
+            raise KeyError(key)
+        self._table._setValue(self._position, key, _missing)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        self[name] = value
+
+    def __delattr__(self, name):
+        try:
+            del self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __iter__(self):
+        position = self._position
+        columns = self._table._columns
+        orders = self._table._orders
+        order = orders._get(position) if orders is not None else None
+        if order is not None:  # Fields given in other order than the columns
+            for field in order:
+                if field in columns and columns[field]._get(position) is not _missing:
+                    yield field
+        for field, column in columns.items():
+            if order is not None and field in order:
+                continue
+            if column._get(position) is not _missing:
+                yield field
+
+    def __len__(self):
+        return sum(1 for field in self)
+
+    def __eq__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return dict(self.items()) == dict(other.items())
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def asNamespace(self):
+        "Returns a namespace with the values of the row"
+        return namespace(self.items())
+
+    copy = asNamespace
+
+    def dump(self, target=None):
+        return _dump(self.asNamespace(), target)
+
+    def __repr__(self):
+        return "columnarrow({!r})".format(dict(self.items()))
+
+
+class columnarlist(MutableSequence):
+    """
+    A list of namespaces stored by columns.
+    Fields holding values of a single type
+    (int, float, bool, Decimal or dates) take
+    a few bytes per row instead of a Python object.
+    Assigning a value the column cannot hold turns it into
+    a generic column.
+
+    Items are columnarrow views,
+    `column(field)` gives the values of a field,
+    and `torows()` a list of namespaces.
+    Rows keep the order of their fields,
+    so it dumps as the equivalent list of namespaces.
+    """
+
+    def __init__(self, rows=()):
+        self._columns = _base()
+        self._orders = None  # Field order of each row, if any differs
+        self._length = 0
+        self.extend(rows)
+
+    @classmethod
+    def _fromColumns(cls, fields, length, orders=()):
+        result = cls()
+        result._length = length
+        for field, values in fields.items():
+            result._columns[field] = _column(values)
+        if any(order is not None for order in orders):
+            result._orders = Column(orders)
+        return result
+
+    def _rowOrder(self, fields):
+        "The order to keep for a row with the fields, None for the columns one"
+        last = -1
+        for field in fields:
+            position = self._fieldPositions.get(field, -1)
+            if position < last:
+                return tuple(fields)
+            last = position
+        return None
+
+    @property
+    def _fieldPositions(self):
+        return dict((field, position) for position, field in enumerate(self._columns))
+
+    def _setOrder(self, position, fields, insert=False):
+        order = self._rowOrder(fields)
+        if order is None and self._orders is None:
+            return
+        if self._orders is None:
+            self._orders = Column([None] * self._length)
+        if insert:
+            self._orders._insert(position, order)
+        else:
+            self._orders._set(position, order)
+
+    @property
+    def fields(self):
+        "Field names in order of first appearance"
+        return list(self._columns)
+
+    def column(self, field):
+        "Returns the Column with the values for the field"
+        return self._columns[field]
+
+    def _setValue(self, position, field, value):
+        column = self._columns.get(field)
+        if column is None:
+            if value is _missing:
+                raise KeyError(field)
+            column = self._columns[field] = Column([_missing] * self._length)
+        if not column.accepts(value):
+            column = self._columns[field] = Column(column._values())
+        column._set(position, value)
+
+    def _position(self, position):
+        if position < 0:
+            position += self._length
+        if not 0 <= position < self._length:
+            raise IndexError("columnarlist index out of range")
+        return position
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            result = type(self)()
+            for field, column in self._columns.items():
+                result._columns[field] = column._slice(position)
+            if self._orders is not None:
+                result._orders = self._orders._slice(position)
+            result._length = len(range(*position.indices(self._length)))
+            return result
+        return columnarrow(self, self._position(position))
+
+    def __iter__(self):
+        for position in range(self._length):
+            yield columnarrow(self, position)
+
+    def __setitem__(self, position, row):
+        if isinstance(position, slice):
+            rows = list(row)
+            start, stop, step = position.indices(self._length)
+            if step != 1:
+                positions = range(start, stop, step)
+                if len(rows) != len(positions):
+                    raise ValueError(
+                        "attempt to assign sequence of size {} "
+                        "to extended slice of size {}".format(len(rows), len(positions))
+                    )
+                for index, item in zip(positions, rows):
+                    self[index] = item
+                return
+            del self[start:stop]
+            for offset, item in enumerate(rows):
+                self.insert(start + offset, item)
+            return
+        position = self._position(position)
+        row = _base(row.items())
+        fields = list(row)
+        for field in self._columns:
+            self._setValue(position, field, row.pop(field, _missing))
+        for field, value in row.items():
+            self._setValue(position, field, value)
+        self._setOrder(position, fields)
+
+    def __delitem__(self, position):
+        if isinstance(position, slice):
+            removed = len(range(*position.indices(self._length)))
+        else:
+            position = self._position(position)
+            removed = 1
+        for column in self._columns.values():
+            column._delete(position)
+        if self._orders is not None:
+            self._orders._delete(position)
+        self._length -= removed
+
+    def insert(self, position, row):
+        if position < 0:
+            position = max(0, position + self._length)
+        position = min(position, self._length)
+        row = _base(row.items())
+        fields = list(row)
+        for field, column in self._columns.items():
+            value = row.pop(field, _missing)
+            if not column.accepts(value):
+                column = self._columns[field] = Column(column._values())
+            column._insert(position, value)
+        self._length += 1
+        for field, value in row.items():
+            self._setValue(position, field, value)
+        self._setOrder(position, fields, insert=True)
+
+    def extend(self, rows):
+        if self._length:
+            for row in list(rows):
+                self.append(row)
+            return
+        fields, length, orders = _collect(row.items() for row in rows)
+        if not length:
+            return
+        loaded = self._fromColumns(fields, length, orders)
+        self._columns = loaded._columns
+        self._orders = loaded._orders
+        self._length = loaded._length
+
+    def __iadd__(self, rows):
+        self.extend(rows)
+        return self
+
+    def clear(self):
+        self._columns = _base()
+        self._orders = None
+        self._length = 0
+
+    def torows(self):
+        "Returns the content as a list of namespaces"
+        return [row.asNamespace() for row in self]
+
+    def copy(self):
+        return self[:]
+
+    def __eq__(self, other):
+        if not isinstance(other, (list, tuple, columnarlist)):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            mine == theirs for mine, theirs in zip(self, other)
+        )
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "columnarlist({!r})".format(self.torows())
+
+    def __reduce__(self):
+        return type(self), (self.torows(),)
+
+    def dump(self, target=None):
+        return _dump(self, target)
+
+    @classmethod
+    def loads(cls, yamlContent):
+        return namespace.loads(yamlContent, columnar=True)
+
+    @classmethod
+    def load(cls, source):
+        "Loads a YAML document with a sequence of mappings at the root"
+        return namespace.load(source, columnar=True)
+
+
+def _table(rows):
+    "Returns the loaded rows as a columnarlist"
+    return columnarlist._fromColumns(*_collect(row.items() for row in rows))
+
+
+def _representColumnar(dumper, data):
+    return dumper.represent_sequence(
+        "tag:yaml.org,2002:seq", (row.asNamespace() for row in data)
+    )
+
+
+def _representRow(dumper, data):
+    return dumper.represent_dict(data.asNamespace())
+
+
+NamespaceYamlDumper.add_multi_representer(columnarlist, _representColumnar)
+NamespaceYamlDumper.add_multi_representer(columnarrow, _representRow)
+
+
+class ColumnarYAMLLoader(NamespaceYAMLLoader):
+    """
+    Loader that constructs sequences of mappings as columnarlists,
+    filling the columns without intermediate namespaces.
+    """
+
+    def construct_columnar_seq(self, node):
+        items = node.value
+        if not items or not all(isinstance(item, yaml.MappingNode) for item in items):
+            return self.construct_sequence(node, deep=True)
+        return columnarlist._fromColumns(*_collect(self._pairs(item) for item in items))
+
+    def _pairs(self, node):
+        self.flatten_mapping(node)
+        for keyNode, valueNode in node.value:
+            key = self.construct_object(keyNode, deep=True)
+            yield key, self.construct_object(valueNode, deep=True)
+
+
+ColumnarYAMLLoader.add_constructor(
+    "tag:yaml.org,2002:seq", ColumnarYAMLLoader.construct_columnar_seq
+)
+
+
+# vim: sw=4 ts=4 noet
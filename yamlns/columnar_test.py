@@ -0,0 +1,293 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+import datetime
+import pickle
+import unittest
+from decimal import Decimal
+from .core import namespace
+from .dateutils import Date
+from .columnar import columnarlist, columnarrow, Column
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+yamlReadings = u"""\
+- meter: A
+  day: 2024-01-01
+  kwh: 10.50
+  hours: 24
+  ratio: 0.5
+  valid: true
+- meter: B
+  day: 2024-01-02
+  kwh: -7.25
+  hours: 23
+  ratio: 1.5
+  valid: false
+"""
+
+
+def readings():
+    return namespace.loads(yamlReadings, columnar=True)
+
+
+class ColumnarList_Test(unittest.TestCase):
+
+    def test_columnKinds(self):
+        data = readings()
+        self.assertEqual(
+            [data.column(field).kind for field in data.fields],
+            ["object", "date", "decimal", "int", "decimal", "bool"],
+        )
+
+    def test_floats(self):
+        data = columnarlist([namespace(ratio=0.5), namespace(ratio=1.5)])
+        self.assertEqual(data.column("ratio").kind, "float")
+        self.assertEqual(data.column("ratio").sum(), 2.0)
+        self.assertEqual(data.dump(), u"- ratio: 0.5\n- ratio: 1.5\n")
+
+    def test_rows_likeNamespaces(self):
+        data = readings()
+        self.assertEqual(len(data), 2)
+        self.assertEqual(data[0].kwh, Decimal("10.50"))
+        self.assertEqual(data[1]["day"], Date(2024, 1, 2))
+        self.assertIs(type(data[1].day), Date)
+        self.assertIs(data[1].valid, False)
+        self.assertEqual(data[-1].meter, "B")
+        self.assertEqual(data[0], namespace.loads(yamlReadings)[0])
+        self.assertEqual(namespace.loads(yamlReadings)[0], data[0])
+
+    def test_row_missingField(self):
+        data = readings()
+        with self.assertRaises(AttributeError):
+            data[0].bad
+        with self.assertRaises(KeyError):
+            data[0]["bad"]
+
+    def test_equalToRowList(self):
+        self.assertEqual(readings(), namespace.loads(yamlReadings))
+        self.assertEqual(readings().torows(), namespace.loads(yamlReadings))
+
+    def test_dump_sameAsRows(self):
+        self.assertEqual(readings().dump(), yamlReadings)
+
+    def test_dump_nested(self):
+        data = namespace.loads(u"items:\n" + yamlReadings, columnar=True)
+        self.assertIsInstance(data["items"], columnarlist)
+        self.assertEqual(data.dump(), u"items:\n" + yamlReadings)
+
+    def test_decimals_keepTextualForm(self):
+        values = ["1.50", "0.00", "1E+3", "-0.5", "123456789012.345678"]
+        data = columnarlist(namespace(value=Decimal(v)) for v in values)
+        self.assertEqual(data.column("value").kind, "decimal")
+        self.assertEqual([str(v) for v in data.column("value")], values)
+
+    def test_decimals_unfitting_generic(self):
+        for value in ["-0.0", "Infinity", "1234567890123456789012"]:
+            data = columnarlist([namespace(value=Decimal(value))])
+            self.assertEqual(data.column("value").kind, "object")
+            self.assertEqual(str(data[0].value), value)
+
+    def test_decimalSum_exact(self):
+        self.assertEqual(readings().column("kwh").sum(), Decimal("3.25"))
+
+    def test_mixedTypes_generic(self):
+        data = columnarlist([namespace(a=1), namespace(a="1"), namespace(a=True)])
+        self.assertEqual(data.column("a").kind, "object")
+        self.assertEqual(list(data.column("a")), [1, "1", True])
+
+    def test_hugeInts_generic(self):
+        data = columnarlist([namespace(a=2**70)])
+        self.assertEqual(data.column("a").kind, "object")
+
+    def test_plainDates(self):
+        data = columnarlist([namespace(day=datetime.date(2020, 2, 29))])
+        self.assertEqual(data.column("day").kind, "date")
+        self.assertIs(type(data[0].day), datetime.date)
+
+    def test_missingFields(self):
+        data = columnarlist([namespace(a=1, b=2), namespace(a=3, c=4)])
+        self.assertEqual(data.fields, ["a", "b", "c"])
+        self.assertEqual(data.column("a").kind, "int")
+        self.assertEqual(list(data[1].keys()), ["a", "c"])
+        self.assertEqual(list(data.column("b")), [2, None])
+        self.assertEqual(data.dump(), u"- a: 1\n  b: 2\n- a: 3\n  c: 4\n")
+
+    def test_setValue(self):
+        data = readings()
+        data[0].hours = 12
+        data[1]["kwh"] = Decimal("2.5")
+        self.assertEqual(data.column("hours").kind, "int")
+        self.assertEqual(list(data.column("hours")), [12, 23])
+        self.assertEqual(data.column("kwh").sum(), Decimal("13.00"))
+
+    def test_setValue_unfitting_turnsGeneric(self):
+        data = readings()
+        data[0].hours = "all day"
+        self.assertEqual(data.column("hours").kind, "object")
+        self.assertEqual(list(data.column("hours")), ["all day", 23])
+
+    def test_setValue_newField(self):
+        data = readings()
+        data[1].note = "checked"
+        self.assertEqual(list(data.column("note")), [None, "checked"])
+        self.assertNotIn("note", data[0])
+        self.assertEqual(data[1].note, "checked")
+
+    def test_delValue(self):
+        data = readings()
+        del data[0].ratio
+        self.assertNotIn("ratio", data[0])
+        self.assertEqual(data[1].ratio, 1.5)
+        with self.assertRaises(AttributeError):
+            del data[0].ratio
+
+    def test_append_insert_delete(self):
+        data = readings()
+        data.append(namespace(meter="C", hours=5))
+        data.insert(0, namespace(meter="Z", hours=7))
+        self.assertEqual([row.meter for row in data], ["Z", "A", "B", "C"])
+        self.assertEqual(list(data.column("hours")), [7, 24, 23, 5])
+        self.assertEqual(data[3].get("kwh"), None)
+        del data[1]
+        self.assertEqual([row.meter for row in data], ["Z", "B", "C"])
+        del data[:2]
+        self.assertEqual(data.torows(), [namespace(meter="C", hours=5)])
+
+    def test_setRow(self):
+        data = readings()
+        data[0] = namespace(meter="X", hours=1)
+        self.assertEqual(data[0], namespace(meter="X", hours=1))
+        self.assertEqual(data[1].meter, "B")
+
+    def test_setSlice(self):
+        data = readings()
+        data[0:1] = [namespace(meter="X"), namespace(meter="Y")]
+        self.assertEqual([row.meter for row in data], ["X", "Y", "B"])
+
+    def test_slice(self):
+        data = readings()[1:]
+        self.assertIsInstance(data, columnarlist)
+        self.assertEqual(data.torows(), namespace.loads(yamlReadings)[1:])
+        self.assertEqual(data.column("kwh").kind, "decimal")
+
+    def test_iterate(self):
+        rows = list(readings())
+        self.assertTrue(all(isinstance(row, columnarrow) for row in rows))
+        self.assertEqual([row.hours for row in rows], [24, 23])
+
+    def test_empty(self):
+        data = columnarlist()
+        self.assertEqual(len(data), 0)
+        self.assertEqual(data.fields, [])
+        self.assertEqual(data, [])
+
+    def test_rowDump(self):
+        self.assertEqual(
+            readings()[0].dump(),
+            namespace.loads(yamlReadings)[0].dump(),
+        )
+
+    def test_pickle(self):
+        data = readings()
+        self.assertEqual(pickle.loads(pickle.dumps(data)), data)
+
+    def test_mixedFieldOrders_kept(self):
+        rows = [
+            namespace([("a", 1), ("b", 2)]),
+            namespace([("b", 3), ("a", 4)]),
+        ]
+        data = columnarlist(rows)
+        self.assertEqual(data.dump(), namespace(x=rows).dump()[len("x:\n") :])
+        self.assertEqual(list(data[1]), ["b", "a"])
+        self.assertEqual(list(data[1:][0]), ["b", "a"])
+        self.assertEqual(list(pickle.loads(pickle.dumps(data))[1]), ["b", "a"])
+
+    def test_mixedFieldOrders_mutations(self):
+        data = columnarlist([namespace([("a", 1), ("b", 2)])])
+        data.append(namespace([("b", 3), ("a", 4)]))
+        data.insert(0, namespace([("b", 5), ("a", 6)]))
+        data[1] = namespace([("a", 7), ("b", 8)])
+        self.assertEqual(
+            [list(row) for row in data], [["b", "a"], ["a", "b"], ["b", "a"]]
+        )
+        data[2].c = 9
+        self.assertEqual(list(data[2]), ["b", "a", "c"])
+        del data[0]
+        self.assertEqual([list(row) for row in data], [["a", "b"], ["b", "a", "c"]])
+        data.clear()
+        data.append(namespace([("b", 1), ("a", 2)]))
+        self.assertEqual(list(data[0]), ["b", "a"])
+
+    def test_column_generic(self):
+        column = readings().column("meter")
+        self.assertIsInstance(column, Column)
+        self.assertEqual(list(column), ["A", "B"])
+        self.assertEqual(column[1], "B")
+
+
+@unittest.skipIf(numpy is None, "numpy not installed")
+class ColumnarNumpy_Test(unittest.TestCase):
+
+    def test_asarray_ints(self):
+        column = readings().column("hours")
+        self.assertEqual(column.asarray().dtype, numpy.int64)
+        self.assertEqual((numpy.asarray(column) * 2).tolist(), [48, 46])
+
+    def test_asarray_decimals(self):
+        self.assertEqual(readings().column("kwh").asarray().tolist(), [10.5, -7.25])
+
+    def test_asarray_dates(self):
+        days = readings().column("day").asarray()
+        self.assertEqual(days.dtype, numpy.dtype("datetime64[D]"))
+        self.assertEqual(str(days[1]), "2024-01-02")
+
+    def test_asarray_bools(self):
+        self.assertEqual(readings().column("valid").asarray().tolist(), [True, False])
+
+
+class ColumnarLoad_Test(unittest.TestCase):
+
+    def test_loads(self):
+        self.assertIsInstance(columnarlist.loads(yamlReadings), columnarlist)
+
+    def test_nonMappingItems_plainList(self):
+        data = namespace.loads(u"a: [1, 2]\nb: []\n", columnar=True)
+        self.assertEqual(type(data.a), list)
+        self.assertEqual(type(data.b), list)
+
+    def test_mergeKeys(self):
+        data = namespace.loads(
+            u"base: &base {kwh: 1.0}\n" u"items:\n" u"- <<: *base\n" u"  meter: A\n",
+            columnar=True,
+        )
+        self.assertEqual(data["items"][0].kwh, Decimal("1.0"))
+        self.assertEqual(data["items"].fields, ["kwh", "meter"])
+
+    def test_mixedFieldOrders_dumpAsLoaded(self):
+        content = u"items:\n- a: 1\n  b: 2\n- b: 3\n  a: 4\n"
+        for engine in "nodes", "events":
+            data = namespace.loads(content, columnar=True, engine=engine)
+            self.assertIsInstance(data["items"], columnarlist)
+            self.assertEqual(data.dump(), content)
+
+    def test_missingFields_sameOrder_columnar(self):
+        content = u"items:\n- a: 1\n  b: 2\n- b: 3\n  c: 4\n- a: 5\n  c: 6\n"
+        for engine in "nodes", "events":
+            data = namespace.loads(content, columnar=True, engine=engine)
+            self.assertIsInstance(data["items"], columnarlist)
+            self.assertEqual(data.dump(), content)
+
+    def test_lazy(self):
+        data = namespace.loads(u"items:\n" + yamlReadings, lazy=True, columnar=True)
+        self.assertIsInstance(data["items"], columnarlist)
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: sw=4 ts=4 noet
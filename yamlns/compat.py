@@ -5,6 +5,9 @@ import sys
 
 py2 = sys.version_info < (3,)
 
+# Plain dicts keep insertion order since Python 3.7
+orderedDicts = sys.version_info >= (3, 7)
+
 # This resolves pathlib in older Python versions
 try:
     from pathlib2 import Path
@@ -0,0 +1,118 @@
+"""
+Conversion of json like structures into namespaces.
+
+Walks the tree with an explicit stack instead of recursion,
+so deep payloads do not hit the recursion limit.
+"""
+
+from .core import namespace, orderednamespace
+
+_sorted = sorted
+
+
+def _first(item):
+    return item[0]
+
+
+def _inOrder(keys):
+    "Tells whether the keys are already sorted, without building a list"
+    keys = iter(keys)
+    for previous in keys:
+        break
+    else:
+        return True
+    for key in keys:
+        if key < previous:
+            return False
+        previous = key
+    return True
+
+
+def convertMapping(source, sorted, inplace):
+    """Converter for mappings. Returns a namespace with the source items.
+    Existing namespaces are reused when converting inplace.
+    """
+    inOrder = not sorted or _inOrder(source.keys())
+    if inplace and isinstance(source, namespace):
+        if not inOrder:
+            items = _sorted(source.items(), key=_first)
+            source.clear()
+            setitem = source._setitem
+            for key, value in items:
+                setitem(key, value)
+        return source
+    if inOrder:
+        return namespace(source)
+    return namespace(_sorted(source.items(), key=_first))
+
+
+def convertSequence(source, sorted, inplace):
+    """Converter for sequences. Returns a list with the source items.
+    Existing lists are reused when converting inplace.
+    """
+    if inplace and type(source) is list:
+        return source
+    return list(source)
+
+
+# Type dispatch table: type -> converter(source, sorted, inplace)
+# Converters return either a namespace or a list, whose items
+# are further converted.
+converters = {
+    dict: convertMapping,
+    namespace: convertMapping,
+    orderednamespace: convertMapping,
+    list: convertSequence,
+    tuple: convertSequence,
+}
+
+
+def deep(data, sorted=False, inplace=False):
+    """Turns all the mappings of a json like structure into
+    namespaces and all the sequences into lists.
+    Types are dispatched with the `converters` table.
+
+    Set sorted to force alphabetical order of the keys.
+    Set inplace to upgrade the structure reusing existing
+    namespaces and lists instead of copying them.
+
+    Shared references are converted separatedly,
+    cyclic structures raise ValueError.
+    """
+    converter = converters.get(type(data))
+    if converter is None:
+        return data
+    result = converter(data, sorted, inplace)
+    # Ids of the sources from the root to the one being scanned
+    path = []
+    ancestors = set()
+    # Containers pending to scan, with their source id and depth
+    stack = [(result, id(data), 0)]
+    while stack:
+        target, sourceId, depth = stack.pop()
+        while len(path) > depth:
+            ancestors.discard(path.pop())
+        path.append(sourceId)
+        ancestors.add(sourceId)
+        depth += 1
+        if type(target) is list:
+            items = enumerate(target)
+            setitem = target.__setitem__
+        else:
+            items = target.items()
+            setitem = target._setitem
+        for key, value in items:
+            converter = converters.get(type(value))
+            if converter is None:
+                continue
+            valueId = id(value)
+            if valueId in ancestors:
+                raise ValueError("Unable to convert a cyclic structure")
+            converted = converter(value, sorted, inplace)
+            if converted is not value:
+                setitem(key, converted)
+            stack.append((converted, valueId, depth))
+    return result
+
+
+# vim: sw=4 ts=4 noet
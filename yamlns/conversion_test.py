@@ -0,0 +1,135 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+import unittest
+from collections import OrderedDict
+from .core import namespace, orderednamespace
+from .conversion import deep, converters, convertMapping, convertSequence
+
+
+class Deep_Test(unittest.TestCase):
+
+    def keys(self, data):
+        return list(data.keys())
+
+    def test_leaf(self):
+        self.assertEqual(deep("value"), "value")
+
+    def test_dict(self):
+        result = deep(dict(a=dict(b=[dict(c=1)])))
+        self.assertEqual(type(result), namespace)
+        self.assertEqual(type(result.a), namespace)
+        self.assertEqual(type(result.a.b[0]), namespace)
+        self.assertEqual(result, namespace(a=namespace(b=[namespace(c=1)])))
+
+    def test_doesNotModifySource(self):
+        source = dict(a=[dict(b=1)])
+        deep(source)
+        self.assertEqual(type(source["a"][0]), dict)
+
+    def test_copiesNamespaces(self):
+        source = namespace(a=namespace(b=1))
+        result = deep(source)
+        self.assertIsNot(result, source)
+        self.assertIsNot(result.a, source.a)
+
+    def test_orderednamespace(self):
+        result = deep(orderednamespace(a=1))
+        self.assertEqual(type(result), namespace)
+
+    def test_tuple(self):
+        result = deep((1, (2, 3)))
+        self.assertEqual(result, [1, [2, 3]])
+
+    def test_sorted(self):
+        result = deep(
+            namespace([("z", namespace([("b", 1), ("a", 2)])), ("c", [])]),
+            sorted=True,
+        )
+        self.assertEqual(self.keys(result), ["c", "z"])
+        self.assertEqual(self.keys(result.z), ["a", "b"])
+
+    def test_sorted_alreadyInOrder(self):
+        result = deep(namespace([("a", 1), ("b", 2)]), sorted=True)
+        self.assertEqual(self.keys(result), ["a", "b"])
+
+    def test_dottedKeysExpanded(self):
+        result = deep({"a.b": 1})
+        self.assertEqual(result, namespace(a=namespace(b=1)))
+
+    def test_deepStructure_noRecursionLimit(self):
+        data = leaf = dict()
+        for i in range(5000):
+            leaf["child"] = leaf = dict()
+        result = deep(data)
+        self.assertEqual(type(result["child." * 4999 + "child"]), namespace)
+
+    def test_sharedReferences(self):
+        shared = dict(a=1)
+        result = deep(dict(one=shared, other=shared))
+        self.assertEqual(result.one, namespace(a=1))
+        self.assertEqual(type(result.other), namespace)
+
+    def test_cycle(self):
+        data = dict(a=1)
+        data["self"] = [data]
+        with self.assertRaises(ValueError) as ctx:
+            deep(data)
+        self.assertEqual(format(ctx.exception), "Unable to convert a cyclic structure")
+
+    def test_inplace_reusesNamespacesAndLists(self):
+        child = namespace(b=1)
+        alist = [dict(c=1)]
+        source = namespace(a=child, items=alist, d=dict(e=1))
+        result = deep(source, inplace=True)
+        self.assertIs(result, source)
+        self.assertIs(result.a, child)
+        self.assertIs(result["items"], alist)
+        self.assertEqual(type(alist[0]), namespace)
+        self.assertEqual(type(source.d), namespace)
+
+    def test_inplace_keepsNamespaceSubclasses(self):
+        source = orderednamespace(a=dict(b=1))
+        result = deep(source, inplace=True)
+        self.assertIs(result, source)
+        self.assertEqual(type(result.a), namespace)
+
+    def test_inplace_sorted(self):
+        source = namespace([("b", 1), ("a", namespace([("d", 1), ("c", 2)]))])
+        inner = source.a
+        result = deep(source, sorted=True, inplace=True)
+        self.assertIs(result, source)
+        self.assertIs(result.a, inner)
+        self.assertEqual(self.keys(result), ["a", "b"])
+        self.assertEqual(self.keys(inner), ["c", "d"])
+
+    def test_inplace_tuplesBecomeLists(self):
+        source = namespace(a=(1, 2))
+        deep(source, inplace=True)
+        self.assertEqual(source.a, [1, 2])
+
+    def test_customTypes(self):
+        class MyMapping(OrderedDict):
+            pass
+
+        class MySequence(list):
+            pass
+
+        converters[MyMapping] = convertMapping
+        converters[MySequence] = convertSequence
+        try:
+            result = deep(MySequence([MyMapping(a=1)]))
+        finally:
+            del converters[MyMapping]
+            del converters[MySequence]
+        self.assertEqual(type(result), list)
+        self.assertEqual(type(result[0]), namespace)
+
+    def test_namespaceDeep(self):
+        source = namespace(a=dict(b=1))
+        result = namespace.deep(source, inplace=True)
+        self.assertIs(result, source)
+        self.assertEqual(type(source.a), namespace)
+
+
+# vim: sw=4 ts=4 noet
@@ -0,0 +1,104 @@
+"""
+Structural deep copy of namespace trees.
+
+Walks the tree with an explicit stack instead of recursion,
+so deep documents do not hit the recursion limit.
+"""
+
+import copy
+import datetime
+import decimal
+from .core import namespace
+from .dateutils import Date
+from .decimals import LazyDecimal
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Immutable leaves, shared between the original and the copy
+atomicTypes = set(
+    [
+        type(None),
+        bool,
+        int,
+        type(2**64),  # Py2 long
+        float,
+        complex,
+        str,
+        type(u""),
+        bytes,
+        decimal.Decimal,
+        LazyDecimal,
+        datetime.date,
+        datetime.datetime,
+        datetime.time,
+        datetime.timedelta,
+        Date,
+    ]
+)
+
+
+def _copyArray(data, memo):
+    if data.dtype.hasobject:
+        return copy.deepcopy(data, memo)
+    return data.copy()
+
+
+# Copy functions for other types: function(value, memo) -> copy
+copiers = {}
+if np:
+    copiers[np.ndarray] = _copyArray
+
+
+def _shallow(value, memo, pending):
+    """Returns the copy of value.
+    Containers are returned empty and scheduled in pending to be filled.
+    """
+    cls = type(value)
+    if cls in atomicTypes:
+        return value
+    try:
+        return memo[id(value)]
+    except KeyError:
+        pass
+    if cls is list:
+        target = []
+    elif cls is dict or isinstance(value, namespace):
+        target = cls()
+    else:
+        copier = copiers.get(cls, copy.deepcopy)
+        return copier(value, memo)
+    memo[id(value)] = target
+    pending.append((value, target))
+    return target
+
+
+def deepcopy(data, memo=None):
+    """
+    Returns a deep copy of data.
+    Namespaces, dicts and lists are copied keeping their types,
+    cycles and shared references.
+    Immutable leaves like strings, numbers, Decimal and dates are shared.
+    Any other type is copied with `copy.deepcopy`.
+    """
+    if memo is None:
+        memo = {}
+    pending = []
+    result = _shallow(data, memo, pending)
+    while pending:
+        source, target = pending.pop()
+        if type(target) is list:
+            target.extend([_shallow(item, memo, pending) for item in source])
+            continue
+        if isinstance(target, namespace):
+            setitem = target._setitem  # does not interpret dotted keys
+        else:
+            setitem = target.__setitem__
+        for key, value in source.items():
+            setitem(key, _shallow(value, memo, pending))
+    return result
+
+
+# vim: sw=4 ts=4 noet
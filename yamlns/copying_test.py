@@ -0,0 +1,132 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+import copy
+import decimal
+import datetime
+import unittest
+from .core import namespace, orderednamespace
+from .dateutils import Date
+from .copying import deepcopy
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class DeepCopy_Test(unittest.TestCase):
+
+    def test_leaf(self):
+        self.assertEqual(deepcopy(3), 3)
+
+    def test_namespace(self):
+        data = namespace(a=1, b=namespace(c=2))
+        result = deepcopy(data)
+        self.assertEqual(result, data)
+        self.assertIsNot(result, data)
+        self.assertIsNot(result.b, data.b)
+        self.assertEqual(type(result.b), namespace)
+
+    def test_keepsOrder(self):
+        data = namespace([("z", 1), ("a", 2)])
+        self.assertEqual(list(deepcopy(data).keys()), ["z", "a"])
+
+    def test_keepsContainerTypes(self):
+        data = namespace(
+            ordered=orderednamespace(a=1),
+            plain=dict(a=1),
+            alist=[1, 2],
+        )
+        result = deepcopy(data)
+        self.assertEqual(type(result.ordered), orderednamespace)
+        self.assertEqual(type(result.plain), dict)
+        self.assertEqual(type(result.alist), list)
+
+    def test_listsAreCopied(self):
+        data = namespace(items=[namespace(a=1)])
+        result = deepcopy(data)
+        result["items"][0].a = 2
+        result["items"].append(3)
+        self.assertEqual(data, namespace(items=[namespace(a=1)]))
+
+    def test_immutableLeavesShared(self):
+        leaves = [
+            decimal.Decimal("3.14"),
+            Date("2020-01-01"),
+            datetime.datetime(2020, 1, 1, 10, 20),
+            u"caña",
+            2**70,
+        ]
+        result = deepcopy(leaves)
+        for original, copied in zip(leaves, result):
+            self.assertIs(copied, original)
+
+    def test_dottedKeysNotExpanded(self):
+        data = namespace()
+        data._setitem("a.b", 1)
+        result = deepcopy(data)
+        self.assertEqual(list(result.keys()), ["a.b"])
+
+    def test_sharedReferencesKept(self):
+        shared = namespace(a=1)
+        data = namespace(one=shared, other=shared)
+        result = deepcopy(data)
+        self.assertIs(result.one, result.other)
+        self.assertIsNot(result.one, shared)
+
+    def test_cycles(self):
+        data = namespace(a=1)
+        data.self = data
+        data.items = [data]
+        result = deepcopy(data)
+        self.assertIs(result.self, result)
+        self.assertIs(result["items"][0], result)
+
+    def test_deepStructure_noRecursionLimit(self):
+        data = leaf = namespace()
+        for i in range(5000):
+            leaf.child = namespace()
+            leaf = leaf.child
+        leaf.value = 1
+        result = deepcopy(data)
+        self.assertEqual(result["child." * 5000 + "value"], 1)
+
+    def test_otherTypes_copyModule(self):
+        data = namespace(aset=set([1, 2]), atuple=(namespace(a=1),))
+        result = deepcopy(data)
+        self.assertEqual(result, data)
+        self.assertIsNot(result.aset, data.aset)
+        self.assertIsNot(result.atuple[0], data.atuple[0])
+
+    def test_copyModule_usesIt(self):
+        shared = [1]
+        data = namespace(a=shared, b=shared)
+        result = copy.deepcopy(data)
+        self.assertEqual(type(result), namespace)
+        self.assertIs(result.a, result.b)
+        self.assertIsNot(result.a, shared)
+
+    def test_method(self):
+        data = namespace(a=[namespace(b=1)])
+        result = data.deepcopy()
+        self.assertEqual(result, data)
+        self.assertIsNot(result.a[0], data.a[0])
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_numpy(self):
+        data = namespace(curve=np.array([1.0, 2.0]))
+        result = deepcopy(data)
+        result.curve[0] = 5
+        self.assertEqual(list(data.curve), [1.0, 2.0])
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_numpy_objects(self):
+        inner = namespace(a=1)
+        data = np.array([inner, None], dtype=object)
+        result = deepcopy(data)
+        self.assertEqual(result[0], inner)
+        self.assertIsNot(result[0], inner)
+
+
+# vim: sw=4 ts=4 noet
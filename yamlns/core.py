@@ -1,30 +1,94 @@
 import yaml
 from collections import OrderedDict
-from .compat import Path, text
-
-_sorted = sorted
-
-
-class namespace(OrderedDict):
+from .compat import Path, text, orderedDicts, py2
+from .paths import compilePath
+
+# Where plain dicts keep insertion order, use them as storage:
+# smaller instances and faster access than OrderedDict.
+_base = dict if orderedDicts else OrderedDict
+_dictgetitem = dict.__getitem__
+_dictget = dict.get
+_missing = object()
+_strtypes = (type(u""), str)
+loadEngines = ("nodes", "events")
+dumpEngines = ("nodes", "events")
+floatPolicies = ("decimal", "float", "lazy")
+arrayStyles = ("plain", "tagged", "base64")
+
+
+class namespace(_base):
     """
     A dictionary whose values can be accessed also as attributes
     and can be loaded and dumped as YAML.
     """
 
-    def __init__(self, *args, **kwd):
-        super(namespace, self).__init__(*args, **kwd)
+    # Storage setter, overriden by subclasses with a different backend
+    _setitem = _base.__setitem__
+
+    def __init__(self, *args, **kwds):
+        if not orderedDicts:  # Py2 OrderedDict sets up its links
+            super(namespace, self).__init__()
+        if args or kwds:
+            self.update(*args, **kwds)
+
+    def update(self, *args, **kwds):
+        """Like dict.update, but dotted string keys
+        are set as paths, as with item assignment.
+        """
+        if len(args) > 1:
+            raise TypeError(
+                "update expected at most 1 argument, got {}".format(len(args))
+            )
+        if kwds:
+            args += (kwds,)
+        for other in args:
+            if hasattr(other, "keys"):
+                for key in other.keys():
+                    if type(key) in _strtypes and "." in key:
+                        break
+                else:  # Fast path, no dotted keys
+                    super(namespace, self).update(other)
+                    continue
+                other = [(key, other[key]) for key in other.keys()]
+            else:
+                other = list(other)  # Pairs, iterated twice
+                for key, value in other:
+                    if type(key) in _strtypes and "." in key:
+                        break
+                else:
+                    super(namespace, self).update(other)
+                    continue
+            for key, value in other:
+                self[key] = value
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def setdefault(self, key, default=None):
+        if type(key) not in _strtypes or "." not in key:
+            return super(namespace, self).setdefault(key, default)
+        try:
+            return self[key]
+        except KeyError:
+            self[key] = default
+            return default
 
     def __getattr__(self, name):
         try:
-            return self[name]
+            if "." in name:
+                return self[name]
+            return _dictgetitem(self, name)
         except KeyError as e:
             raise AttributeError(name)
 
     def __setattr__(self, name, value):
         if name.startswith("_"):
             super(namespace, self).__setattr__(name, value)
-        else:
+        elif "." in name:
             self[name] = value
+        else:
+            self._setitem(name, value)
 
     def __delattr__(self, name):
         try:
@@ -33,22 +97,36 @@ class namespace(OrderedDict):
             super(namespace, self).__delattr__(name)
 
     def __getitem__(self, name):
-        if not hasattr(name, "split"):
-            return super(namespace, self).__getitem__(name)
-        parts = name.split(".", 1)
-        result = super(namespace, self).__getitem__(parts[0])
-        if parts[1:]:
-            return result[parts[1]]
-        return result
+        if type(name) in _strtypes and "." in name:
+            # Paths check literal keys first, without raising
+            value = _dictget(self, name, _missing)
+            if value is not _missing:
+                return value
+            return compilePath(name).get(self)
+        return _dictgetitem(self, name)
 
     def __setitem__(self, name, value):
-        if not hasattr(name, "split"):
-            return super(namespace, self).__setitem__(name, value)
-        parts = name.split(".", 1)
-        if not parts[1:]:
-            return super(namespace, self).__setitem__(parts[0], value)
-        level = self.setdefault(parts[0], ns())
-        level[parts[1]] = value
+        if type(name) not in _strtypes or "." not in name:
+            return self._setitem(name, value)
+        compilePath(name).set(self, value)
+
+    def __delitem__(self, name):
+        try:
+            return super(namespace, self).__delitem__(name)
+        except KeyError:
+            if type(name) not in _strtypes or "." not in name:
+                raise
+        compilePath(name).delete(self)
+
+    if orderedDicts:
+
+        def __repr__(self):
+            if not self:
+                return "{}()".format(type(self).__name__)
+            return "{}({})".format(type(self).__name__, dict.__repr__(self))
+
+    def copy(self):
+        return type(self)(self)
 
     def __dir__(self):
 
@@ -73,69 +151,287 @@ class namespace(OrderedDict):
         attributes.extend(k for k in self.keys() if isidentifier(k))
         return attributes
 
+    @staticmethod
+    def compilePath(path):
+        """Returns a reusable accessor for the dotted path.
+        Numeric steps index lists: 'items.3.price'.
+        See yamlns.paths.NamespacePath.
+        """
+        return compilePath(path)
+
     def deepcopy(self):
-        return self.loads(self.dump())
+        """Returns a deep copy, see yamlns.copying.deepcopy"""
+        from .copying import deepcopy
+
+        return deepcopy(self)
+
+    def __deepcopy__(self, memo):
+        from .copying import deepcopy
+
+        return deepcopy(self, memo)
 
     @classmethod
-    def deep(cls, x, sorted=False):
+    def deep(cls, x, sorted=False, inplace=False):
         """Turns recursively all the dicts of a json like
         structure into yamlns namespaces. Set sorted to true
         to force alphabetical order of the keys
         so that their dumps can be compared.
+        Set inplace to true to reuse existing namespaces and lists.
+        See yamlns.conversion.deep.
         """
-        sort_function = _sorted if sorted else lambda x: x
-        if type(x) in (dict, namespace):
-            return ns(
-                (k, cls.deep(v, sorted=sorted)) for k, v in sort_function(x.items())
-            )
-        if type(x) in (list, tuple):
-            return [cls.deep(y, sorted=sorted) for y in x]
-        return x
+        from .conversion import deep
+
+        return deep(x, sorted=sorted, inplace=inplace)
+
+    @staticmethod
+    def compileQuery(expression):
+        """Returns a reusable query matcher for the expression,
+        with wildcards, recursive descent, slices and filters:
+        'contracts[?active == true].periods.*.kwh'.
+        See yamlns.query.
+        """
+        from .query import compileQuery
+
+        return compileQuery(expression)
+
+    def query(self, expression, paths=False):
+        """Generates the values matching the query expression,
+        or (path, value) pairs if paths is set.
+        See yamlns.query.
+        """
+        return self.compileQuery(expression).find(self, paths=paths)
+
+    @staticmethod
+    def diff(old, new):
+        """Returns the list of operations that turns old into new,
+        see yamlns.diffing.diff.
+        """
+        from .diffing import diff
+
+        return diff(old, new)
+
+    @staticmethod
+    def patch(data, ops):
+        """Applies in place the operations returned by diff,
+        see yamlns.diffing.patch.
+        """
+        from .diffing import patch
+
+        return patch(data, ops)
+
+    @staticmethod
+    def overlay(*layers, **kwds):
+        """Returns a read through view of the layers,
+        the later ones overriding the former ones.
+        Accepts a `policies` dict of dotted paths to merge policies.
+        See yamlns.overlay.NamespaceOverlay.
+        """
+        from .overlay import NamespaceOverlay
+
+        return NamespaceOverlay(layers, **kwds)
+
+    def freeze(self):
+        """Returns an immutable and hashable copy,
+        see yamlns.frozen.freeze.
+        """
+        from .frozen import freeze
+
+        return freeze(self)
 
     @classmethod
-    def loads(cls, yamlContent):
+    def loads(
+        cls,
+        yamlContent,
+        lazy=False,
+        columnar=False,
+        engine="nodes",
+        cache=None,
+        floats="decimal",
+    ):
+        """Loads a YAML document from text, see load for the options.
+        A yamlns.caching.ParseCache as cache avoids parsing
+        again texts already loaded.
+        """
+        if cache is not None:
+            if lazy:
+                raise ValueError("Lazy loads cannot be cached")
+            return cache.loads(
+                cls, yamlContent, columnar=columnar, engine=engine, floats=floats
+            )
         yamlContent = text(yamlContent)
         import io
 
-        return cls.load(io.StringIO(yamlContent))
+        return cls.load(
+            io.StringIO(yamlContent),
+            lazy=lazy,
+            columnar=columnar,
+            engine=engine,
+            floats=floats,
+        )
 
     @classmethod
-    def load(cls, source):
-        from .serialization import NamespaceYAMLLoader
+    def load(
+        cls,
+        source,
+        lazy=False,
+        columnar=False,
+        engine="nodes",
+        cache=None,
+        sidecar=None,
+        floats="decimal",
+    ):
+        """Loads a YAML document from a path or an open file.
+        If lazy is set, top level values of a mapping are parsed
+        on first access, see yamlns.lazy.lazynamespace.
+        If columnar is set, sequences of mappings are loaded
+        as columnar lists, see yamlns.columnar.columnarlist.
+        The 'events' engine builds the values while parsing
+        instead of composing the document first,
+        see yamlns.eventloader.
+        A yamlns.caching.FileCache as cache avoids loading
+        again files not modified since the last load.
+        If sidecar is set, the document is also kept in a binary
+        '.yamlc' file next to the source, or in the sidecar
+        directory, and read from it while the source is unchanged,
+        see yamlns.sidecar.
+        YAML floats are loaded as Decimal, by default,
+        as float with floats='float', or as yamlns.decimals.LazyDecimal,
+        turned into Decimal on first use, with floats='lazy'.
+        """
+        from .serialization import NamespaceYAMLLoader as Loader, floatsLoader
+
+        if engine not in loadEngines:
+            raise ValueError("Unknown load engine {!r}".format(engine))
+
+        if floats not in floatPolicies:
+            raise ValueError("Unknown floats policy {!r}".format(floats))
+
+        if cache is not None:
+            if lazy:
+                raise ValueError("Lazy loads cannot be cached")
+            return cache.load(
+                cls, source, columnar=columnar, engine=engine, floats=floats
+            )
+
+        if sidecar:
+            if lazy:
+                raise ValueError("Lazy loads cannot use a sidecar")
+            from .sidecar import loadWithSidecar
+
+            return loadWithSidecar(
+                cls,
+                source,
+                cacheDir=None if sidecar is True else sidecar,
+                columnar=columnar,
+                engine=engine,
+                floats=floats,
+            )
+
+        if lazy:
+            from .lazy import loadLazy
+
+            return loadLazy(source, columnar=columnar, engine=engine, floats=floats)
+
+        if columnar:
+            from .columnar import ColumnarYAMLLoader as Loader
+
+        def loadit(stream):
+            if engine == "events":
+                from .eventloader import loadEvents
+
+                return loadEvents(stream, columnar=columnar, floats=floats)
+            return yaml.load(stream=stream, Loader=floatsLoader(Loader, floats))
 
         # Already open read file
         if hasattr(source, "read"):
-            return yaml.load(stream=source, Loader=NamespaceYAMLLoader)
+            return loadit(source)
 
         with Path(source).open() as f:
-            return yaml.load(stream=f, Loader=NamespaceYAMLLoader)
+            return loadit(f)
 
-    def dump(self, target=None):
+    @classmethod
+    def loadMany(
+        cls, sources, columnar=False, engine="nodes", cache=None, floats="decimal"
+    ):
+        """Returns the list of documents loaded from the paths in sources.
+        With a yamlns.caching.FileCache as cache,
+        the files are checked for changes all together.
+        """
+        options = dict(columnar=columnar, engine=engine, floats=floats)
+        if cache is not None:
+            return cache.loadMany(cls, sources, **options)
+        return [cls.load(source, **options) for source in sources]
+
+    @staticmethod
+    def load_all(source, columnar=False, engine="nodes", floats="decimal"):
+        """Generates the documents of a multi document YAML stream
+        from a path or an open file, parsing each one on demand.
+        See yamlns.streaming.loadAll.
+        """
+        from .streaming import loadAll
 
-        def dumpit(stream):
-            from .serialization import NamespaceYamlDumper
+        return loadAll(source, columnar=columnar, engine=engine, floats=floats)
 
-            return yaml.dump(
-                self,
-                stream=stream,
-                default_flow_style=False,
-                allow_unicode=True,
-                Dumper=NamespaceYamlDumper,
-            )
+    @staticmethod
+    def iterload(source, path="items", columnar=False, floats="decimal"):
+        """Iterates the items of the sequence at the dotted path
+        of a big document, parsing them one at a time.
+        Scalars before the sequence are available as `header`.
+        Options are the ones of load.
+        See yamlns.streaming.NamespaceStream.
+        """
+        from .streaming import iterload
 
-        if target is None:
-            return dumpit(target)
+        return iterload(source, path, columnar=columnar, floats=floats)
 
-        # Already open write file
-        if hasattr(target, "write"):
-            return dumpit(target)
+    @staticmethod
+    def dump_all(documents, target=None, engine="nodes", arrays="plain"):
+        """Dumps an iterable of documents as a multi document YAML stream,
+        writing each one as it comes. See yamlns.streaming.dumpAll.
+        """
+        from .streaming import dumpAll
+
+        return dumpAll(documents, target, engine=engine, arrays=arrays)
+
+    def dump(self, target=None, engine="nodes", arrays="plain"):
+        """Dumps as YAML into the target: a path, an open file,
+        or None to return it as text.
+        The 'events' engine emits the document while walking it,
+        without representing it as nodes first,
+        see yamlns.eventdumper.
+        Numpy arrays are dumped as flow sequences by default.
+        With arrays='tagged' they are dumped with their dtype and shape,
+        so they load back as arrays, and with arrays='base64'
+        their raw buffer is packed instead of the items.
+        """
+        return _dump(self, target, engine=engine, arrays=arrays)
 
-        import sys
+    @classmethod
+    def loads_json(cls, content, dates=False):
+        """Loads a JSON document from text, using the json module.
+        If dates is set, strings with ISO dates become Date.
+        See yamlns.jsonio.
+        """
+        from .jsonio import loadsJson
 
-        mode = "wb" if sys.version_info[0] == 2 else "w"
+        return loadsJson(content, dates=dates, cls=cls)
 
-        with Path(target).open(mode) as f:
-            return dumpit(f)
+    @classmethod
+    def load_json(cls, source, dates=False):
+        """Loads a JSON document from a path or an open file,
+        see loads_json.
+        """
+        from .jsonio import loadJson
+
+        return loadJson(source, dates=dates, cls=cls)
+
+    def dump_json(self, target=None, indent=None):
+        """Dumps as JSON into the target: a path, an open file,
+        or None to return it as text. See yamlns.jsonio.
+        """
+        from .jsonio import dumpJson
+
+        return dumpJson(self, target, indent=indent)
 
     @classmethod
     def fromTemplateVars(clss, templateContent):
@@ -147,6 +443,70 @@ class namespace(OrderedDict):
         return _varsTree(templateVariables)
 
 
+class orderednamespace(namespace, OrderedDict):
+    """
+    A namespace backed by an OrderedDict, as namespaces were up to yamlns 0.12.
+    Equality with other ordered dictionaries is order sensitive,
+    and it provides `move_to_end`.
+    """
+
+    _setitem = OrderedDict.__setitem__
+
+
+def _dumpTo(target, dumpit):
+    """Calls dumpit(stream) with a stream for the target:
+    None to return a string, an already open write file or a path.
+    """
+    if target is None:
+        return dumpit(target)
+
+    # Already open write file
+    if hasattr(target, "write"):
+        return dumpit(target)
+
+    import sys
+
+    mode = "wb" if sys.version_info[0] == 2 else "w"
+
+    with Path(target).open(mode) as f:
+        return dumpit(f)
+
+
+def _checkDumpOptions(engine, arrays):
+    if engine not in dumpEngines:
+        raise ValueError("Unknown dump engine {!r}".format(engine))
+    if arrays not in arrayStyles:
+        raise ValueError("Unknown arrays style {!r}".format(arrays))
+
+
+def _dump(data, target=None, engine="nodes", arrays="plain"):
+    """Dumps data as YAML into the target, see _dumpTo"""
+    _checkDumpOptions(engine, arrays)
+
+    def dumpit(stream):
+        from .serialization import NamespaceYamlDumper, dumpContext, dumpStream
+        from .serialization import arraysDumper
+        from .eventdumper import dumpEvents
+
+        dump = dumpEvents if engine == "events" else dumpStream
+        if stream is not None:
+            return dump(data, stream, arrays=arrays)
+        if not py2:
+            return dumpContext.dumps(data, dump, arrays=arrays)
+        if engine == "events":  # As utf-8, like yaml.dump below
+            return dumpEvents(data, arrays=arrays).encode("utf-8")
+
+        return yaml.dump(
+            data,
+            stream=stream,
+            default_flow_style=False,
+            allow_unicode=True,
+            Dumper=arraysDumper(NamespaceYamlDumper, arrays),
+        )
+
+    return _dumpTo(target, dumpit)
+
+
 def _collectVars(content):
     import re
 
@@ -55,6 +55,10 @@ class Date(datetime.date):
         dateTuple = cls._extractDataTuple(*args)
         return datetime.date.__new__(cls, *dateTuple)
 
+    def __reduce__(self):
+        # datetime.date pickles its state as bytes, not supported by __new__
+        return type(self), (self.year, self.month, self.day)
+
     @classmethod
     def _extractDataTuple(cls, *args):
         if len(args) != 1:
@@ -66,6 +66,13 @@ class DateUtils_Test(unittest.TestCase):
 
         self.assertEqual(e.exception.args[0], "Invalid date initializator '201510303'")
 
+    def test_date_pickle(self):
+        import pickle
+
+        d = pickle.loads(pickle.dumps(Date("2015-02-20")))
+        self.assertEqual(type(d), Date)
+        self.assertEqual(d, Date("2015-02-20"))
+
     def test_isoDate_withIso(self):
         self.assertEqual(
             "2015-10-30",
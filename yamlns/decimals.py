@@ -0,0 +1,142 @@
+"""
+Numbers from YAML float literals.
+
+LazyDecimal keeps the literal of a YAML float and builds
+the Decimal just when it is first used, so loading numeric
+documents does not pay for the values that are not read.
+
+>>> value = LazyDecimal('1_000.50')
+>>> value
+LazyDecimal('1_000.50')
+>>> value + 1
+Decimal('1001.50')
+>>> value == Decimal('1000.5')
+True
+"""
+
+import numbers
+from decimal import Decimal, InvalidOperation
+
+
+def parseDecimal(literal):
+    "Returns the Decimal for a YAML float literal"
+    try:
+        return Decimal(literal)
+    except (InvalidOperation, ValueError):
+        pass
+    # YAML forms Decimal does not take
+    value = literal.replace("_", "").lower()
+    sign = +1
+    if value[0] == "-":
+        sign = -1
+    if value[0] in "+-":
+        value = value[1:]
+    if value == ".inf":
+        return sign * Decimal("Infinity")
+    if value == ".nan":
+        return Decimal("NaN")
+    return sign * Decimal(value)
+
+
+def parseFloat(literal):
+    "Returns the float for a YAML float literal"
+    try:
+        return float(literal)
+    except ValueError:
+        pass
+    # YAML forms float does not take
+    value = literal.replace("_", "").lower()
+    sign = +1
+    if value[0] == "-":
+        sign = -1
+    if value[0] in "+-":
+        value = value[1:]
+    if value == ".inf":
+        return sign * float("inf")
+    if value == ".nan":
+        return float("nan")
+    if ":" in value:  # Base 60, YAML 1.1
+        result = 0.0
+        for digits in value.split(":"):
+            result = result * 60 + float(digits)
+        return sign * result
+    return sign * float(value)
+
+
+class LazyDecimal(object):
+    """
+    A YAML float literal turned into Decimal on first use.
+    It behaves as that Decimal in arithmetic, comparisons,
+    hashing and formatting, returning Decimal results,
+    and it is dumped back as the very same literal.
+    """
+
+    __slots__ = ("literal", "_value")
+
+    def __init__(self, literal):
+        self.literal = literal
+        self._value = None
+
+    @property
+    def value(self):
+        "The Decimal for the literal"
+        if self._value is None:
+            self._value = parseDecimal(self.literal)
+        return self._value
+
+    def __getattr__(self, name):
+        # Decimal methods, like quantize or is_nan
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.value, name)
+
+    def __reduce__(self):
+        return type(self), (self.literal,)
+
+    def __repr__(self):
+        return "LazyDecimal({!r})".format(self.literal)
+
+    def __str__(self):
+        return str(self.value)
+
+    def __format__(self, spec):
+        return format(self.value, spec)
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __bool__(self):
+        return bool(self.value)
+
+    __nonzero__ = __bool__  # Py2
+
+
+def _delegate(name):
+    def method(self, *args):
+        args = [arg.value if type(arg) is LazyDecimal else arg for arg in args]
+        return getattr(self.value, name)(*args)
+
+    method.__name__ = name
+    return method
+
+
+for _name in (
+    # Comparison
+    "__eq__ __ne__ __lt__ __le__ __gt__ __ge__ "
+    # Arithmetic
+    "__add__ __radd__ __sub__ __rsub__ __mul__ __rmul__ "
+    "__truediv__ __rtruediv__ __floordiv__ __rfloordiv__ "
+    "__mod__ __rmod__ __divmod__ __rdivmod__ __pow__ __rpow__ "
+    "__neg__ __pos__ __abs__ "
+    "__div__ __rdiv__ "  # Py2
+    # Conversion
+    "__float__ __int__ __complex__ __round__ __trunc__ __floor__ __ceil__ "
+    "__long__"  # Py2
+).split():
+    if hasattr(Decimal, _name):  # Py2 lacks some
+        setattr(LazyDecimal, _name, _delegate(_name))
+
+numbers.Number.register(LazyDecimal)
+
+
+# vim: sw=4 ts=4 noet
@@ -0,0 +1,225 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+import copy
+import io
+import math
+import pickle
+import unittest
+from decimal import Decimal
+from .core import namespace
+from .caching import ParseCache
+from .fingerprint import fingerprint
+from .compat import py2
+from .decimals import LazyDecimal, parseDecimal, parseFloat
+
+yamlContent = u"""\
+a: 1.50
+b: -2.5e+3
+c: 1_000.25
+d: .inf
+e: -.inf
+f: .nan
+g: 3
+h:
+- 0.1
+- 0.2
+"""
+
+
+class ParseDecimal_Test(unittest.TestCase):
+
+    def test_plain(self):
+        self.assertEqual(str(parseDecimal("1.50")), "1.50")
+        self.assertEqual(parseDecimal("-2.5e+3"), Decimal("-2500"))
+        self.assertEqual(parseDecimal("+.5"), Decimal("0.5"))
+
+    def test_underscores(self):
+        self.assertEqual(parseDecimal("1_000.25"), Decimal("1000.25"))
+
+    def test_special(self):
+        self.assertEqual(parseDecimal(".inf"), Decimal("Infinity"))
+        self.assertEqual(parseDecimal("+.INF"), Decimal("Infinity"))
+        self.assertEqual(parseDecimal("-.Inf"), Decimal("-Infinity"))
+        self.assertTrue(parseDecimal(".NaN").is_nan())
+
+    def test_keepsAllDigits(self):
+        literal = "1.2345678901234567890123456789012345"
+        self.assertEqual(str(parseDecimal(literal)), literal)
+
+
+class ParseFloat_Test(unittest.TestCase):
+
+    def test_plain(self):
+        self.assertEqual(parseFloat("1.50"), 1.5)
+        self.assertEqual(parseFloat("-2.5e+3"), -2500.0)
+        self.assertEqual(parseFloat("1_000.25"), 1000.25)
+
+    def test_special(self):
+        self.assertEqual(parseFloat(".inf"), float("inf"))
+        self.assertEqual(parseFloat("-.Inf"), float("-inf"))
+        self.assertTrue(math.isnan(parseFloat(".NaN")))
+
+    def test_base60(self):
+        self.assertEqual(parseFloat("1:30.5"), 90.5)
+        self.assertEqual(parseFloat("-1:30.5"), -90.5)
+
+
+class LazyDecimal_Test(unittest.TestCase):
+
+    def test_notConvertedUntilUsed(self):
+        value = LazyDecimal("1.50")
+        self.assertIsNone(value._value)
+        self.assertEqual(value.value, Decimal("1.50"))
+        self.assertIs(value.value, value._value)
+
+    def test_repr(self):
+        self.assertEqual(repr(LazyDecimal("1_0.5")), "LazyDecimal('1_0.5')")
+
+    def test_str(self):
+        self.assertEqual(str(LazyDecimal("1.50")), "1.50")
+        self.assertEqual(format(LazyDecimal("1.5"), ".3f"), "1.500")
+
+    def test_arithmetic_returnsDecimal(self):
+        value = LazyDecimal("1.5")
+        self.assertEqual(value + 1, Decimal("2.5"))
+        self.assertEqual(1 + value, Decimal("2.5"))
+        self.assertEqual(value * value, Decimal("2.25"))
+        self.assertEqual(3 / value, Decimal("2"))
+        self.assertEqual(value / 3, Decimal("0.5"))
+        self.assertEqual(-value, Decimal("-1.5"))
+        self.assertEqual(abs(LazyDecimal("-1.5")), Decimal("1.5"))
+        self.assertIs(type(value + LazyDecimal("1")), Decimal)
+
+    def test_arithmetic_withFloat_fails(self):
+        with self.assertRaises(TypeError):
+            LazyDecimal("1.5") + 1.5
+
+    def test_comparison(self):
+        self.assertEqual(LazyDecimal("1.50"), Decimal("1.5"))
+        self.assertEqual(Decimal("1.5"), LazyDecimal("1.50"))
+        self.assertEqual(LazyDecimal("1.5"), LazyDecimal("1.50"))
+        self.assertNotEqual(LazyDecimal("1.5"), Decimal("2"))
+        self.assertLess(LazyDecimal("1.5"), 2)
+        self.assertGreater(Decimal("2"), LazyDecimal("1.5"))
+        self.assertEqual(sorted([LazyDecimal("2"), Decimal("1")]), [1, 2])
+
+    def test_hash_asDecimal(self):
+        self.assertEqual(hash(LazyDecimal("1.50")), hash(Decimal("1.5")))
+        self.assertIn(LazyDecimal("1.50"), {Decimal("1.5"): 1})
+
+    def test_conversions(self):
+        self.assertEqual(float(LazyDecimal("1.5")), 1.5)
+        self.assertEqual(int(LazyDecimal("1.5")), 1)
+        self.assertIs(type(int(LazyDecimal("1e30"))), type(10**30))
+        self.assertEqual(math.floor(LazyDecimal("1.5")), 1)
+        self.assertTrue(LazyDecimal("0.1"))
+        self.assertFalse(LazyDecimal("0.0"))
+
+    @unittest.skipIf(py2, "Py2 round always returns float")
+    def test_round_returnsDecimal(self):
+        self.assertEqual(round(LazyDecimal("1.25"), 1), Decimal("1.2"))
+
+    def test_decimalMethods(self):
+        value = LazyDecimal("1.2345")
+        self.assertEqual(value.quantize(Decimal("0.01")), Decimal("1.23"))
+        self.assertTrue(LazyDecimal(".nan").is_nan())
+
+    def test_pickle(self):
+        value = pickle.loads(pickle.dumps(LazyDecimal("1.50")))
+        self.assertEqual(value.literal, "1.50")
+        self.assertEqual(copy.deepcopy(LazyDecimal("1.50")).literal, "1.50")
+
+    def test_fingerprint(self):
+        self.assertEqual(
+            fingerprint(namespace(a=LazyDecimal("1.5"))),
+            fingerprint(namespace(a=LazyDecimal("1.5"))),
+        )
+
+
+class FloatsPolicy_Test(unittest.TestCase):
+
+    def test_decimal_default(self):
+        data = namespace.loads(yamlContent)
+        self.assertIs(type(data.a), Decimal)
+        self.assertEqual(str(data.a), "1.50")
+
+    def test_float(self):
+        data = namespace.loads(yamlContent, floats="float")
+        self.assertEqual(
+            [data.a, data.b, data.c, data.d, data.e, data.g, data.h],
+            [1.5, -2500.0, 1000.25, float("inf"), float("-inf"), 3, [0.1, 0.2]],
+        )
+        self.assertIs(type(data.a), float)
+        self.assertTrue(math.isnan(data.f))
+
+    def test_lazy(self):
+        data = namespace.loads(yamlContent, floats="lazy")
+        self.assertIs(type(data.a), LazyDecimal)
+        self.assertEqual(data.a.literal, "1.50")
+        self.assertEqual(data.c, Decimal("1000.25"))
+        self.assertIs(type(data.g), int)
+
+    def test_engines_sameResult(self):
+        for floats in ("decimal", "float", "lazy"):
+            self.assertEqual(
+                repr(namespace.loads(yamlContent, floats=floats, engine="events")),
+                repr(namespace.loads(yamlContent, floats=floats)),
+            )
+
+    def test_columnar(self):
+        content = u"- a: 1.5\n- a: 2.5\n"
+        data = namespace.loads(content, columnar=True, floats="float")
+        self.assertEqual(data.column("a").kind, "float")
+        data = namespace.loads(content, columnar=True, floats="float", engine="events")
+        self.assertEqual(data.column("a").kind, "float")
+
+    def test_lazyLoad(self):
+        data = namespace.loads(yamlContent, lazy=True, floats="float")
+        self.assertIs(type(data.a), float)
+
+    def test_loadAll(self):
+        for engine in ("nodes", "events"):
+            documents = namespace.load_all(
+                io.StringIO(u"a: 1.5\n---\na: 2.5\n"), floats="float", engine=engine
+            )
+            self.assertEqual([d.a for d in documents], [1.5, 2.5])
+
+    def test_cache_keyedByPolicy(self):
+        cache = ParseCache()
+        self.assertIs(type(namespace.loads(u"a: 1.5", cache=cache).a), Decimal)
+        self.assertIs(
+            type(namespace.loads(u"a: 1.5", cache=cache, floats="float").a), float
+        )
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError) as ctx:
+            namespace.loads(yamlContent, floats="bad")
+        self.assertEqual(format(ctx.exception), "Unknown floats policy 'bad'")
+        with self.assertRaises(ValueError):
+            namespace.load_all(io.StringIO(yamlContent), floats="bad")
+
+    def test_dump_roundtrip(self):
+        for floats in ("decimal", "float", "lazy"):
+            data = namespace.loads(yamlContent, floats=floats)
+            for engine in ("nodes", "events"):
+                self.assertEqual(
+                    repr(namespace.loads(data.dump(engine=engine), floats=floats)),
+                    repr(data),
+                )
+
+    def test_dump_lazy_keepsLiteral(self):
+        data = namespace.loads(yamlContent, floats="lazy")
+        self.assertEqual(data.dump(), yamlContent)
+        self.assertEqual(data.dump(engine="events"), yamlContent)
+
+    def test_dumpJson_lazy(self):
+        data = namespace.loads(u"a: 1_000.50\n", floats="lazy")
+        self.assertEqual(data.dump_json(), u'{"a": 1000.50}')
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: sw=4 ts=4 noet
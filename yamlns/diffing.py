@@ -0,0 +1,297 @@
+"""
+Structural diff and patch of namespace trees.
+
+A diff is a list of operations, namespaces like:
+
+    - op: replace
+      path: [client, address, city]
+      value: Girona
+    - op: move
+      from: [items, 4]
+      path: [items, 1]
+
+Operations are `add`, `remove`, `replace` and `move`.
+Paths are lists of keys and list indexes, so keys containing dots
+are not ambiguous, and indexes refer to the list as left
+by the previous operations.
+Being namespaces, lists and values, diffs can be dumped and loaded as YAML.
+"""
+
+from .core import namespace
+from .copying import deepcopy
+from .fingerprint import fingerprint, _Tracked
+
+
+def _operation(op, path, **kwds):
+    result = namespace([("op", op), ("path", path)])
+    for key in ("from", "value"):
+        if key in kwds:
+            result[key] = kwds[key]
+    return result
+
+
+def _key(value):
+    "Comparison key for list items: its fingerprint, or itself if not supported"
+    try:
+        return fingerprint(value)
+    except TypeError:
+        return value
+
+
+def _sameLeaf(a, b):
+    return type(a) is type(b) and a == b
+
+
+def _editScript(old, new):
+    """
+    Myers shortest edit script between two sequences of keys.
+    Returns a list of (old index, new index) pairs,
+    with None as old index for insertions and as new index for deletions.
+    Takes O((N+M)D) time, being D the number of edits.
+    """
+    n, m = len(old), len(new)
+    v = {1: 0}
+    trace = []
+    for d in range(n + m + 1):
+        trace.append(v.copy())
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[k - 1] < v[k + 1]):
+                x = v[k + 1]
+            else:
+                x = v[k - 1] + 1
+            y = x - k
+            while x < n and y < m and old[x] == new[y]:
+                x += 1
+                y += 1
+            v[k] = x
+            if x >= n and y >= m:
+                break
+        else:
+            continue
+        break
+
+    script = []
+    x, y = n, m
+    for d in range(len(trace) - 1, -1, -1):
+        v = trace[d]
+        k = x - y
+        if k == -d or (k != d and v[k - 1] < v[k + 1]):
+            previousK = k + 1
+        else:
+            previousK = k - 1
+        previousX = v[previousK]
+        previousY = previousX - previousK
+        while x > previousX and y > previousY:
+            x -= 1
+            y -= 1
+            script.append((x, y))
+        if d:
+            if x == previousX:
+                script.append((None, y - 1))
+            else:
+                script.append((x - 1, None))
+        x, y = previousX, previousY
+    script.reverse()
+    return script
+
+
+def _diffValue(old, new, path, ops):
+    if old is new:
+        return
+    if isinstance(old, _Tracked) and isinstance(new, _Tracked):
+        try:
+            if fingerprint(old) == fingerprint(new):
+                return
+        except TypeError:
+            pass
+    if isinstance(old, dict) and isinstance(new, dict):
+        return _diffMapping(old, new, path, ops)
+    if isinstance(old, list) and isinstance(new, list):
+        return _diffList(old, new, path, ops)
+    if _sameLeaf(old, new):
+        return
+    ops.append(_operation("replace", path, value=new))
+
+
+def _diffMapping(old, new, path, ops):
+    for key, value in old.items():
+        if key not in new:
+            ops.append(_operation("remove", path + [key]))
+            continue
+        _diffValue(value, new[key], path + [key], ops)
+    for key, value in new.items():
+        if key not in old:
+            ops.append(_operation("add", path + [key], value=value))
+
+
+def _same(a, b):
+    if a is b:
+        return True
+    if isinstance(a, (dict, list)):
+        return type(a) is type(b) and _key(a) == _key(b)
+    return _sameLeaf(a, b)
+
+
+def _diffList(old, new, path, ops):
+    # Common head and tail are skipped without fingerprinting
+    start = 0
+    limit = min(len(old), len(new))
+    while start < limit and _same(old[start], new[start]):
+        start += 1
+    oldEnd, newEnd = len(old), len(new)
+    while oldEnd > start and newEnd > start and _same(old[oldEnd - 1], new[newEnd - 1]):
+        oldEnd -= 1
+        newEnd -= 1
+    if start == oldEnd and start == newEnd:
+        return
+    oldItems = old[start:oldEnd]
+    newItems = new[start:newEnd]
+    oldKeys = [_key(item) for item in oldItems]
+    newKeys = [_key(item) for item in newItems]
+
+    # Hunks of consecutive deletions and insertions
+    kept = {}  # new index -> old index
+    hunks = []
+    deleted, inserted = [], []
+    for i, j in _editScript(oldKeys, newKeys):
+        if i is not None and j is not None:
+            kept[j] = i
+            if deleted or inserted:
+                hunks.append((deleted, inserted))
+                deleted, inserted = [], []
+        elif j is None:
+            deleted.append(i)
+        else:
+            inserted.append(j)
+    if deleted or inserted:
+        hunks.append((deleted, inserted))
+
+    # Inserted items equal to deleted ones are moves
+    available = {}
+    opaque = []
+    for hunk in hunks:
+        for i in hunk[0]:
+            try:
+                available.setdefault(oldKeys[i], []).append(i)
+            except TypeError:  # unhashable, not fingerprinted
+                opaque.append(i)
+    moved = set()
+    for hunk in hunks:
+        for j in hunk[1]:
+            try:
+                candidates = available.get(newKeys[j], [])
+            except TypeError:
+                candidates = [i for i in opaque if oldKeys[i] == newKeys[j]]
+                if candidates:
+                    opaque.remove(candidates[0])
+            if candidates:
+                kept[j] = candidates.pop(0)
+                moved.add(kept[j])
+
+    # Remaining deletions and insertions in a hunk are paired as changes
+    changed = {}  # new index -> old index
+    removed = set()
+    for deletedItems, insertedItems in hunks:
+        deletedItems = [i for i in deletedItems if i not in moved]
+        insertedItems = [j for j in insertedItems if j not in kept]
+        for i, j in zip(deletedItems, insertedItems):
+            changed[j] = i
+        removed.update(deletedItems[len(insertedItems) :])
+
+    # Simulate the operations on the old indexes to get the current positions.
+    # Items kept or changed are in the same order in both lists,
+    # moved items are left behind until their destination is reached.
+    current = list(range(len(oldItems)))
+    for position in range(len(current) - 1, -1, -1):
+        if current[position] in removed:
+            ops.append(_operation("remove", path + [start + position]))
+            del current[position]
+    cursor = 0  # position after the last item already in place
+    for j, value in enumerate(newItems):
+        i = kept.get(j, changed.get(j))
+        if i is None:
+            ops.append(_operation("add", path + [start + cursor], value=value))
+            current.insert(cursor, None)
+            cursor += 1
+            continue
+        if i not in moved:
+            cursor = current.index(i, cursor) + 1
+            if j in changed:
+                _diffValue(oldItems[i], value, path + [start + cursor - 1], ops)
+            continue
+        position = current.index(i)
+        if position == cursor:
+            cursor += 1
+            continue
+        if position > cursor:
+            cursor += 1
+        target = cursor - 1
+        ops.append(
+            _operation(
+                "move", path + [start + target], **{"from": path + [start + position]}
+            )
+        )
+        current.insert(target, current.pop(position))
+
+
+def diff(old, new):
+    """
+    Returns the list of operations that turns old into new.
+    Mappings are compared key by key and lists with
+    the Myers algorithm, detecting moved items.
+    Only different branches are scanned:
+    identical objects and tracked subtrees with
+    the same fingerprint are skipped.
+    Leaves of different type are considered different, even if equal.
+    Values in the operations are not copied.
+    """
+    ops = []
+    _diffValue(old, new, [], ops)
+    return ops
+
+
+def _setValue(container, key, value):
+    if isinstance(container, namespace):
+        container._setitem(key, value)  # dotted keys are literal
+    else:
+        container[key] = value
+
+
+def _container(data, path):
+    for step in path[:-1]:
+        data = data[step]
+    return data, path[-1]
+
+
+def patch(data, ops):
+    """
+    Applies the operations, as returned by `diff`, to data in place.
+    Added and replaced values are copied.
+    Returns data, or the new value if the root is replaced.
+    """
+    for operation in ops:
+        op = operation["op"]
+        path = operation["path"]
+        if op not in ("add", "replace", "remove", "move"):
+            raise ValueError("Unknown patch operation {!r}".format(op))
+        if op == "move":
+            source, key = _container(data, operation["from"])
+            value = source.pop(key)
+        elif op != "remove":
+            value = deepcopy(operation["value"])
+        if not path:
+            if op == "remove":
+                raise ValueError("Unable to remove the root")
+            data = value
+            continue
+        container, key = _container(data, path)
+        if op == "remove":
+            del container[key]
+        elif op == "replace" or not isinstance(container, list):
+            _setValue(container, key, value)
+        else:
+            container.insert(key, value)
+    return data
+
+
+# vim: sw=4 ts=4 noet
@@ -0,0 +1,224 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+import random
+import decimal
+import unittest
+from .core import namespace
+from .copying import deepcopy
+from .fingerprint import track
+from .diffing import diff, patch, _editScript
+
+
+def op(name, path, *value):
+    "An operation as diff builds it, keys in order also in Py2"
+    result = namespace([("op", name), ("path", path)])
+    if value:
+        result.value = value[0]
+    return result
+
+
+def ops(yamlText):
+    return namespace.loads(yamlText).ops
+
+
+class EditScript_Test(unittest.TestCase):
+
+    def assertScript(self, old, new):
+        script = _editScript(old, new)
+        self.assertEqual([old[i] for i, j in script if i is not None], list(old))
+        self.assertEqual([new[j] for i, j in script if j is not None], list(new))
+        for i, j in script:
+            if i is not None and j is not None:
+                self.assertEqual(old[i], new[j])
+        return script
+
+    def test_empty(self):
+        self.assertEqual(self.assertScript("", ""), [])
+
+    def test_equal(self):
+        self.assertEqual(self.assertScript("ab", "ab"), [(0, 0), (1, 1)])
+
+    def test_insertion(self):
+        self.assertEqual(self.assertScript("", "a"), [(None, 0)])
+
+    def test_deletion(self):
+        self.assertEqual(self.assertScript("a", ""), [(0, None)])
+
+    def test_shortest(self):
+        script = self.assertScript("abcabba", "cbabac")
+        self.assertEqual(len([x for x in script if None in x]), 5)
+
+
+class Diff_Test(unittest.TestCase):
+
+    def assertDiff(self, old, new, expected):
+        old = namespace.loads(old)
+        new = namespace.loads(new)
+        self.assertEqual(namespace(ops=diff(old, new)).dump(), expected)
+
+    def test_equal(self):
+        data = namespace(a=1, b=[1, 2])
+        self.assertEqual(diff(data, data.deepcopy()), [])
+
+    def test_replace(self):
+        self.assertDiff(
+            "a: 1\nb: 2\n",
+            "a: 1\nb: 3\n",
+            "ops:\n- op: replace\n  path:\n  - b\n  value: 3\n",
+        )
+
+    def test_addAndRemove(self):
+        self.assertDiff(
+            "a: 1\nb: 2\n",
+            "b: 2\nc: 3\n",
+            "ops:\n"
+            "- op: remove\n  path:\n  - a\n"
+            "- op: add\n  path:\n  - c\n  value: 3\n",
+        )
+
+    def test_nested(self):
+        self.assertDiff(
+            "a:\n  b:\n    c: 1\n    d: 2\n",
+            "a:\n  b:\n    c: 1\n    d: 3\n",
+            "ops:\n- op: replace\n  path:\n  - a\n  - b\n  - d\n  value: 3\n",
+        )
+
+    def test_typeChange_isReplace(self):
+        self.assertEqual(
+            diff(namespace(a=1), namespace(a=decimal.Decimal(1))),
+            [op("replace", ["a"], decimal.Decimal(1))],
+        )
+
+    def test_dottedKeys_notAmbiguous(self):
+        old = namespace()
+        old._setitem("a.b", 1)
+        new = namespace()
+        new._setitem("a.b", 2)
+        self.assertEqual(diff(old, new), [op("replace", ["a.b"], 2)])
+
+    def test_list_insertion(self):
+        self.assertEqual(
+            diff(namespace(a=[1, 2, 3]), namespace(a=[1, 2, 5, 3])),
+            [op("add", ["a", 2], 5)],
+        )
+
+    def test_list_removal(self):
+        self.assertEqual(
+            diff(namespace(a=[1, 2, 3, 4]), namespace(a=[1, 4])),
+            [
+                op("remove", ["a", 2]),
+                op("remove", ["a", 1]),
+            ],
+        )
+
+    def test_list_move(self):
+        result = diff([1, 2, 3, 4], [1, 3, 4, 2])
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0].op, "move")
+
+    def test_list_changedItem_recurses(self):
+        old = [namespace(id=1, v="a"), namespace(id=2, v="b")]
+        new = [namespace(id=1, v="a"), namespace(id=2, v="c")]
+        self.assertEqual(diff(old, new), [op("replace", [1, "v"], "c")])
+
+    def test_root_replace(self):
+        self.assertEqual(diff(1, 2), [op("replace", [], 2)])
+
+    def test_tracked_identicalSubtreesSkipped(self):
+        old = track(namespace(a=namespace(b=1), c=namespace(d=2)))
+        new = deepcopy(old)
+        new.c.d = 3
+        self.assertEqual(diff(old, new), [op("replace", ["c", "d"], 3)])
+
+    def test_dumpAndLoad(self):
+        old = namespace(a=[1, 2, 3], b=namespace(c=1))
+        new = namespace(a=[3, 1, 4], b=namespace(d=1))
+        dumped = namespace(ops=diff(old, new)).dump()
+        self.assertEqual(patch(old, namespace.loads(dumped).ops), new)
+
+
+class Patch_Test(unittest.TestCase):
+
+    def test_add(self):
+        data = namespace(a=namespace())
+        patch(data, ops("ops:\n- op: add\n  path: [a, b]\n  value: 1\n"))
+        self.assertEqual(data, namespace(a=namespace(b=1)))
+
+    def test_add_list(self):
+        data = namespace(a=[1, 3])
+        patch(data, ops("ops:\n- op: add\n  path: [a, 1]\n  value: 2\n"))
+        self.assertEqual(data, namespace(a=[1, 2, 3]))
+
+    def test_remove(self):
+        data = namespace(a=[1, 3], b=2)
+        patch(
+            data, ops("ops:\n- {op: remove, path: [a, 0]}\n- {op: remove, path: [b]}\n")
+        )
+        self.assertEqual(data, namespace(a=[3]))
+
+    def test_move(self):
+        data = namespace(a=[1, 2, 3])
+        patch(data, ops("ops:\n- {op: move, from: [a, 2], path: [a, 0]}\n"))
+        self.assertEqual(data, namespace(a=[3, 1, 2]))
+
+    def test_valuesCopied(self):
+        value = namespace(b=1)
+        data = patch(namespace(), [op("add", ["a"], value)])
+        self.assertEqual(data.a, value)
+        self.assertIsNot(data.a, value)
+
+    def test_dottedKey_literal(self):
+        data = patch(namespace(), [op("add", ["a.b"], 1)])
+        self.assertEqual(list(data.keys()), ["a.b"])
+
+    def test_root(self):
+        self.assertEqual(patch(1, [op("replace", [], 2)]), 2)
+
+    def test_unknownOperation(self):
+        with self.assertRaises(ValueError) as ctx:
+            patch(namespace(), [op("bad", ["a"])])
+        self.assertEqual(format(ctx.exception), "Unknown patch operation 'bad'")
+
+    def test_tracked_invalidates(self):
+        data = track(namespace(a=namespace(b=1)))
+        data.fingerprint()
+        patch(data, [op("replace", ["a", "b"], 2)])
+        self.assertEqual(
+            data.fingerprint(), track(namespace(a=namespace(b=2))).fingerprint()
+        )
+
+    def test_roundTrip_random(self):
+        rng = random.Random(42)
+        for _ in range(200):
+            old = [rng.randint(0, 6) for _ in range(rng.randint(0, 12))]
+            new = [rng.randint(0, 6) for _ in range(rng.randint(0, 12))]
+            self.assertEqual(patch(list(old), diff(old, new)), new, (old, new))
+
+    def test_roundTrip_nested(self):
+        rng = random.Random(7)
+
+        def record(i):
+            return namespace(id=i, tags=[rng.randint(0, 3) for _ in range(3)])
+
+        for _ in range(50):
+            old = namespace(items=[record(i) for i in range(8)])
+            new = deepcopy(old)
+            for _ in range(4):
+                choice = rng.randint(0, 3)
+                if choice == 0 and new["items"]:
+                    new["items"].pop(rng.randrange(len(new["items"])))
+                elif choice == 1:
+                    new["items"].insert(rng.randint(0, len(new["items"])), record(99))
+                elif choice == 2 and new["items"]:
+                    new["items"][rng.randrange(len(new["items"]))].tags.append(5)
+                else:
+                    new["items"].reverse()
+            self.assertEqual(patch(deepcopy(old), diff(old, new)), new)
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: sw=4 ts=4 noet
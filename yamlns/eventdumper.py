@@ -0,0 +1,289 @@
+"""
+Streaming dumper sending events to the emitter while walking the data.
+
+The default dumper represents the whole document as a graph
+of YAML nodes before emitting the first line.
+This one emits mappings and sequences as it walks them,
+building just a transient node for each scalar,
+so the memory peak does not grow with the document.
+
+>>> from yamlns import ns
+>>> print(ns(a=1, b=ns(c=[1, 2])).dump(engine='events'), end='')
+a: 1
+b:
+  c:
+  - 1
+  - 2
+
+The output is the same as the default dumper's,
+including anchors for shared objects.
+Numpy arrays are represented as nodes and serialized in place.
+Documents with types represented by other means than
+mappings, sequences or scalars (sets, custom representers...)
+are dumped with the default dumper.
+"""
+
+import datetime
+import decimal
+import itertools
+from yaml.events import (
+    AliasEvent,
+    ScalarEvent,
+    MappingStartEvent,
+    MappingEndEvent,
+    SequenceStartEvent,
+    SequenceEndEvent,
+    DocumentStartEvent,
+    DocumentEndEvent,
+)
+from yaml.nodes import ScalarNode, SequenceNode, MappingNode
+from yaml.representer import SafeRepresenter
+from .dateutils import Date
+from .decimals import LazyDecimal
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_mapTag = u"tag:yaml.org,2002:map"
+_seqTag = u"tag:yaml.org,2002:seq"
+
+_scalarTypes = (
+    type(u""),
+    str,
+    bytes,
+    bool,
+    int,
+    float,
+    type(None),
+    decimal.Decimal,
+    LazyDecimal,
+    Date,
+    datetime.date,
+    datetime.datetime,
+)
+
+# _TREE values are represented as a node tree sharing nothing
+_MAPPING, _SEQUENCE, _SCALAR, _TREE = range(4)
+
+
+class _Exotic(Exception):
+    "The document needs the node based dumper"
+
+
+def _representer(dumper, data):
+    "The representer function represent_data would use for data"
+    types = type(data).__mro__
+    representers = dumper.yaml_representers
+    if types[0] in representers:
+        return representers[types[0]]
+    multi = dumper.yaml_multi_representers
+    for cls in types:
+        if cls in multi:
+            return multi[cls]
+    if None in multi:
+        return multi[None]
+    return representers.get(None)
+
+
+class _Classifier(object):
+    """
+    Tells, by type, whether values are dumped as mappings,
+    sequences or scalars, raising _Exotic otherwise.
+    """
+
+    def __init__(self, dumper):
+        self.dumper = dumper
+        scalarRepresenters = set(
+            dumper.yaml_representers.get(cls) for cls in _scalarTypes
+        )
+        scalarRepresenters.discard(None)
+        self.kinds = dict(
+            [(SafeRepresenter.represent_dict, _MAPPING)]
+            + [(SafeRepresenter.represent_list, _SEQUENCE)]
+            + [(representer, _SCALAR) for representer in scalarRepresenters]
+        )
+        if np is not None:
+            self.kinds[dumper.yaml_representers.get(np.ndarray)] = _TREE
+        self.byType = {}
+
+    def __call__(self, data):
+        cls = type(data)
+        try:
+            return self.byType[cls]
+        except KeyError:
+            pass
+        representer = _representer(self.dumper, data)
+        kind = self.kinds.get(representer)
+        if kind is None:
+            raise _Exotic()
+        self.byType[cls] = kind, representer
+        return kind, representer
+
+
+def _children(kind, data):
+    if kind is _MAPPING:
+        return itertools.chain.from_iterable(data.items())
+    return iter(data)
+
+
+def _anchors(dumper, data, classify):
+    """
+    Names the objects the node graph would share,
+    in the order the serializer numbers them:
+    when they are found for the second time in a depth first walk.
+    """
+    seen = set()
+    anchors = {}
+    ignore = dumper.ignore_aliases
+    stack = [iter((data,))]
+    while stack:
+        for value in stack[-1]:
+            kind, representer = classify(value)
+            if ignore(value):
+                alias = None
+            else:
+                alias = id(value)
+                if alias in seen:
+                    if alias not in anchors:
+                        anchors[alias] = u"id{:03d}".format(len(anchors) + 1)
+                    continue
+                seen.add(alias)
+            if kind is _MAPPING or kind is _SEQUENCE:
+                stack.append(_children(kind, value))
+                break
+        else:
+            stack.pop()
+    return anchors
+
+
+def _emitScalar(dumper, node, anchor):
+    resolve = dumper.resolve
+    implicit = (
+        node.tag == resolve(ScalarNode, node.value, (True, False)),
+        node.tag == resolve(ScalarNode, node.value, (False, True)),
+    )
+    dumper.emit(ScalarEvent(anchor, node.tag, implicit, node.value, style=node.style))
+
+
+def _emitTree(dumper, node, anchor):
+    "Emits a node tree without shared nodes, the root with the anchor"
+    emit = dumper.emit
+    stack = [(iter((node,)), None)]
+    while stack:
+        nodes, end = stack[-1]
+        for node in nodes:
+            if isinstance(node, MappingNode):
+                implicit = node.tag == _mapTag
+                emit(
+                    MappingStartEvent(
+                        anchor, node.tag, implicit, flow_style=node.flow_style
+                    )
+                )
+                pairs = itertools.chain.from_iterable(node.value)
+                stack.append((pairs, MappingEndEvent))
+                anchor = None
+                break
+            if isinstance(node, SequenceNode):
+                implicit = node.tag == _seqTag
+                emit(
+                    SequenceStartEvent(
+                        anchor, node.tag, implicit, flow_style=node.flow_style
+                    )
+                )
+                stack.append((iter(node.value), SequenceEndEvent))
+                anchor = None
+                break
+            _emitScalar(dumper, node, anchor)
+            anchor = None
+        else:
+            stack.pop()
+            if end is not None:
+                emit(end())
+
+
+def _emitDocument(dumper, data, classify, anchors):
+    flowStyle = dumper.default_flow_style
+    emit = dumper.emit
+    emitted = set()
+    dumper.alias_key = None  # Representers do not keep the nodes
+    emit(DocumentStartEvent(explicit=False))
+    stack = [(iter((data,)), None)]
+    while stack:
+        items, end = stack[-1]
+        for value in items:
+            anchor = anchors.get(id(value))
+            if anchor is not None:
+                if id(value) in emitted:
+                    emit(AliasEvent(anchor))
+                    continue
+                emitted.add(id(value))
+            kind, representer = classify(value)
+            if kind is _MAPPING:
+                emit(MappingStartEvent(anchor, _mapTag, True, flow_style=flowStyle))
+                stack.append((_children(kind, value), MappingEndEvent))
+                break
+            if kind is _SEQUENCE:
+                emit(SequenceStartEvent(anchor, _seqTag, True, flow_style=flowStyle))
+                stack.append((_children(kind, value), SequenceEndEvent))
+                break
+            node = representer(dumper, value)
+            if kind is _TREE:
+                _emitTree(dumper, node, anchor)
+                continue
+            _emitScalar(dumper, node, anchor)
+        else:
+            stack.pop()
+            if end is not None:
+                emit(end())
+    emit(DocumentEndEvent(explicit=False))
+
+
+def dumpEvents(data, stream=None, arrays="plain"):
+    """
+    Dumps data into the open stream, or returns it as text
+    if stream is None, emitting the events while walking it.
+    Data containing values not represented as mappings,
+    sequences or scalars is dumped with the default dumper.
+    """
+    return dumpAllEvents([data], stream, arrays=arrays)
+
+
+def dumpAllEvents(documents, stream=None, arrays="plain"):
+    """
+    Dumps each document of the iterable as it comes,
+    as dumpEvents does.
+    """
+    from .serialization import NamespaceYamlDumper, arraysDumper, streamEncoding
+
+    result = None
+    if stream is None:
+        import io
+
+        stream = result = io.StringIO()
+    Dumper = arraysDumper(NamespaceYamlDumper, arrays)
+    dumper = Dumper(
+        stream,
+        default_flow_style=False,
+        allow_unicode=True,
+        encoding=streamEncoding(stream),
+    )
+    try:
+        classify = _Classifier(dumper)
+        dumper.open()
+        for data in documents:
+            try:
+                anchors = _anchors(dumper, data, classify)
+            except _Exotic:
+                dumper.represent(data)
+                continue
+            _emitDocument(dumper, data, classify, anchors)
+        dumper.close()
+    finally:
+        dumper.dispose()
+    if result is not None:
+        return result.getvalue()
+
+
+# vim: sw=4 ts=4 noet
@@ -0,0 +1,139 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+import datetime
+import io
+import unittest
+from decimal import Decimal
+from .core import namespace, _dump
+from .dateutils import Date
+from .frozen import frozennamespace
+from .fingerprint import track
+from .eventdumper import dumpEvents
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class EventDumper_Test(unittest.TestCase):
+
+    def assertSameDump(self, data):
+        expected = _dump(data)
+        self.assertEqual(_dump(data, engine="events"), expected)
+        return expected
+
+    def test_scalars(self):
+        self.assertSameDump(
+            namespace(
+                a=1,
+                b="2",
+                c="yes",
+                d=None,
+                e=True,
+                f=1.5,
+                g=Decimal("1.50"),
+                h=Date(2020, 1, 1),
+                i=datetime.datetime(2020, 1, 1, 10),
+                j=b"bytes",
+                k=u"caña",
+                l="multi\nline",
+                m="  spaces",
+                n="a: b",
+                o=12345678901234567890,
+                p=Decimal("NaN"),
+            )
+        )
+
+    def test_rootScalars(self):
+        for data in [None, 1, "text", Decimal("1.5")]:
+            self.assertSameDump(data)
+
+    def test_emptyCollections(self):
+        self.assertSameDump(namespace(a=[], b=namespace(), c=[[]]))
+        self.assertSameDump(namespace())
+        self.assertSameDump([])
+
+    def test_nested(self):
+        self.assertEqual(
+            self.assertSameDump(namespace(a=[namespace(b=1), [2, 3]])),
+            u"a:\n- b: 1\n- - 2\n  - 3\n",
+        )
+
+    def test_nonStringKeys(self):
+        self.assertSameDump({3: "int", Date(2020, 1, 1): "date", None: 1})
+
+    def test_sharedObjects_anchored(self):
+        shared = namespace(x=1)
+        items = [1, 2]
+        decimal = Decimal("1.5")
+        dump = self.assertSameDump(
+            namespace(
+                a=decimal,
+                b=decimal,
+                c=shared,
+                d=[shared, shared],
+                e=items,
+                f=items,
+            )
+        )
+        self.assertIn("&id003", dump)
+
+    def test_recursive(self):
+        data = namespace(a=1)
+        data.self = data
+        self.assertEqual(self.assertSameDump(data), u"&id001\na: 1\nself: *id001\n")
+
+    def test_namespaceKinds(self):
+        self.assertSameDump(frozennamespace(a=1, b=frozennamespace(c=2)))
+        self.assertSameDump(track(namespace(a=[namespace(b=1)])))
+
+    def test_exoticTypes_fallBack(self):
+        self.assertSameDump(namespace(a=set([1, 2])))
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_numpyArrays(self):
+        array = numpy.arange(4.0).reshape(2, 2)
+        data = namespace(a=array, b=[array, numpy.array(["x"])])
+        self.assertEqual(self.assertSameDump(data).count("*id001"), 1)
+        for arrays in "tagged", "base64":
+            self.assertEqual(
+                _dump(data, engine="events", arrays=arrays),
+                _dump(data, arrays=arrays),
+            )
+
+    def test_unrepresentable_fails(self):
+        with self.assertRaises(Exception) as expected:
+            _dump(namespace(a=object()))
+        with self.assertRaises(type(expected.exception)):
+            _dump(namespace(a=object()), engine="events")
+
+    def test_stream(self):
+        output = io.StringIO()
+        dumpEvents(namespace(a=1), output)
+        self.assertEqual(output.getvalue(), u"a: 1\n")
+
+    def test_file(self):
+        import os
+        import tempfile
+
+        handle, filename = tempfile.mkstemp(suffix=".yaml")
+        os.close(handle)
+        try:
+            namespace(a=1).dump(filename, engine="events")
+            self.assertEqual(namespace.load(filename), namespace(a=1))
+        finally:
+            os.unlink(filename)
+
+    def test_unknownEngine(self):
+        with self.assertRaises(ValueError) as ctx:
+            namespace(a=1).dump(engine="bad")
+        self.assertEqual(format(ctx.exception), "Unknown dump engine 'bad'")
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: sw=4 ts=4 noet
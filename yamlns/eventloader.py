@@ -0,0 +1,341 @@
+"""
+Single pass loader building namespaces from the parser events.
+
+The default loader composes the whole document as a graph
+of YAML nodes before constructing any namespace.
+This one builds namespaces, lists and scalars while the events
+arrive, keeping just the chain of open collections,
+so the memory peak is close to the size of the result.
+
+>>> from yamlns import ns
+>>> ns.loads('a: &x {b: 1.50}\\nc: *x\\n', engine='events')
+namespace({'a': namespace({'b': Decimal('1.50')}), 'c': namespace({'b': Decimal('1.50')})})
+
+Anchors, aliases and merge keys are supported.
+Documents with explicitly tagged mappings or sequences
+(`!!set`, `!!omap`, application tags...)
+are loaded again with the default loader.
+"""
+
+import io
+import re
+import yaml
+from yaml.events import (
+    ScalarEvent,
+    MappingStartEvent,
+    MappingEndEvent,
+    SequenceStartEvent,
+    SequenceEndEvent,
+    StreamEndEvent,
+)
+from yaml.nodes import ScalarNode
+from yaml.composer import ComposerError
+from yaml.constructor import ConstructorError
+from .core import namespace
+from .compat import text, py2
+from .serialization import NamespaceYAMLLoader
+
+_strTag = u"tag:yaml.org,2002:str"
+_intTag = u"tag:yaml.org,2002:int"
+_nullTag = u"tag:yaml.org,2002:null"
+_floatTag = u"tag:yaml.org,2002:float"
+_boolTag = u"tag:yaml.org,2002:bool"
+_mergeTag = u"tag:yaml.org,2002:merge"
+_valueTag = u"tag:yaml.org,2002:value"
+_mapTags = (None, u"!", u"tag:yaml.org,2002:map")
+_seqTags = (None, u"!", u"tag:yaml.org,2002:seq")
+
+# Integers int() parses as YAML does: no octal, base 60 or underscores
+_plainInt = re.compile(r"^-?(0|[1-9][0-9]*)$")
+
+
+class _Unsupported(Exception):
+    "The document needs the node based loader"
+
+
+class _Merge(object):
+    "Value of merge keys '<<'"
+
+
+_merge = _Merge()
+_noKey = object()
+
+
+class _MappingFrame(object):
+    "An open mapping: pairs are set in the namespace when it ends"
+
+    __slots__ = ("value", "event", "anchor", "key", "pairs", "merges")
+
+    def __init__(self, value, event):
+        self.value = value
+        self.event = event
+        self.anchor = event.anchor
+        self.key = _noKey
+        self.pairs = []
+        self.merges = []
+
+    def add(self, value, event):
+        if self.key is _noKey:
+            if isinstance(value, list):
+                value = tuple(value)
+            try:
+                hash(value)
+            except TypeError as exc:
+                raise ConstructorError(
+                    "while constructing a mapping",
+                    self.event.start_mark,
+                    "found unacceptable key ({})".format(exc),
+                    event.start_mark,
+                )
+            self.key = value
+            return
+        key, self.key = self.key, _noKey
+        if key is _merge:
+            self.merges.append(self._mergeable(value, event))
+            return
+        self.pairs.append((key, value))
+
+    def _mergeable(self, value, event):
+        if isinstance(value, dict):
+            return [value]
+        if isinstance(value, list) and all(isinstance(item, dict) for item in value):
+            # Former mappings in the list take precedence
+            return value[::-1]
+        raise ConstructorError(
+            "while constructing a mapping",
+            self.event.start_mark,
+            "expected a mapping or list of mappings for merging, but found {}".format(
+                "scalar" if not isinstance(value, (dict, list)) else "sequence"
+            ),
+            event.start_mark,
+        )
+
+    def finish(self):
+        result = self.value
+        for mappings in self.merges:
+            for mapping in mappings:
+                for key, value in mapping.items():
+                    result[key] = value
+        for key, value in self.pairs:
+            result[key] = value
+        return result
+
+
+class _SequenceFrame(object):
+    __slots__ = ("value", "event", "anchor")
+
+    def __init__(self, value, event):
+        self.value = value
+        self.event = event
+        self.anchor = event.anchor
+
+    def add(self, value, event):
+        self.value.append(value)
+
+    def finish(self):
+        return self.value
+
+
+def _scalar(loader, event, isKey):
+    tag = event.tag
+    value = event.value
+    if tag is None or tag == u"!":
+        tag = loader.resolve(ScalarNode, value, event.implicit)
+    if tag == _strTag and not py2:
+        return value
+    if tag == _intTag and _plainInt.match(value):
+        return int(value)
+    if tag == _floatTag:
+        return loader.floatParser(value)
+    if tag == _nullTag:
+        return None
+    if tag == _boolTag:
+        return loader.bool_values[value.lower()]
+    if tag == _mergeTag and isKey:
+        return _merge
+    if tag == _valueTag and isKey:
+        tag = _strTag
+    node = ScalarNode(tag, value, event.start_mark, event.end_mark, event.style)
+    result = loader.construct_object(node, deep=True)
+    loader.constructed_objects.pop(node, None)
+    return result
+
+
+def _value(loader, anchors, columnar=False):
+    """
+    Builds the value of the node whose events come next.
+    Raises _Unsupported if it requires the node based loader.
+    """
+    stack = []
+    while True:
+        event = loader.get_event()
+        kind = type(event)
+        if kind is ScalarEvent:
+            isKey = (
+                bool(stack)
+                and type(stack[-1]) is _MappingFrame
+                and stack[-1].key is _noKey
+            )
+            value = _scalar(loader, event, isKey)
+            if event.anchor is not None:
+                anchors[event.anchor] = value
+        elif kind is MappingStartEvent:
+            if event.tag not in _mapTags:
+                raise _Unsupported()
+            frame = _MappingFrame(namespace(), event)
+            if event.anchor is not None:
+                anchors[event.anchor] = frame.value
+            stack.append(frame)
+            continue
+        elif kind is SequenceStartEvent:
+            if event.tag not in _seqTags:
+                raise _Unsupported()
+            frame = _SequenceFrame([], event)
+            if event.anchor is not None:
+                anchors[event.anchor] = frame.value
+            stack.append(frame)
+            continue
+        elif kind is MappingEndEvent or kind is SequenceEndEvent:
+            frame = stack.pop()
+            value = frame.finish()
+            if columnar and kind is SequenceEndEvent and _tabular(value):
+                from .columnar import _table
+
+                value = _table(value)
+                if frame.anchor is not None:
+                    anchors[frame.anchor] = value
+        else:  # Alias
+            value = _alias(anchors, event)
+
+        if not stack:
+            return value
+        stack[-1].add(value, event)
+
+
+def _alias(anchors, event):
+    if event.anchor not in anchors:
+        raise ComposerError(
+            None,
+            None,
+            "found undefined alias {!r}".format(event.anchor),
+            event.start_mark,
+        )
+    return anchors[event.anchor]
+
+
+def _document(loader, columnar=False):
+    "Builds the document whose start event comes next"
+    loader.get_event()
+    result = _value(loader, {}, columnar)
+    loader.get_event()
+    return result
+
+
+def _build(loader, columnar=False):
+    """
+    Builds the single document in the event stream.
+    Raises _Unsupported if it requires the node based loader.
+    """
+    loader.get_event()  # Stream start
+    if loader.check_event(StreamEndEvent):
+        return None
+    document = loader.peek_event()
+    result = _document(loader, columnar)
+    if not loader.check_event(StreamEndEvent):
+        raise ComposerError(
+            "expected a single document in the stream",
+            document.start_mark,
+            "but found another document",
+            loader.peek_event().start_mark,
+        )
+    return result
+
+
+def _documents(loader, columnar=False):
+    """
+    Generates the documents in the event stream.
+    Stops with _Unsupported if one requires the node based loader.
+    """
+    loader.get_event()  # Stream start
+    while not loader.check_event(StreamEndEvent):
+        yield _document(loader, columnar)
+
+
+def _tabular(items):
+    return bool(items) and all(isinstance(item, dict) for item in items)
+
+
+def _rewindable(stream):
+    "Returns a stream that can be read again and its start position"
+    try:
+        if stream.seekable():
+            return stream, stream.tell()
+    except (AttributeError, IOError, ValueError):
+        pass
+    return io.StringIO(text(stream.read())), 0
+
+
+def _nodeLoader(columnar, floats="decimal"):
+    from .serialization import floatsLoader
+
+    if columnar:
+        from .columnar import ColumnarYAMLLoader
+
+        return floatsLoader(ColumnarYAMLLoader, floats)
+    return floatsLoader(NamespaceYAMLLoader, floats)
+
+
+def loadEvents(stream, columnar=False, floats="decimal"):
+    """
+    Loads the YAML document in the open stream building
+    the values from the parser events, without composing nodes.
+    If columnar is set, sequences of mappings are
+    turned into columnar lists.
+    Floats are built as the floats policy of namespace.load says.
+    """
+    stream, start = _rewindable(stream)
+    loader = _nodeLoader(False, floats)(stream)
+    try:
+        return _build(loader, columnar=columnar)
+    except _Unsupported:
+        pass
+    finally:
+        loader.dispose()
+
+    stream.seek(start)
+    return yaml.load(stream=stream, Loader=_nodeLoader(columnar, floats))
+
+
+def loadAllEvents(stream, columnar=False, floats="decimal"):
+    """
+    Generates the documents of a YAML stream as loadEvents does.
+    From the first document requiring the default loader on,
+    the stream is read again with it.
+    """
+    stream, start = _rewindable(stream)
+    loaded = 0
+    loader = _nodeLoader(False, floats)(stream)
+    try:
+        for document in _documents(loader, columnar=columnar):
+            yield document
+            loaded += 1
+        return
+    except _Unsupported:
+        pass
+    finally:
+        loader.dispose()
+
+    stream.seek(start)
+    loader = _nodeLoader(columnar, floats)(stream)
+    try:
+        while loader.check_node():
+            node = loader.get_node()
+            if loaded:
+                loaded -= 1
+                continue
+            yield loader.construct_document(node)
+    finally:
+        loader.dispose()
+
+
+# vim: sw=4 ts=4 noet
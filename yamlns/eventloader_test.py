@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+import io
+import unittest
+import yaml
+from .core import namespace
+from .columnar import columnarlist
+from .eventloader import loadEvents
+
+
+class EventLoader_Test(unittest.TestCase):
+
+    def assertSameLoad(self, content):
+        expected = namespace.loads(content)
+        result = namespace.loads(content, engine="events")
+        self.assertEqual(repr(result), repr(expected))
+        return result
+
+    def test_mapping(self):
+        self.assertSameLoad(u"a: 1\nb:\n  c: text\n  d: [1, 2]\n")
+
+    def test_types(self):
+        self.assertSameLoad(
+            u"- 1\n- -3\n- 012\n- 0x1f\n- 1_000\n- 1:30\n- 1.50\n- .inf\n"
+            u"- -.nan\n- 1.23456789012345678901234567890123\n"
+            u"- 2020-01-01\n- 2020-01-01 10:00:00\n- yes\n- ~\n- caña\n"
+            u"- !!str 3\n- !!binary aGVsbG8=\n- '1'\n- !!float 1\n"
+        )
+
+    def test_emptyDocument(self):
+        self.assertIsNone(namespace.loads(u"", engine="events"))
+        self.assertIsNone(namespace.loads(u"---\n", engine="events"))
+
+    def test_dottedKeys_expand(self):
+        self.assertSameLoad(u"a.b: 1\nc: {x.y: 2}\n")
+
+    def test_complexKeys(self):
+        self.assertSameLoad(u"? [1, 2]\n: 3\n2020-01-01: date\n")
+
+    def test_duplicatedKeys_lastWins(self):
+        self.assertSameLoad(u"a: 1\nb: 2\na: 3\n")
+
+    def test_aliases_shareObject(self):
+        data = self.assertSameLoad(u"a: &l [1, 2]\nb: *l\nc: &m {x: 1}\nd: *m\n")
+        self.assertIs(data.a, data.b)
+        self.assertIs(data.c, data.d)
+
+    def test_recursiveAlias(self):
+        data = namespace.loads(u"&a {self: *a}\n", engine="events")
+        self.assertIs(data.self, data)
+
+    def test_mergeKeys(self):
+        self.assertSameLoad(
+            u"a: &x {p: 1, q: 2}\n"
+            u"b: {<<: *x, q: 3, r: 4}\n"
+            u"c:\n  <<: [{a: 1, b: 1}, {b: 2, c: 2}]\n  z: 0\n"
+        )
+
+    def test_taggedCollection_fallsBack(self):
+        self.assertSameLoad(u"a: !!set {x, y}\nb: 2\n")
+
+    def test_nonSeekableStream(self):
+        class Stream(object):
+            def __init__(self, content):
+                self.read = io.StringIO(content).read
+
+        self.assertEqual(
+            loadEvents(Stream(u"a: !!set {x}\nb: 1\n")),
+            namespace.loads(u"a: !!set {x}\nb: 1\n"),
+        )
+
+    def test_columnar(self):
+        data = namespace.loads(
+            u"items:\n- a: 1\n- a: 2\nother: [1, 2]\n",
+            engine="events",
+            columnar=True,
+        )
+        self.assertEqual(type(data["items"]), columnarlist)
+        self.assertEqual(type(data.other), list)
+
+    def test_lazy(self):
+        data = namespace.loads(u"a: {b: 1}\n", lazy=True, engine="events")
+        self.assertEqual(data.a.b, 1)
+
+    def test_unknownEngine(self):
+        with self.assertRaises(ValueError) as ctx:
+            namespace.loads(u"a: 1", engine="bad")
+        self.assertEqual(format(ctx.exception), "Unknown load engine 'bad'")
+
+    def assertSameError(self, content, errorType):
+        with self.assertRaises(errorType):
+            namespace.loads(content)
+        with self.assertRaises(errorType):
+            namespace.loads(content, engine="events")
+
+    def test_undefinedAlias(self):
+        self.assertSameError(u"a: *nope\n", yaml.composer.ComposerError)
+
+    def test_manyDocuments(self):
+        self.assertSameError(u"--- 1\n--- 2\n", yaml.composer.ComposerError)
+
+    def test_unhashableKey(self):
+        self.assertSameError(u"{{a: 1}: 2}\n", yaml.constructor.ConstructorError)
+
+    def test_badMerge(self):
+        self.assertSameError(u"<<: 3\n", yaml.constructor.ConstructorError)
+
+    def test_unknownTag(self):
+        self.assertSameError(u"a: !foo 3\n", yaml.constructor.ConstructorError)
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: sw=4 ts=4 noet
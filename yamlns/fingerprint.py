@@ -0,0 +1,460 @@
+"""
+Merkle style fingerprints of namespace trees.
+
+A fingerprint is a digest of the content of a structure.
+Tracked containers keep the fingerprint of their subtree
+and mutations just forget the ones on the way up to the root,
+so unchanged subtrees are fingerprinted, compared and
+skipped in constant time.
+
+>>> from yamlns import ns
+>>> old = track(ns(a=ns(b=1), c=[1, 2]))
+>>> new = old.deepcopy()
+>>> new.a.b = 2
+>>> list(changedPaths(old, new))
+['a.b']
+"""
+
+import datetime
+import decimal
+import hashlib
+import weakref
+from .core import namespace, _base, _dictgetitem
+from .compat import py2
+from .conversion import converters, convertMapping
+from .dateutils import Date
+from .decimals import LazyDecimal
+from .frozen import frozennamespace
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_text = type(u"")
+
+# Leaves fingerprinted by their type and representation
+_scalarTypes = set(
+    [
+        type(None),
+        bool,
+        int,
+        type(2**64),  # Py2 long
+        float,
+        complex,
+        decimal.Decimal,
+        LazyDecimal,
+        datetime.date,
+        datetime.datetime,
+        datetime.time,
+        datetime.timedelta,
+        Date,
+    ]
+)
+
+if hasattr(hashlib, "blake2b"):
+
+    def _hash(content):
+        return hashlib.blake2b(content, digest_size=16).digest()
+
+else:  # Py2
+
+    def _hash(content):
+        return hashlib.sha1(content).digest()
+
+
+def _leafFingerprint(value):
+    cls = type(value)
+    if cls is _text:
+        content = value.encode("utf8")
+    elif cls is bytes:
+        content = value
+    elif cls in _scalarTypes:
+        content = repr(value).encode("utf8")
+    elif np and cls is np.ndarray and not value.dtype.hasobject:
+        header = "{}{}".format(value.dtype.str, value.shape)
+        content = header.encode("utf8") + value.tobytes()
+    else:
+        raise TypeError("Unable to fingerprint {}".format(cls.__name__))
+    return _hash(cls.__name__.encode("utf8") + b"\0" + content)
+
+
+def _compute(data):
+    if isinstance(data, dict):
+        entries = sorted(
+            fingerprint(key) + fingerprint(value) for key, value in data.items()
+        )
+        return _hash(b"map\0" + b"".join(entries))
+    if isinstance(data, list):
+        return _hash(b"list\0" + b"".join(fingerprint(item) for item in data))
+    if isinstance(data, tuple):
+        return _hash(b"tuple\0" + b"".join(fingerprint(item) for item in data))
+    if isinstance(data, (set, frozenset)):
+        entries = sorted(fingerprint(item) for item in data)
+        return _hash(b"set\0" + b"".join(entries))
+    return _leafFingerprint(data)
+
+
+def fingerprint(data):
+    """
+    Returns a digest of the content of data.
+    Mappings ignore key order, so equal mappings have the same fingerprint.
+    Scalars are typed, so 1, 1.0 and True have different fingerprints
+    despite being equal.
+
+    Tracked containers cache the result, untracked ones
+    are fingerprinted again on each call.
+    Raises TypeError for unsupported leaf types.
+    """
+    if isinstance(data, _Tracked):
+        if data._digest is None:
+            object.__setattr__(data, "_digest", _compute(data))
+        return data._digest
+    return _compute(data)
+
+
+def track(data):
+    """
+    Returns data as a tracked structure:
+    mappings become trackednamespaces and lists become trackedlists.
+    Tracked structures are returned as they are.
+    Other values, including tuples and frozen namespaces,
+    are considered immutable leaves.
+    """
+    if isinstance(data, _Tracked):
+        return data
+    if isinstance(data, list):
+        return trackedlist(data)
+    if isinstance(data, dict) and not isinstance(data, frozennamespace):
+        return trackednamespace(data)
+    return data
+
+
+def _equal(a, b):
+    """Compares a and b skipping the subtrees with the same fingerprint"""
+    if a is b:
+        return True
+    if not (isinstance(a, _Tracked) and isinstance(b, _Tracked)):
+        return a == b
+    try:
+        if fingerprint(a) == fingerprint(b):
+            return True
+    except TypeError:
+        pass
+    if isinstance(a, dict) != isinstance(b, dict):
+        return False
+    if len(a) != len(b):
+        return False
+    if isinstance(a, list):
+        return all(_equal(x, y) for x, y in zip(a, b))
+    for key, value in _base.items(a):
+        try:
+            other = _dictgetitem(b, key)
+        except KeyError:
+            return False
+        if not _equal(value, other):
+            return False
+    return True
+
+
+class _Missing(object):
+    "Marks a key or index not present in one side of a comparison"
+
+
+_missing = _Missing()
+
+
+def _childPath(path, key):
+    if not path:
+        return "{}".format(key)
+    return "{}.{}".format(path, key)
+
+
+def changedPaths(old, new):
+    """
+    Generates the dotted paths of the values that are
+    different, added or removed between old and new.
+    Only subtrees with different fingerprints are scanned,
+    so it takes time proportional to the changes
+    when both sides are tracked.
+    Lists with different length are reported as a whole.
+    """
+    stack = [("", old, new)]
+    while stack:
+        path, a, b = stack.pop()
+        if a is _missing or b is _missing:
+            yield path
+            continue
+        if a is b or fingerprint(a) == fingerprint(b):
+            continue
+        if isinstance(a, dict) and isinstance(b, dict):
+            children = [
+                (_childPath(path, key), value, b.get(key, _missing))
+                for key, value in a.items()
+            ] + [
+                (_childPath(path, key), _missing, value)
+                for key, value in b.items()
+                if key not in a
+            ]
+        elif isinstance(a, list) and isinstance(b, list) and len(a) == len(b):
+            children = [
+                (_childPath(path, index), x, y)
+                for index, (x, y) in enumerate(zip(a, b))
+            ]
+        else:
+            yield path
+            continue
+        stack.extend(reversed(children))
+
+
+class _Tracked(object):
+    """
+    Cached fingerprint and links to the containers
+    holding the object, to forget their fingerprints on changes.
+    """
+
+    __slots__ = ()
+
+    def _adopt(self, value):
+        "Tracks the value and links it to this container"
+        value = track(value)
+        if isinstance(value, _Tracked):
+            value._parents.append(weakref.ref(self))
+        return value
+
+    def _unlink(self, value):
+        "Removes the link of a value no longer in this container"
+        if not isinstance(value, _Tracked):
+            return
+        parents = value._parents
+        for i, parent in enumerate(parents):
+            if parent() is self:
+                del parents[i]
+                return
+
+    def _invalidate(self):
+        """Forgets the fingerprints from here to the root.
+        Stops at the ones already forgotten,
+        since their ancestors are forgotten too.
+        """
+        pending = [self]
+        while pending:
+            node = pending.pop()
+            if node._digest is None and node is not self:
+                continue
+            object.__setattr__(node, "_digest", None)
+            for parent in node._parents:
+                parent = parent()
+                if parent is not None and parent._digest is not None:
+                    pending.append(parent)
+
+    def fingerprint(self):
+        "Returns the cached fingerprint of the content"
+        return fingerprint(self)
+
+    def __ne__(self, other):
+        return not self == other
+
+
+class trackednamespace(_Tracked, namespace):
+    """
+    A namespace that caches the fingerprint of its content.
+    Assigned mappings and lists are converted into tracked ones,
+    so changes at any depth forget the cached fingerprints
+    up to the root.
+
+    Comparisons and `changedPaths` skip subtrees
+    with equal fingerprints.
+    Beware that, unlike with ==, NaN values are equal to themselves.
+    """
+
+    def __init__(self, *args, **kwds):
+        self._digest = None
+        self._parents = []
+        super(trackednamespace, self).__init__(*args, **kwds)
+
+    def _setitem(self, key, value):
+        value = self._adopt(value)
+        try:
+            self._unlink(_dictgetitem(self, key))
+        except KeyError:
+            pass
+        _base.__setitem__(self, key, value)
+        self._invalidate()
+
+    def __delitem__(self, name):
+        try:
+            value = _dictgetitem(self, name)
+        except KeyError:
+            # Dotted paths, deleted by the tracked container
+            return super(trackednamespace, self).__delitem__(name)
+        _base.__delitem__(self, name)
+        self._unlink(value)
+        self._invalidate()
+
+    def update(self, *args, **kwds):
+        # Item by item, adopting values and setting dotted keys as paths
+        for key, value in _base(*args, **kwds).items():
+            self[key] = value
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def setdefault(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            self[key] = default
+            return self[key]
+
+    def pop(self, key, *default):
+        try:
+            value = _dictgetitem(self, key)
+        except KeyError:
+            if default:
+                return default[0]
+            raise
+        _base.__delitem__(self, key)
+        self._unlink(value)
+        self._invalidate()
+        return value
+
+    def popitem(self):
+        key, value = _base.popitem(self)
+        self._unlink(value)
+        self._invalidate()
+        return key, value
+
+    def clear(self):
+        values = list(_base.values(self))
+        _base.clear(self)
+        for value in values:
+            self._unlink(value)
+        self._invalidate()
+
+    def __eq__(self, other):
+        if not isinstance(other, _Tracked):
+            return _base.__eq__(self, other)
+        return _equal(self, other)
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return type(self), (list(self.items()),)
+
+    @classmethod
+    def load(cls, source, lazy=False, **options):
+        "Loads the whole document, as tracked containers"
+        if lazy:
+            raise ValueError("trackednamespace cannot be loaded lazily")
+        return track(namespace.load(source, **options))
+
+
+class trackedlist(_Tracked, list):
+    """
+    A list that caches the fingerprint of its content.
+    Assigned mappings and lists are converted into tracked ones.
+    See trackednamespace.
+    """
+
+    __slots__ = ("_digest", "_parents", "__weakref__")
+
+    def __init__(self, items=()):
+        list.__init__(self)
+        self._digest = None
+        self._parents = []
+        list.extend(self, [self._adopt(item) for item in items])
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = [self._adopt(item) for item in value]
+            removed = list.__getitem__(self, index)
+        else:
+            value = self._adopt(value)
+            removed = [list.__getitem__(self, index)]
+        list.__setitem__(self, index, value)
+        for item in removed:
+            self._unlink(item)
+        self._invalidate()
+
+    def __delitem__(self, index):
+        removed = list.__getitem__(self, index)
+        if not isinstance(index, slice):
+            removed = [removed]
+        list.__delitem__(self, index)
+        for item in removed:
+            self._unlink(item)
+        self._invalidate()
+
+    if py2:
+
+        def __setslice__(self, i, j, items):
+            self[max(0, i) : max(0, j)] = items
+
+        def __delslice__(self, i, j):
+            del self[max(0, i) : max(0, j)]
+
+    def append(self, item):
+        list.append(self, self._adopt(item))
+        self._invalidate()
+
+    def extend(self, items):
+        list.extend(self, [self._adopt(item) for item in items])
+        self._invalidate()
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def __imul__(self, times):
+        self[:] = list(self) * times
+        return self
+
+    def insert(self, index, item):
+        list.insert(self, index, self._adopt(item))
+        self._invalidate()
+
+    def pop(self, index=-1):
+        value = list.pop(self, index)
+        self._unlink(value)
+        self._invalidate()
+        return value
+
+    def remove(self, item):
+        del self[self.index(item)]
+
+    def clear(self):
+        del self[:]
+
+    def sort(self, *args, **kwds):
+        list.sort(self, *args, **kwds)
+        self._invalidate()
+
+    def reverse(self):
+        list.reverse(self)
+        self._invalidate()
+
+    def __eq__(self, other):
+        if not isinstance(other, _Tracked):
+            return list.__eq__(self, other)
+        return _equal(self, other)
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return type(self), (list(self),)
+
+
+def _convertTrackedList(source, sorted, inplace):
+    "Converter for trackedlist, reused when converting inplace"
+    if inplace:
+        return source
+    return list(source)
+
+
+converters[trackednamespace] = convertMapping
+converters[trackedlist] = _convertTrackedList
+
+
+# vim: sw=4 ts=4 noet
@@ -0,0 +1,327 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+import io
+import copy
+import pickle
+import decimal
+import unittest
+from .core import namespace
+from .dateutils import Date
+from .frozen import frozennamespace
+from .fingerprint import (
+    fingerprint,
+    track,
+    changedPaths,
+    trackednamespace,
+    trackedlist,
+)
+
+
+def sample():
+    return track(
+        namespace(
+            a=namespace(b=1, c=namespace(d=[1, namespace(e=2)])),
+            f=namespace(g="text"),
+        )
+    )
+
+
+class Fingerprint_Test(unittest.TestCase):
+
+    def test_equalContent_sameFingerprint(self):
+        self.assertEqual(
+            fingerprint(namespace(a=1, b=[1, "two"])),
+            fingerprint(dict(a=1, b=[1, "two"])),
+        )
+
+    def test_keyOrder_ignored(self):
+        self.assertEqual(
+            fingerprint(namespace([("a", 1), ("b", 2)])),
+            fingerprint(namespace([("b", 2), ("a", 1)])),
+        )
+
+    def test_listOrder_considered(self):
+        self.assertNotEqual(fingerprint([1, 2]), fingerprint([2, 1]))
+
+    def test_scalars_typed(self):
+        fingerprints = set(
+            fingerprint(x) for x in [1, 1.0, True, u"1", b"1", decimal.Decimal("1")]
+        )
+        self.assertEqual(len(fingerprints), 6)
+
+    def test_containers_typed(self):
+        self.assertNotEqual(fingerprint([1]), fingerprint((1,)))
+        self.assertNotEqual(fingerprint([1]), fingerprint(set([1])))
+
+    def test_mappingValues_distinguished(self):
+        self.assertNotEqual(
+            fingerprint(namespace(a=1, b=2)),
+            fingerprint(namespace(a=2, b=1)),
+        )
+
+    def test_dates(self):
+        self.assertEqual(
+            fingerprint(Date("2020-01-01")),
+            fingerprint(Date("2020-01-01")),
+        )
+        self.assertNotEqual(
+            fingerprint(Date("2020-01-01")),
+            fingerprint(Date("2020-01-02")),
+        )
+
+    def test_unsupportedLeaf(self):
+        with self.assertRaises(TypeError) as ctx:
+            fingerprint(namespace(a=object()))
+        self.assertEqual(format(ctx.exception), "Unable to fingerprint object")
+
+    def test_frozen_asMapping(self):
+        self.assertEqual(
+            fingerprint(frozennamespace(a=1)),
+            fingerprint(namespace(a=1)),
+        )
+
+
+class Track_Test(unittest.TestCase):
+
+    def test_convertsContainers(self):
+        data = sample()
+        self.assertEqual(type(data), trackednamespace)
+        self.assertEqual(type(data.a.c), trackednamespace)
+        self.assertEqual(type(data.a.c.d), trackedlist)
+        self.assertEqual(type(data.a.c.d[1]), trackednamespace)
+
+    def test_tracked_returnedAsIs(self):
+        data = sample()
+        self.assertIs(track(data), data)
+
+    def test_leavesKept(self):
+        frozen = frozennamespace(a=1)
+        self.assertIs(track(frozen), frozen)
+        self.assertEqual(track((1, 2)), (1, 2))
+
+    def test_fingerprint_cached(self):
+        data = sample()
+        self.assertIsNone(data._digest)
+        value = data.fingerprint()
+        self.assertEqual(data._digest, value)
+        self.assertEqual(data.a.c._digest, fingerprint(data.a.c))
+        self.assertEqual(value, fingerprint(namespace.deep(data)))
+
+    def assertInvalidates(self, operation, expected):
+        data = sample()
+        data.fingerprint()
+        nodes = [
+            ("root", data),
+            ("a", data.a),
+            ("c", data.a.c),
+            ("d", data.a.c.d),
+            ("e", data.a.c.d[1]),
+            ("f", data.f),
+        ]
+        operation(data)
+        forgotten = [name for name, node in nodes if node._digest is None]
+        self.assertEqual(forgotten, expected)
+        self.assertEqual(data.fingerprint(), fingerprint(namespace.deep(data)))
+
+    def test_setattr(self):
+        def operation(data):
+            data.a.c.x = 1
+
+        self.assertInvalidates(operation, ["root", "a", "c"])
+
+    def test_setitem_dotted(self):
+        def operation(data):
+            data["a.c.x"] = 1
+
+        self.assertInvalidates(operation, ["root", "a", "c"])
+
+    def test_setitem_dottedMissing_createsTracked(self):
+        data = sample()
+        data["f.h.i"] = 1
+        self.assertEqual(type(data.f.h), trackednamespace)
+        data.fingerprint()
+        data.f.h.i = 2
+        self.assertIsNone(data._digest)
+
+    def test_dottedKeys_setAsPaths(self):
+        data = trackednamespace([("f.h", 1)], **{"f.i": 2})
+        data.update({"a.c.x": 3})
+        self.assertEqual(data.setdefault("a.y.z", [4]), [4])
+        self.assertEqual(data.a.c.x, 3)
+        self.assertEqual(type(data.a.y), trackednamespace)
+        self.assertEqual(type(data.a.y.z), trackedlist)
+        self.assertEqual(data.setdefault("a.c.x", 5), 3)
+        self.assertEqual(dict(data.f), dict(h=1, i=2))
+        self.assertEqual(type(data.f), trackednamespace)
+
+    def test_delattr(self):
+        def operation(data):
+            del data.a.c.d
+
+        self.assertInvalidates(operation, ["root", "a", "c"])
+
+    def test_listItem(self):
+        def operation(data):
+            data.a.c.d[1].e = 3
+
+        self.assertInvalidates(operation, ["root", "a", "c", "d", "e"])
+
+    def test_listMethods(self):
+        for operation in [
+            lambda data: data.a.c.d.append(3),
+            lambda data: data.a.c.d.extend([3]),
+            lambda data: data.a.c.d.insert(0, 3),
+            lambda data: data.a.c.d.pop(0),
+            lambda data: data.a.c.d.remove(1),
+            lambda data: data.a.c.d.reverse(),
+            lambda data: data.a.c.d.__setitem__(0, 5),
+            lambda data: data.a.c.d.__delitem__(0),
+        ]:
+            self.assertInvalidates(operation, ["root", "a", "c", "d"])
+
+    def test_mappingMethods(self):
+        for operation in [
+            lambda data: data.a.update(x=1),
+            lambda data: data.a.setdefault("x", 1),
+            lambda data: data.a.pop("b"),
+            lambda data: data.f.clear(),
+        ]:
+            data = sample()
+            data.fingerprint()
+            operation(data)
+            self.assertIsNone(data._digest)
+            self.assertEqual(data.fingerprint(), fingerprint(namespace.deep(data)))
+
+    def test_assignedContainers_tracked(self):
+        data = sample()
+        data.x = dict(y=[dict(z=1)])
+        self.assertEqual(type(data.x), trackednamespace)
+        self.assertEqual(type(data.x.y), trackedlist)
+        self.assertEqual(type(data.x.y[0]), trackednamespace)
+
+    def test_removedChild_unlinked(self):
+        data = sample()
+        child = data.a
+        del data.a
+        data.fingerprint()
+        child.b = 2
+        self.assertIsNotNone(data._digest)
+
+    def test_replacedChild_unlinked(self):
+        data = sample()
+        child = data.f
+        data.f = 3
+        data.fingerprint()
+        child.g = 2
+        self.assertIsNotNone(data._digest)
+
+    def test_sharedChild_invalidatesAllParents(self):
+        child = track(namespace(a=1))
+        one = track(namespace(child=child))
+        other = track(namespace(child=child))
+        one.fingerprint()
+        other.fingerprint()
+        child.a = 2
+        self.assertIsNone(one._digest)
+        self.assertIsNone(other._digest)
+
+    def test_load(self):
+        data = trackednamespace.loads("a:\n  b: [1, {c: 2}]\n")
+        self.assertEqual(type(data), trackednamespace)
+        self.assertEqual(type(data.a.b[1]), trackednamespace)
+
+    def test_load_lazy_fails(self):
+        with self.assertRaises(ValueError):
+            trackednamespace.load(io.StringIO(u"a: 1\n"), lazy=True)
+
+    def test_dump(self):
+        data = sample()
+        self.assertEqual(data.dump(), namespace.deep(data).dump())
+
+    def test_pickle(self):
+        data = sample()
+        result = pickle.loads(pickle.dumps(data))
+        self.assertEqual(type(result.a.c.d), trackedlist)
+        self.assertEqual(result, data)
+
+    def test_deepcopy(self):
+        data = sample()
+        result = copy.deepcopy(data)
+        self.assertEqual(type(result.a.c.d), trackedlist)
+        self.assertEqual(type(result.a.c.d[1]), trackednamespace)
+        self.assertEqual(result, data)
+        result.a.c.d[1].e = 5
+        self.assertEqual(data.a.c.d[1].e, 2)
+
+    def test_deep_untracks(self):
+        result = namespace.deep(sample())
+        self.assertEqual(type(result), namespace)
+        self.assertEqual(type(result.a.c.d), list)
+
+
+class Equality_Test(unittest.TestCase):
+
+    def test_equal(self):
+        self.assertEqual(sample(), sample())
+        self.assertFalse(sample() != sample())
+
+    def test_different(self):
+        other = sample()
+        other.a.c.d[1].e = 3
+        self.assertNotEqual(sample(), other)
+
+    def test_differentFingerprint_equalValues(self):
+        one = sample()
+        other = sample()
+        other.a.b = 1.0
+        self.assertEqual(one, other)
+
+    def test_untracked(self):
+        self.assertEqual(sample(), namespace.deep(sample()))
+        self.assertEqual(namespace.deep(sample()), sample())
+
+    def test_unsupportedLeaf(self):
+        value = object()
+        self.assertEqual(track(namespace(a=value)), track(namespace(a=value)))
+
+
+class ChangedPaths_Test(unittest.TestCase):
+
+    def test_equal(self):
+        self.assertEqual(list(changedPaths(sample(), sample())), [])
+
+    def test_changed(self):
+        new = sample()
+        new.a.c.d[1].e = 3
+        new.f.g = "other"
+        self.assertEqual(
+            list(changedPaths(sample(), new)),
+            ["a.c.d.1.e", "f.g"],
+        )
+
+    def test_addedAndRemoved(self):
+        new = sample()
+        del new.a.b
+        new.a.x = 1
+        self.assertEqual(list(changedPaths(sample(), new)), ["a.b", "a.x"])
+
+    def test_listLength(self):
+        new = sample()
+        new.a.c.d.append(3)
+        self.assertEqual(list(changedPaths(sample(), new)), ["a.c.d"])
+
+    def test_root(self):
+        self.assertEqual(list(changedPaths(1, 2)), [""])
+
+    def test_untracked(self):
+        new = namespace.deep(sample())
+        new.a.b = 2
+        self.assertEqual(list(changedPaths(namespace.deep(sample()), new)), ["a.b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: sw=4 ts=4 noet
@@ -0,0 +1,112 @@
+"""
+Immutable and hashable namespaces.
+"""
+
+from .core import namespace, _base, _dictget, _strtypes
+from .compat import orderedDicts
+from .conversion import converters, convertMapping
+from .copying import atomicTypes
+
+
+def _immutable(self, *args, **kwds):
+    raise TypeError("{} is immutable".format(type(self).__name__))
+
+
+class frozennamespace(namespace):
+    """
+    A namespace that cannot be modified and can be hashed,
+    so it can be used as dictionary key or memoization argument.
+    Values should be hashable as well, see `freeze`.
+
+    The structural hash is computed on first use and kept.
+    Equality fails fast when hashes differ.
+    """
+
+    __slots__ = ("_hash",)
+
+    def __init__(self, *args, **kwds):
+        object.__setattr__(self, "_hash", None)
+        if not orderedDicts:  # Py2 OrderedDict sets up its links
+            _base.__init__(self)
+        # Dotted keys are paths, as in namespace, under frozen namespaces
+        for key, value in _base(*args, **kwds).items():
+            if type(key) in _strtypes and "." in key:
+                key, subkey = key.split(".", 1)
+                inner = _base(_dictget(self, key, ()))
+                inner[subkey] = value
+                value = frozennamespace(inner)
+            self._setitem(key, value)
+
+    def __setattr__(self, name, value):
+        # Private attributes are not content (Py2 OrderedDict uses them)
+        if name.startswith("_"):
+            return object.__setattr__(self, name, value)
+        _immutable(self)
+
+    __setitem__ = _immutable
+    __delitem__ = _immutable
+    __delattr__ = _immutable
+    __ior__ = _immutable
+    clear = _immutable
+    pop = _immutable
+    popitem = _immutable
+    setdefault = _immutable
+    update = _immutable
+
+    def __hash__(self):
+        result = self._hash
+        if result is None:
+            result = hash((frozennamespace, frozenset(dict.items(self))))
+            object.__setattr__(self, "_hash", result)
+        return result
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if isinstance(other, frozennamespace) and hash(self) != hash(other):
+            return False
+        return super(frozennamespace, self).__eq__(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __reduce__(self):
+        return type(self), (list(_base.items(self)),)
+
+    def copy(self):
+        return self
+
+    def thaw(self):
+        """Returns a mutable deep copy:
+        namespaces instead of frozen namespaces and lists instead of tuples.
+        """
+        return namespace.deep(self)
+
+
+def convertFrozen(source, sorted, inplace):
+    "Converter for frozennamespace, never modified inplace"
+    return convertMapping(source, sorted, False)
+
+
+converters[frozennamespace] = convertFrozen
+atomicTypes.add(frozennamespace)
+
+
+def freeze(data):
+    """
+    Returns an immutable version of data:
+    mappings become frozen namespaces, lists and tuples become tuples
+    and sets become frozen sets.
+    """
+    if isinstance(data, frozennamespace):
+        return data
+    if isinstance(data, dict):
+        return frozennamespace((key, freeze(value)) for key, value in data.items())
+    if isinstance(data, (list, tuple)):
+        return tuple(freeze(item) for item in data)
+    if isinstance(data, (set, frozenset)):
+        return frozenset(freeze(item) for item in data)
+    return data
+
+
+# vim: sw=4 ts=4 noet
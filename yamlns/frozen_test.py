@@ -0,0 +1,199 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+import copy
+import pickle
+import unittest
+import functools
+from .core import namespace
+from .compat import py2
+from .frozen import frozennamespace, freeze
+
+
+class FrozenNamespace_Test(unittest.TestCase):
+
+    def test_access(self):
+        data = frozennamespace(a=1, b=frozennamespace(c=2))
+        self.assertEqual(data.a, 1)
+        self.assertEqual(data["b.c"], 2)
+
+    def test_dottedKeys_nested(self):
+        data = frozennamespace([("a.b", 1), ("c", 2), ("a.d.e", 3)])
+        self.assertEqual(list(data.keys()), ["a", "c"])
+        self.assertEqual(type(data.a), frozennamespace)
+        self.assertEqual(type(data.a.d), frozennamespace)
+        self.assertEqual(data, namespace.loads("a: {b: 1, d: {e: 3}}\nc: 2"))
+        hash(data)
+
+    def test_dottedKeys_mergedIntoGiven(self):
+        given = frozennamespace(x=0)
+        data = frozennamespace([("a", given), ("a.b", 1)])
+        self.assertEqual(list(data.a.items()), [("x", 0), ("b", 1)])
+        self.assertEqual(given, frozennamespace(x=0))
+
+    def test_isNamespace(self):
+        self.assertIsInstance(frozennamespace(), namespace)
+
+    def test_equalsToNamespace(self):
+        self.assertEqual(frozennamespace(a=1), namespace(a=1))
+        self.assertEqual(namespace(a=1), frozennamespace(a=1))
+
+    def test_equality_differentContent(self):
+        self.assertNotEqual(frozennamespace(a=1), frozennamespace(a=2))
+        self.assertFalse(frozennamespace(a=1) == frozennamespace(a=2))
+
+    def test_hash_equalForEqualContent(self):
+        self.assertEqual(
+            hash(frozennamespace([("a", 1), ("b", 2)])),
+            hash(frozennamespace([("b", 2), ("a", 1)])),
+        )
+
+    def test_hash_cached(self):
+        data = frozennamespace(a=1)
+        self.assertIsNone(data._hash)
+        value = hash(data)
+        self.assertEqual(data._hash, value)
+
+    def test_hash_unhashableValue(self):
+        with self.assertRaises(TypeError):
+            hash(frozennamespace(a=[1]))
+
+    def test_asDictKey(self):
+        cache = {frozennamespace(a=1): "one"}
+        self.assertEqual(cache[frozennamespace(a=1)], "one")
+
+    @unittest.skipIf(py2, "Py2 functools has no lru_cache")
+    def test_asMemoizationArgument(self):
+        calls = []
+
+        @functools.lru_cache()
+        def compute(config):
+            calls.append(config)
+            return config.a * 2
+
+        self.assertEqual(compute(frozennamespace(a=2)), 4)
+        self.assertEqual(compute(frozennamespace(a=2)), 4)
+        self.assertEqual(len(calls), 1)
+
+    def assertImmutable(self, operation):
+        data = frozennamespace(a=1, b=frozennamespace(c=2))
+        with self.assertRaises(TypeError) as ctx:
+            operation(data)
+        self.assertEqual(format(ctx.exception), "frozennamespace is immutable")
+        self.assertEqual(data, namespace(a=1, b=namespace(c=2)))
+
+    def test_setitem(self):
+        def operation(data):
+            data["a"] = 2
+
+        self.assertImmutable(operation)
+
+    def test_setitem_dotted(self):
+        def operation(data):
+            data["b.c"] = 3
+
+        self.assertImmutable(operation)
+
+    def test_setattr(self):
+        def operation(data):
+            data.a = 2
+
+        self.assertImmutable(operation)
+
+    def test_delitem(self):
+        def operation(data):
+            del data["a"]
+
+        self.assertImmutable(operation)
+
+    def test_delattr(self):
+        def operation(data):
+            del data.a
+
+        self.assertImmutable(operation)
+
+    def test_mutatorMethods(self):
+        self.assertImmutable(lambda data: data.update(a=2))
+        self.assertImmutable(lambda data: data.pop("a"))
+        self.assertImmutable(lambda data: data.popitem())
+        self.assertImmutable(lambda data: data.setdefault("z", 1))
+        self.assertImmutable(lambda data: data.clear())
+
+    def test_copy_returnsSelf(self):
+        data = frozennamespace(a=1)
+        self.assertIs(data.copy(), data)
+        self.assertIs(copy.deepcopy(data), data)
+
+    def test_deepcopy_insideNamespace_isShared(self):
+        frozen = frozennamespace(a=1)
+        data = namespace(frozen=frozen)
+        self.assertIs(data.deepcopy().frozen, frozen)
+
+    def test_pickle(self):
+        data = frozennamespace([("b", 1), ("a", (1, 2))])
+        result = pickle.loads(pickle.dumps(data))
+        self.assertEqual(type(result), frozennamespace)
+        self.assertEqual(list(result.items()), [("b", 1), ("a", (1, 2))])
+        self.assertEqual(hash(result), hash(data))
+
+    def test_dump(self):
+        data = frozennamespace([("b", 1), ("a", (1, 2))])
+        self.assertEqual(data.dump(), "b: 1\na:\n- 1\n- 2\n")
+
+    def test_deep_inplace_doesNotModify(self):
+        frozen = frozennamespace(b=(1, 2))
+        data = namespace(a=frozen)
+        result = namespace.deep(data, inplace=True)
+        self.assertIs(result, data)
+        self.assertEqual(type(result.a), namespace)
+        self.assertEqual(result.a.b, [1, 2])
+        self.assertEqual(frozen.b, (1, 2))
+
+
+class Freeze_Test(unittest.TestCase):
+
+    def test_leaf(self):
+        self.assertEqual(freeze(3), 3)
+
+    def test_namespace(self):
+        result = namespace([("b", 1), ("a", namespace(c=2))]).freeze()
+        self.assertEqual(type(result), frozennamespace)
+        self.assertEqual(type(result.a), frozennamespace)
+        self.assertEqual(list(result.keys()), ["b", "a"])
+
+    def test_sequences_becomeTuples(self):
+        result = freeze(namespace(a=[1, dict(b=[2])]))
+        self.assertEqual(result.a, (1, frozennamespace(b=(2,))))
+        self.assertEqual(type(result.a[1]), frozennamespace)
+
+    def test_sets_becomeFrozenSets(self):
+        result = freeze(namespace(a=set([1, 2])))
+        self.assertEqual(result.a, frozenset([1, 2]))
+
+    def test_frozen_returnedAsIs(self):
+        data = frozennamespace(a=1)
+        self.assertIs(freeze(data), data)
+
+    def test_result_isHashable(self):
+        data = namespace(a=[1, namespace(b=[2, 3])])
+        self.assertEqual(hash(data.freeze()), hash(data.freeze()))
+
+    def test_dottedKeys_expanded(self):
+        data = namespace()
+        data._setitem("a.b", 1)
+        self.assertEqual(data.freeze(), frozennamespace(a=frozennamespace(b=1)))
+
+    def test_thaw(self):
+        frozen = namespace(a=[1, namespace(b=[2])]).freeze()
+        result = frozen.thaw()
+        self.assertEqual(type(result), namespace)
+        self.assertEqual(type(result.a), list)
+        self.assertEqual(type(result.a[1]), namespace)
+        self.assertEqual(result, namespace(a=[1, namespace(b=[2])]))
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: sw=4 ts=4 noet
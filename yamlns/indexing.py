@@ -0,0 +1,355 @@
+"""
+Secondary indexes over lists of namespaces.
+
+>>> from yamlns import ns
+>>> contracts = indexedlist([
+...     ns(code='A', owner=ns(vat='ES1'), power=3),
+...     ns(code='B', owner=ns(vat='ES2'), power=5),
+... ])
+>>> [c.code for c in contracts.hashIndex('owner.vat').find('ES2')]
+['B']
+>>> contracts.append(ns(code='C', owner=ns(vat='ES2'), power=4))
+>>> [c.code for c in contracts.sortedIndex('power').between(4, 5)]
+['C', 'B']
+"""
+
+import bisect
+from .paths import compilePath
+from .compat import py2
+
+_missing = object()
+
+
+def _getter(path):
+    "Returns a function that gets the value at the path, or _missing"
+    get = compilePath(path).get
+
+    def getter(record):
+        try:
+            return get(record)
+        except (KeyError, IndexError, TypeError):  # TypeError: a scalar on the path
+            return _missing
+
+    return getter
+
+
+def _extractor(paths):
+    """Returns a function that extracts the key of a record,
+    a value for a single path or a tuple of them,
+    and _missing if any path is missing.
+    """
+    getters = [_getter(path) for path in paths]
+    if len(getters) == 1:
+        return getters[0]
+
+    def extract(record):
+        key = tuple(get(record) for get in getters)
+        if _missing in key:
+            return _missing
+        return key
+
+    return extract
+
+
+def _hashable(value):
+    "Lists as tuples, so that they can be looked up"
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(item) for item in value)
+    return value
+
+
+class HashIndex(object):
+    """
+    Index of records by the values at the given dotted paths,
+    for equality lookups.
+    Records missing any of the paths are not indexed.
+    List values are indexed and looked up as tuples.
+    """
+
+    def __init__(self, records, *paths):
+        self.paths = paths
+        self._key = _extractor(paths)
+        self._buckets = {}
+        for record in records:
+            self.add(record)
+
+    def _recordKey(self, record):
+        key = self._key(record)
+        if key is _missing:
+            return key
+        key = _hashable(key)
+        try:
+            hash(key)
+        except TypeError:
+            raise TypeError(
+                "Unable to index by {}, unhashable value {!r}".format(
+                    ", ".join(self.paths), key
+                )
+            )
+        return key
+
+    def add(self, record):
+        key = self._recordKey(record)
+        if key is _missing:
+            return
+        self._buckets.setdefault(key, []).append(record)
+
+    def discard(self, record):
+        key = self._recordKey(record)
+        bucket = self._buckets.get(key) if key is not _missing else None
+        if not bucket:
+            return
+        for position, candidate in enumerate(bucket):
+            if candidate is record:
+                del bucket[position]
+                break
+        if not bucket:
+            del self._buckets[key]
+
+    def clear(self):
+        self._buckets.clear()
+
+    def find(self, *values):
+        """Returns the list of records with the values at the paths"""
+        key = _hashable(values[0] if len(values) == 1 else values)
+        return list(self._buckets.get(key, ()))
+
+    def first(self, *values, **kwds):
+        """Returns the first record with the values, or default"""
+        key = _hashable(values[0] if len(values) == 1 else values)
+        bucket = self._buckets.get(key)
+        if not bucket:
+            return kwds.get("default")
+        return bucket[0]
+
+    def keys(self):
+        return self._buckets.keys()
+
+    def __contains__(self, key):
+        return _hashable(key) in self._buckets
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self._buckets.values())
+
+
+class SortedIndex(object):
+    """
+    Index of records sorted by the values at the given dotted paths,
+    for range lookups on numbers, Decimal or dates.
+    Records missing any of the paths, or having None, are not indexed.
+    Records with the same key keep the order they were added.
+    """
+
+    def __init__(self, records, *paths):
+        self.paths = paths
+        self._key = _extractor(paths)
+        entries = [(self._key(record), record) for record in records]
+        entries = [entry for entry in entries if self._indexable(entry[0])]
+        entries.sort(key=lambda entry: entry[0])  # stable
+        self._keys = [key for key, record in entries]
+        self._records = [record for key, record in entries]
+
+    @staticmethod
+    def _indexable(key):
+        if key is _missing or key is None:
+            return False
+        if type(key) is tuple and None in key:
+            return False
+        return True
+
+    def add(self, record):
+        key = self._key(record)
+        if not self._indexable(key):
+            return
+        position = bisect.bisect_right(self._keys, key)
+        self._keys.insert(position, key)
+        self._records.insert(position, record)
+
+    def discard(self, record):
+        key = self._key(record)
+        if not self._indexable(key):
+            return
+        start = bisect.bisect_left(self._keys, key)
+        stop = bisect.bisect_right(self._keys, key)
+        for position in range(start, stop):
+            if self._records[position] is record:
+                del self._keys[position]
+                del self._records[position]
+                return
+
+    def clear(self):
+        del self._keys[:]
+        del self._records[:]
+
+    def find(self, *values):
+        """Returns the list of records with the values at the paths"""
+        key = values[0] if len(values) == 1 else values
+        if not self._indexable(key):  # None is not indexed, nor unbounded
+            return []
+        return self.between(key, key)
+
+    def between(self, low=None, high=None):
+        """Returns the records with keys from low to high, both included,
+        in key order. A None bound means unbounded.
+        For many paths, bounds are tuples.
+        """
+        start = 0 if low is None else bisect.bisect_left(self._keys, low)
+        stop = (
+            len(self._keys) if high is None else bisect.bisect_right(self._keys, high)
+        )
+        return self._records[start:stop]
+
+    def __iter__(self):
+        return iter(list(self._records))
+
+    def __len__(self):
+        return len(self._records)
+
+
+def sortedBy(records, *paths, **kwds):
+    """
+    Returns a list with the records sorted by the values at the dotted paths.
+    Each key is extracted once per record.
+    Records missing the values, or having None, go at the end.
+    Set `reverse=True` to get the descending order.
+    """
+    reverse = kwds.pop("reverse", False)
+    if kwds:
+        raise TypeError("Unexpected arguments: {}".format(", ".join(kwds)))
+    extract = _extractor(paths)
+    entries = []
+    unsorted = []
+    for record in records:
+        key = extract(record)
+        if SortedIndex._indexable(key):
+            entries.append((key, record))
+        else:
+            unsorted.append(record)
+    # Missing ones are kept aside, so they stay last also when reversed
+    entries.sort(key=lambda entry: entry[0], reverse=reverse)
+    return [record for key, record in entries] + unsorted
+
+
+class indexedlist(list):
+    """
+    A list of records that keeps its indexes up to date
+    when records are added or removed through it.
+
+    Modifying the indexed values inside a record
+    does not update the indexes, call `reindex()` then.
+    """
+
+    def __init__(self, records=()):
+        list.__init__(self, records)
+        self._indexes = {}
+
+    def _getIndex(self, cls, paths):
+        key = (cls, paths)
+        index = self._indexes.get(key)
+        if index is None:
+            index = self._indexes[key] = cls(self, *paths)
+        return index
+
+    def hashIndex(self, *paths):
+        """Returns the HashIndex for the paths, building it the first time"""
+        return self._getIndex(HashIndex, paths)
+
+    def sortedIndex(self, *paths):
+        """Returns the SortedIndex for the paths, building it the first time"""
+        return self._getIndex(SortedIndex, paths)
+
+    def dropIndex(self, *paths):
+        """Removes the indexes for the paths"""
+        for cls in (HashIndex, SortedIndex):
+            self._indexes.pop((cls, paths), None)
+
+    def reindex(self):
+        """Rebuilds the indexes, needed after modifying indexed values"""
+        for key in list(self._indexes):
+            cls, paths = key
+            self._indexes[key] = cls(self, *paths)
+
+    def _added(self, records):
+        for index in self._indexes.values():
+            for record in records:
+                index.add(record)
+
+    def _removed(self, records):
+        for index in self._indexes.values():
+            for record in records:
+                index.discard(record)
+
+    def append(self, record):
+        list.append(self, record)
+        self._added([record])
+
+    def extend(self, records):
+        records = list(records)
+        list.extend(self, records)
+        self._added(records)
+
+    def __iadd__(self, records):
+        self.extend(records)
+        return self
+
+    def __imul__(self, times):
+        if times <= 0:
+            self.clear()
+        else:
+            self.extend(list(self) * (times - 1))
+        return self
+
+    def insert(self, position, record):
+        list.insert(self, position, record)
+        self._added([record])
+
+    def pop(self, position=-1):
+        record = list.pop(self, position)
+        self._removed([record])
+        return record
+
+    def remove(self, record):
+        del self[self.index(record)]
+
+    def clear(self):
+        del self[:]
+
+    def __setitem__(self, position, value):
+        if isinstance(position, slice):
+            value = list(value)
+            removed = list.__getitem__(self, position)
+            added = value
+        else:
+            removed = [list.__getitem__(self, position)]
+            added = [value]
+        list.__setitem__(self, position, value)
+        self._removed(removed)
+        self._added(added)
+
+    def __delitem__(self, position):
+        removed = list.__getitem__(self, position)
+        if not isinstance(position, slice):
+            removed = [removed]
+        list.__delitem__(self, position)
+        self._removed(removed)
+
+    if py2:
+
+        # Simple slices would call them back, explicit slice objects do not
+        def __setslice__(self, start, stop, value):
+            self.__setitem__(slice(max(0, start), max(0, stop)), value)
+
+        def __delslice__(self, start, stop):
+            self.__delitem__(slice(max(0, start), max(0, stop)))
+
+    def sortBy(self, *paths, **kwds):
+        """Sorts the records in place by the values at the dotted paths,
+        see sortedBy.
+        """
+        list.__setitem__(self, slice(None), sortedBy(self, *paths, **kwds))
+
+    def __reduce__(self):
+        return type(self), (list(self),)
+
+
+# vim: sw=4 ts=4 noet
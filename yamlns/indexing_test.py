@@ -0,0 +1,268 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+import pickle
+import decimal
+import unittest
+from .core import namespace
+from .dateutils import Date
+from .indexing import indexedlist, HashIndex, SortedIndex, sortedBy
+
+
+def record(code, vat, amount=None, date=None):
+    result = namespace(code=code, owner=namespace(vat=vat))
+    if amount is not None:
+        result.amount = decimal.Decimal(amount)
+    if date is not None:
+        result.date = Date(date)
+    return result
+
+
+def sample():
+    return indexedlist(
+        [
+            record("A", "ES1", "10.5", "2020-01-01"),
+            record("B", "ES2", "3", "2021-01-01"),
+            record("C", "ES1", "7", "2019-06-01"),
+            record("D", "ES3"),
+        ]
+    )
+
+
+def codes(records):
+    return [r.code for r in records]
+
+
+class HashIndex_Test(unittest.TestCase):
+
+    def test_find(self):
+        index = HashIndex(sample(), "owner.vat")
+        self.assertEqual(codes(index.find("ES1")), ["A", "C"])
+        self.assertEqual(index.find("ES9"), [])
+
+    def test_first(self):
+        index = HashIndex(sample(), "owner.vat")
+        self.assertEqual(index.first("ES1").code, "A")
+        self.assertEqual(index.first("ES9", default=3), 3)
+
+    def test_manyPaths(self):
+        index = HashIndex(sample(), "owner.vat", "code")
+        self.assertEqual(codes(index.find("ES1", "C")), ["C"])
+
+    def test_missingPath_notIndexed(self):
+        index = HashIndex(sample(), "amount")
+        self.assertEqual(len(index), 3)
+        self.assertIn(decimal.Decimal(3), index)
+
+    def test_scalarOnPath_notIndexed(self):
+        records = sample()
+        records[0].owner = None
+        records[1].owner = "ES2"
+        index = HashIndex(records, "owner.vat")
+        self.assertEqual(len(index), 2)
+        self.assertEqual(codes(index.find("ES1")), ["C"])
+
+    def test_listValues_asTuples(self):
+        records = sample()
+        records[0].tags = ["x", "y"]
+        records[1].tags = ("x", "y")
+        index = HashIndex(records, "tags")
+        self.assertEqual(codes(index.find(["x", "y"])), ["A", "B"])
+        self.assertIn(("x", "y"), index)
+        index.discard(records[0])
+        self.assertEqual(codes(index.find(("x", "y"))), ["B"])
+
+    def test_unhashableValue_fails(self):
+        records = sample()
+        with self.assertRaises(TypeError) as ctx:
+            HashIndex(records, "owner")
+        self.assertIn("owner", format(ctx.exception))
+
+    def test_discard(self):
+        records = sample()
+        index = HashIndex(records, "owner.vat")
+        index.discard(records[0])
+        self.assertEqual(codes(index.find("ES1")), ["C"])
+        index.discard(records[2])
+        self.assertNotIn("ES1", index)
+
+
+class SortedIndex_Test(unittest.TestCase):
+
+    def test_iter_sorted(self):
+        index = SortedIndex(sample(), "amount")
+        self.assertEqual(codes(index), ["B", "C", "A"])
+
+    def test_between(self):
+        index = SortedIndex(sample(), "amount")
+        self.assertEqual(
+            codes(index.between(decimal.Decimal(3), decimal.Decimal(7))), ["B", "C"]
+        )
+        self.assertEqual(codes(index.between(low=decimal.Decimal(5))), ["C", "A"])
+        self.assertEqual(codes(index.between(high=decimal.Decimal(5))), ["B"])
+
+    def test_dates(self):
+        index = SortedIndex(sample(), "date")
+        self.assertEqual(
+            codes(index.between(Date("2020-01-01"), Date("2020-12-31"))), ["A"]
+        )
+
+    def test_find(self):
+        index = SortedIndex(sample(), "owner.vat")
+        self.assertEqual(codes(index.find("ES1")), ["A", "C"])
+
+    def test_find_manyPaths(self):
+        index = SortedIndex(sample(), "owner.vat", "code")
+        self.assertEqual(codes(index.find("ES1", "C")), ["C"])
+
+    def test_none_notIndexed(self):
+        records = sample()
+        records[0].amount = None
+        self.assertEqual(codes(SortedIndex(records, "amount")), ["B", "C"])
+
+    def test_scalarOnPath_notIndexed(self):
+        records = sample()
+        records[0].owner = None
+        self.assertEqual(codes(SortedIndex(records, "owner.vat")), ["C", "B", "D"])
+
+    def test_find_none_isEmpty(self):
+        records = sample()
+        records[0].amount = None
+        index = SortedIndex(records, "amount")
+        self.assertEqual(index.find(None), [])
+        self.assertEqual(SortedIndex(records, "amount", "code").find(None, "A"), [])
+
+    def test_addAndDiscard(self):
+        records = sample()
+        index = SortedIndex(records, "amount")
+        extra = record("E", "ES4", "7")
+        index.add(extra)
+        self.assertEqual(codes(index), ["B", "C", "E", "A"])
+        index.discard(records[2])
+        self.assertEqual(codes(index), ["B", "E", "A"])
+
+
+class IndexedList_Test(unittest.TestCase):
+
+    def test_indexesReused(self):
+        records = sample()
+        self.assertIs(records.hashIndex("owner.vat"), records.hashIndex("owner.vat"))
+        self.assertIsNot(
+            records.hashIndex("owner.vat"), records.sortedIndex("owner.vat")
+        )
+
+    def assertIndexed(self, records):
+        "Indexes are the same than building them again"
+        vat = HashIndex(records, "owner.vat")
+        for key in vat.keys():
+            self.assertEqual(
+                codes(records.hashIndex("owner.vat").find(key)), codes(vat.find(key))
+            )
+        self.assertEqual(
+            sorted(records.hashIndex("owner.vat").keys()), sorted(vat.keys())
+        )
+        self.assertEqual(
+            codes(records.sortedIndex("amount")), codes(SortedIndex(records, "amount"))
+        )
+
+    def test_mutations(self):
+        operations = [
+            lambda r: r.append(record("E", "ES1", "1")),
+            lambda r: r.extend([record("E", "ES5", "2")]),
+            lambda r: r.insert(0, record("E", "ES5", "2")),
+            lambda r: r.pop(),
+            lambda r: r.pop(0),
+            lambda r: r.remove(r[1]),
+            lambda r: r.__setitem__(0, record("E", "ES5", "2")),
+            lambda r: r.__setitem__(slice(0, 2), [record("E", "ES5", "2")]),
+            lambda r: r.__delitem__(0),
+            lambda r: r.__delitem__(slice(1, 3)),
+            lambda r: r.__iadd__([record("E", "ES5", "2")]),
+            lambda r: r.__imul__(2),
+            lambda r: r.clear(),
+        ]
+        for operation in operations:
+            records = sample()
+            records.hashIndex("owner.vat")
+            records.sortedIndex("amount")
+            operation(records)
+            self.assertIndexed(records)
+
+    def test_reindex(self):
+        records = sample()
+        index = records.hashIndex("owner.vat")
+        records[0].owner.vat = "ES9"
+        records.reindex()
+        self.assertEqual(codes(records.hashIndex("owner.vat").find("ES9")), ["A"])
+        self.assertIsNot(records.hashIndex("owner.vat"), index)
+
+    def test_dropIndex(self):
+        records = sample()
+        index = records.hashIndex("owner.vat")
+        records.dropIndex("owner.vat")
+        self.assertIsNot(records.hashIndex("owner.vat"), index)
+
+    def test_sortBy(self):
+        records = sample()
+        records.sortBy("amount")
+        self.assertEqual(codes(records), ["B", "C", "A", "D"])
+        records.sortBy("amount", reverse=True)
+        self.assertEqual(codes(records), ["A", "C", "B", "D"])
+
+    def test_dump(self):
+        data = namespace(items=indexedlist([namespace(a=1)]))
+        self.assertEqual(data.dump(), "items:\n- a: 1\n")
+
+    def test_pickle(self):
+        records = sample()
+        records.hashIndex("code")
+        result = pickle.loads(pickle.dumps(records))
+        self.assertEqual(type(result), indexedlist)
+        self.assertEqual(result, records)
+
+
+class SortedBy_Test(unittest.TestCase):
+
+    def test_singlePath(self):
+        self.assertEqual(codes(sortedBy(sample(), "date")), ["C", "A", "B", "D"])
+
+    def test_manyPaths(self):
+        self.assertEqual(
+            codes(sortedBy(sample(), "owner.vat", "amount")), ["C", "A", "B", "D"]
+        )
+
+    def test_reverse(self):
+        self.assertEqual(
+            codes(sortedBy(sample(), "amount", reverse=True)), ["A", "C", "B", "D"]
+        )
+
+    def test_reverse_missingAtTheEnd(self):
+        records = sample()
+        records[0].amount = None
+        self.assertEqual(
+            codes(sortedBy(records, "amount", reverse=True)), ["C", "B", "A", "D"]
+        )
+
+    def test_scalarOnPath_atTheEnd(self):
+        records = sample()
+        records[2].owner = None
+        self.assertEqual(codes(sortedBy(records, "owner.vat")), ["A", "B", "D", "C"])
+
+    def test_keyExtractedOnce(self):
+        class Counting(namespace):
+            count = 0
+
+            def __getitem__(self, key):
+                type(self).count += 1
+                return super(Counting, self).__getitem__(key)
+
+        records = [Counting(a=i % 5) for i in range(100)]
+        sortedBy(records, "a")
+        self.assertEqual(Counting.count, 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: sw=4 ts=4 noet
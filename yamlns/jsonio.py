@@ -0,0 +1,293 @@
+"""
+JSON input and output for namespaces using the json module,
+much faster than parsing JSON as YAML.
+
+Values get the same types the YAML loader gives:
+objects become namespaces and numbers with decimals, Decimal.
+ISO dates in strings are optionally turned into Date.
+
+>>> from yamlns import ns
+>>> data = ns.loads_json('{"kwh": 1.50, "day": "2024-01-31"}', dates=True)
+>>> data
+namespace({'kwh': Decimal('1.50'), 'day': Date(2024, 1, 31)})
+>>> data.dump_json()
+'{"kwh": 1.50, "day": "2024-01-31"}'
+"""
+
+import binascii
+import datetime
+import decimal
+import json
+import os
+import re
+from collections import OrderedDict
+from .compat import Path, text
+from .decimals import LazyDecimal
+
+try:
+    from collections.abc import Mapping, Sequence
+except ImportError:  # Py2
+    from collections import Mapping, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_text = type(u"")
+
+_isoDate = re.compile(r"\d{4}-\d\d-\d\d$")
+
+
+def _date(value):
+    "Returns value as Date if it is an ISO date string"
+    if type(value) is _text and len(value) == 10 and _isoDate.match(value):
+        from .dateutils import Date
+
+        try:
+            return Date(value)
+        except ValueError:  # Not a valid day
+            pass
+    return value
+
+
+def _dates(value):
+    "Turns ISO dates into Date in value and the lists it contains"
+    if type(value) is not list:
+        return _date(value)
+    stack = [value]
+    while stack:
+        items = stack.pop()
+        for i, item in enumerate(items):
+            if type(item) is list:
+                stack.append(item)
+            else:
+                items[i] = _date(item)
+    return value
+
+
+def _objectHook(cls, dates):
+    def hook(pairs):
+        if dates:
+            pairs = [(key, _dates(value)) for key, value in pairs]
+        for key, value in pairs:
+            if "." in key:
+                break
+        else:
+            return cls(pairs)
+        # Dotted keys expand into nested namespaces, as in YAML
+        result = cls()
+        for key, value in pairs:
+            result[key] = value
+        return result
+
+    return hook
+
+
+def _decoder(cls, dates):
+    if cls is None:
+        from .core import namespace as cls
+
+    return json.JSONDecoder(
+        object_pairs_hook=_objectHook(cls, dates),
+        parse_float=decimal.Decimal,
+        parse_constant=decimal.Decimal,
+    )
+
+
+def loadsJson(content, dates=False, cls=None):
+    """
+    Loads a JSON document from text.
+    Objects become instances of cls, namespace by default,
+    and numbers with decimals or exponent, Decimal.
+    If dates is set, strings with ISO dates become Date.
+    """
+    result = _decoder(cls, dates).decode(text(content))
+    if dates:
+        result = _dates(result)
+    return result
+
+
+def loadJson(source, dates=False, cls=None):
+    """
+    Loads a JSON document from a path or an open file,
+    see loadsJson.
+    """
+    # Already open read file
+    if hasattr(source, "read"):
+        return loadsJson(source.read(), dates=dates, cls=cls)
+
+    with Path(source).open() as f:
+        return loadsJson(f.read(), dates=dates, cls=cls)
+
+
+_whitespace = re.compile(r"[ \t\n\r]*")
+_errorChar = re.compile(r"\(char (\d+)")
+
+
+def _truncated(error, buffer):
+    "Tells whether a decoding error could be due to the buffer ending"
+    message = getattr(error, "msg", None) or format(error)
+    if message.startswith("Unterminated string"):
+        return True
+    position = getattr(error, "pos", None)
+    if position is None:  # Py2 just tells it in the message
+        match = _errorChar.search(message)
+        position = int(match.group(1)) if match else len(buffer)
+    # Room for a cut literal, like -Infinity, or escaped surrogate pair
+    return len(buffer) - position <= 12
+
+
+def iterJson(stream, dates=False, cls=None, chunkSize=1 << 16):
+    """
+    Generates the JSON values in an open text stream,
+    like JSON Lines or concatenated JSON values,
+    reading and parsing it a chunk at a time.
+    Values are loaded as loadsJson does.
+    An invalid value fails as soon as it is read,
+    unless it could still be completed by the next chunk.
+    """
+    decoder = _decoder(cls, dates)
+    read = stream.read
+    buffer = u""
+    position = 0
+    size = chunkSize
+    eof = False
+    while True:
+        position = _whitespace.match(buffer, position).end()
+        end = None
+        if position < len(buffer):
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except ValueError as error:
+                if eof or not _truncated(error, buffer):
+                    raise
+            if end == len(buffer) and not eof:
+                end = None  # A number could go on in the next chunk
+        elif eof:
+            return
+        if end is None:
+            chunk = read(size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            size *= 2  # Big values are not parsed again for every chunk
+            continue
+        size = chunkSize
+        position = end
+        yield _dates(value) if dates else value
+
+
+# Decimal numbers are encoded as marked strings,
+# and unquoted after encoding, to keep their digits.
+# Markers carry a random nonce, fresh for each dump,
+# so that user strings cannot pass as decimals.
+_decimalString = re.compile(r'"\\u0000decimal([0-9a-f]+)\\u0000([^"]*)"')
+
+
+def _decimalText(value):
+    if value.is_nan():
+        return u"NaN"
+    if value.is_infinite():
+        return u"-Infinity" if value < 0 else u"Infinity"
+    return text(value)
+
+
+def dumpsJson(data, indent=None):
+    """
+    Returns data as JSON text.
+    Decimal are written with all their digits,
+    dates and datetimes as strings like the YAML dumper,
+    and numpy arrays as nested lists of their items.
+    Mappings and records are written as objects.
+    """
+    from .records import record
+
+    nonces = []  # Set on the first decimal
+
+    def default(value):
+        if isinstance(value, LazyDecimal):
+            value = value.value
+        if isinstance(value, decimal.Decimal):
+            if not nonces:
+                nonces.append(binascii.hexlify(os.urandom(16)).decode("ascii"))
+            return u"\x00decimal{}\x00{}".format(nonces[0], _decimalText(value))
+        if isinstance(value, datetime.datetime):
+            return value.isoformat(" ")
+        if isinstance(value, datetime.date):
+            return value.isoformat()
+        if np is not None:
+            if isinstance(value, np.ndarray):
+                return value.tolist()
+            if isinstance(value, np.generic):
+                return value.item()
+        if isinstance(value, (Mapping, record)):
+            return OrderedDict(value.items())
+        if isinstance(value, Sequence):
+            return list(value)
+        raise TypeError(
+            "Object of type {} is not JSON serializable".format(type(value).__name__)
+        )
+
+    result = json.dumps(
+        data,
+        default=default,
+        ensure_ascii=False,
+        indent=indent,
+        separators=(",", ": ") if indent is not None else None,
+    )
+    result = text(result)  # Py2 gives bytes if all ascii
+    if nonces:
+        nonce = nonces[0]
+
+        def unquote(match):
+            if match.group(1) != nonce:
+                return match.group(0)
+            return match.group(2)
+
+        result = _decimalString.sub(unquote, result)
+    return result
+
+
+def dumpJson(data, target=None, indent=None):
+    """
+    Dumps data as JSON into the target: a path,
+    an open file, or None to return it as text.
+    See dumpsJson.
+    """
+    from .core import _dumpTo
+
+    content = dumpsJson(data, indent=indent)
+
+    def dumpit(stream):
+        if stream is None:
+            return content
+        stream.write(content)
+
+    return _dumpTo(target, dumpit)
+
+
+def dumpJsonLines(documents, target=None):
+    """
+    Dumps each document of the iterable as it comes,
+    as a line of JSON, into the target: a path,
+    an open file, or None to return it as text.
+    """
+    from .core import _dumpTo
+
+    def dumpit(stream):
+        output = stream
+        if stream is None:
+            import io
+
+            output = io.StringIO()
+        for document in documents:
+            output.write(dumpsJson(document))
+            output.write(u"\n")
+        if stream is None:
+            return output.getvalue()
+
+    return _dumpTo(target, dumpit)
+
+
+# vim: sw=4 ts=4 noet
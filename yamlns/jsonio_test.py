@@ -0,0 +1,340 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+import datetime
+import io
+import json
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+from .core import namespace
+from .dateutils import Date
+from .frozen import frozennamespace
+from .columnar import columnarlist
+from .records import recordClass
+from .jsonio import loadsJson, dumpsJson, iterJson, dumpJsonLines
+from .cli.json2yaml import loads as cliLoads
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+jsonContent = u"""\
+{
+  "name": "caña",
+  "kwh": 1.50,
+  "count": 3,
+  "active": true,
+  "missing": null,
+  "day": "2024-01-31",
+  "readings": [{"kwh": 1.5e+2}, {"kwh": 2}],
+  "nested": {"list": [[1, 2], []]}
+}
+"""
+
+
+class LoadJson_Test(unittest.TestCase):
+
+    def test_sameAsYaml(self):
+        # Dumps keep order and decimal digits, unlike equality
+        self.assertEqual(
+            namespace.loads_json(jsonContent).dump(),
+            namespace.loads(jsonContent).dump(),
+        )
+        self.assertEqual(
+            namespace.loads_json(jsonContent),
+            namespace.loads(jsonContent),
+        )
+
+    def test_types(self):
+        data = namespace.loads_json(jsonContent)
+        self.assertIs(type(data), namespace)
+        self.assertIs(type(data.readings[0]), namespace)
+        self.assertEqual(data.kwh, Decimal("1.50"))
+        self.assertEqual(str(data.kwh), "1.50")
+        self.assertIs(type(data.count), int)
+        self.assertEqual(data.day, "2024-01-31")
+
+    def test_exponentWithoutSign_isNumber(self):
+        # YAML 1.1 takes it as a string
+        self.assertEqual(namespace.loads_json(u"[1.5e2]"), [Decimal("150")])
+
+    def test_order(self):
+        data = namespace.loads_json(u'{"b": 1, "a": 2}')
+        self.assertEqual(list(data), ["b", "a"])
+
+    def test_dottedKeys_expand(self):
+        self.assertEqual(
+            namespace.loads_json(u'{"a.b": 1, "c": 2}'),
+            namespace.loads(u'{"a.b": 1, "c": 2}'),
+        )
+
+    def test_constants(self):
+        data = namespace.loads_json(u"[NaN, Infinity, -Infinity]")
+        self.assertTrue(data[0].is_nan())
+        self.assertEqual(data[1:], [Decimal("Infinity"), Decimal("-Infinity")])
+
+    def test_dates(self):
+        data = namespace.loads_json(
+            u'{"day": "2024-01-31", "days": [["2024-02-01"], "no"],'
+            u' "bad": "2024-13-01", "other": "2024-01-31 10:00"}',
+            dates=True,
+        )
+        self.assertEqual(data.day, Date(2024, 1, 31))
+        self.assertIs(type(data.day), Date)
+        self.assertEqual(data.days, [[Date(2024, 2, 1)], "no"])
+        self.assertEqual(data.bad, "2024-13-01")
+        self.assertEqual(data.other, "2024-01-31 10:00")
+
+    def test_dates_root(self):
+        self.assertEqual(
+            loadsJson(u'["2024-01-31", {"a": ["2024-02-01"]}]', dates=True),
+            [Date(2024, 1, 31), namespace(a=[Date(2024, 2, 1)])],
+        )
+        self.assertEqual(loadsJson(u'"2024-01-31"', dates=True), Date(2024, 1, 31))
+
+    def test_subclass(self):
+        data = frozennamespace.loads_json(u'{"a": {"b": 1}}')
+        self.assertIsInstance(data, frozennamespace)
+        self.assertIsInstance(data.a, frozennamespace)
+
+    def test_bytes(self):
+        self.assertEqual(
+            namespace.loads_json(u'{"a": "caña"}'.encode("utf8")),
+            namespace(a=u"caña"),
+        )
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            namespace.loads_json(u"{a: 1}")
+
+    def test_file(self):
+        handle, filename = tempfile.mkstemp(suffix=".json")
+        os.close(handle)
+        try:
+            with io.open(filename, "w", encoding="utf8") as f:
+                f.write(jsonContent)
+            self.assertEqual(
+                namespace.load_json(filename), namespace.loads_json(jsonContent)
+            )
+            with io.open(filename, encoding="utf8") as f:
+                self.assertEqual(
+                    namespace.load_json(f), namespace.loads_json(jsonContent)
+                )
+        finally:
+            os.unlink(filename)
+
+
+class DumpJson_Test(unittest.TestCase):
+
+    def test_roundtrip(self):
+        data = namespace.loads_json(jsonContent, dates=True)
+        self.assertEqual(
+            namespace.loads_json(data.dump_json(), dates=True),
+            data,
+        )
+
+    def test_decimal_keepsDigits(self):
+        self.assertEqual(
+            dumpsJson(
+                [
+                    Decimal("1.50"),
+                    Decimal("12345678901234567890.123456789"),
+                    Decimal("1E+3"),
+                    Decimal("-0"),
+                ]
+            ),
+            u"[1.50, 12345678901234567890.123456789, 1E+3, -0]",
+        )
+
+    def test_decimal_nonFinite(self):
+        self.assertEqual(
+            dumpsJson([Decimal("NaN"), Decimal("Infinity"), Decimal("-Infinity")]),
+            u"[NaN, Infinity, -Infinity]",
+        )
+
+    def test_decimal_markerLikeStrings_kept(self):
+        data = namespace(
+            [
+                ("a", Decimal("1.5")),
+                ("s", u"\x00decimal\x00oops"),
+                ("t", u'\x00decimal0123456789abcdef\x00\\x"'),
+            ]
+        )
+        self.assertEqual(json.loads(dumpsJson(data)), dict(data, a=1.5))
+        self.assertEqual(
+            dumpsJson(data),
+            u'{"a": 1.5, "s": "\\u0000decimal\\u0000oops", '
+            u'"t": "\\u0000decimal0123456789abcdef\\u0000\\\\x\\""}',
+        )
+
+    def test_decimal_key(self):
+        self.assertEqual(dumpsJson({"a": "b"}), u'{"a": "b"}')
+
+    def test_dates(self):
+        self.assertEqual(
+            dumpsJson(
+                namespace(
+                    [
+                        ("a", Date(2024, 1, 31)),
+                        ("b", datetime.date(2024, 2, 1)),
+                        ("c", datetime.datetime(2024, 2, 1, 10, 30)),
+                    ]
+                )
+            ),
+            u'{"a": "2024-01-31", "b": "2024-02-01", "c": "2024-02-01 10:30:00"}',
+        )
+
+    def test_unicode(self):
+        self.assertEqual(namespace(a=u"caña").dump_json(), u'{"a": "caña"}')
+
+    def test_indent(self):
+        self.assertEqual(
+            namespace(a=[1]).dump_json(indent=2), u'{\n  "a": [\n    1\n  ]\n}'
+        )
+
+    def test_containerTypes(self):
+        data = namespace(
+            frozen=frozennamespace(a=(1, 2)),
+            columnar=columnarlist([namespace(a=1), namespace(a=2)]),
+        )
+        self.assertEqual(
+            json.loads(dumpsJson(data)),
+            dict(frozen=dict(a=[1, 2]), columnar=[dict(a=1), dict(a=2)]),
+        )
+
+    def test_records(self):
+        Reading = recordClass(namespace([("kwh", 0), ("day", "")]), "Reading")
+        data = namespace(readings=[Reading(day=u"2024-01-31", kwh=Decimal("1.50"))])
+        self.assertEqual(
+            dumpsJson(data), u'{"readings": [{"kwh": 1.50, "day": "2024-01-31"}]}'
+        )
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_numpy(self):
+        data = namespace(
+            a=numpy.array([1, 2.5]),
+            b=numpy.int64(3),
+            c=numpy.array([[1, 2]]),
+        )
+        self.assertEqual(dumpsJson(data), u'{"a": [1.0, 2.5], "b": 3, "c": [[1, 2]]}')
+
+    def test_unsupported_fails(self):
+        with self.assertRaises(TypeError) as ctx:
+            dumpsJson(namespace(a=object()))
+        self.assertEqual(
+            format(ctx.exception), "Object of type object is not JSON serializable"
+        )
+
+    def test_file(self):
+        handle, filename = tempfile.mkstemp(suffix=".json")
+        os.close(handle)
+        try:
+            namespace(a=Decimal("1.50")).dump_json(filename)
+            with io.open(filename, encoding="utf8") as f:
+                self.assertEqual(f.read(), u'{"a": 1.50}')
+            output = io.StringIO()
+            namespace(a=1).dump_json(output)
+            self.assertEqual(output.getvalue(), u'{"a": 1}')
+        finally:
+            os.unlink(filename)
+
+
+class IterJson_Test(unittest.TestCase):
+
+    def values(self, content, **kwds):
+        return list(iterJson(io.StringIO(content), **kwds))
+
+    def test_lines(self):
+        self.assertEqual(
+            self.values(u'{"a": 1.50}\n{"b": [1, 2]}\n'),
+            [namespace(a=Decimal("1.50")), namespace(b=[1, 2])],
+        )
+
+    def test_concatenated(self):
+        self.assertEqual(
+            self.values(u'{"a": 1}{"a": 2} [3] "x"\t12 null'),
+            [namespace(a=1), namespace(a=2), [3], "x", 12, None],
+        )
+
+    def test_empty(self):
+        self.assertEqual(self.values(u""), [])
+        self.assertEqual(self.values(u" \n\n"), [])
+
+    def test_smallChunks(self):
+        content = u'{"name": "caña", "values": [1.5, 2]}\n12345 678\n'
+        for chunkSize in range(1, 8):
+            self.assertEqual(
+                self.values(content, chunkSize=chunkSize),
+                [
+                    namespace([("name", u"caña"), ("values", [Decimal("1.5"), 2])]),
+                    12345,
+                    678,
+                ],
+            )
+
+    def test_incremental(self):
+        values = iterJson(io.StringIO(u'{"a": 1}\n{"a": \n'), chunkSize=4)
+        self.assertEqual(next(values), namespace(a=1))
+        with self.assertRaises(ValueError):
+            next(values)
+
+    def test_invalid_failsBeforeReadingAll(self):
+        stream = io.StringIO(u'{"a": 1}\n{a: 2}\n' + u'{"a": 3}\n' * 1000)
+        values = iterJson(stream, chunkSize=16)
+        self.assertEqual(next(values), namespace(a=1))
+        with self.assertRaises(ValueError):
+            next(values)
+        self.assertLess(stream.tell(), 100)
+
+    def test_cutLiterals_completed(self):
+        content = u'[true, false, null, -Infinity, "\\ud83d\\ude00"]'
+        for chunkSize in range(1, 12):
+            self.assertEqual(
+                self.values(content, chunkSize=chunkSize), [loadsJson(content)]
+            )
+
+    def test_dates(self):
+        self.assertEqual(
+            self.values(u'"2024-01-31" {"a": "2024-02-01"}', dates=True),
+            [Date(2024, 1, 31), namespace(a=Date(2024, 2, 1))],
+        )
+
+
+class DumpJsonLines_Test(unittest.TestCase):
+
+    def test_text(self):
+        self.assertEqual(
+            dumpJsonLines(iter([namespace(a=Decimal("1.50")), [1], "x"])),
+            u'{"a": 1.50}\n[1]\n"x"\n',
+        )
+
+    def test_stream(self):
+        output = io.StringIO()
+        dumpJsonLines(namespace.load_all(io.StringIO(u"a: 1\n---\nb: 2\n")), output)
+        self.assertEqual(output.getvalue(), u'{"a": 1}\n{"b": 2}\n')
+
+    def test_roundtrip(self):
+        content = u'{"a": 1.50, "b": "caña"}\n[1, 2]\n'
+        self.assertEqual(dumpJsonLines(iterJson(io.StringIO(content))), content)
+
+
+class Json2YamlLoads_Test(unittest.TestCase):
+
+    def test_json(self):
+        self.assertEqual(cliLoads(jsonContent), namespace.loads(jsonContent))
+
+    def test_yaml(self):
+        self.assertEqual(cliLoads(u"a: 1\n"), namespace(a=1))
+
+    def test_yamlFlow(self):
+        self.assertEqual(cliLoads(u" {a: 1}\n"), namespace(a=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: sw=4 ts=4 noet
@@ -0,0 +1,286 @@
+"""
+Lazy loading of big YAML documents.
+
+Loading scans the document just to index the top level keys
+and the source text of their values.
+Values are parsed into namespaces on first access.
+"""
+
+import threading
+import yaml
+from yaml.events import (
+    ScalarEvent,
+    MappingStartEvent,
+    MappingEndEvent,
+    SequenceStartEvent,
+    SequenceEndEvent,
+)
+from .core import namespace, _base, _dictgetitem, _dumpTo, _checkDumpOptions
+from .conversion import converters, convertMapping
+from .compat import Path, text
+
+try:
+    from collections.abc import ItemsView, ValuesView
+except ImportError:  # Py2
+    from collections import ItemsView, ValuesView
+
+
+class _Unparsed(object):
+    "Placeholder for values still to be parsed"
+
+    def __repr__(self):
+        return "<unparsed>"
+
+
+_unparsed = _Unparsed()
+_starts = (MappingStartEvent, SequenceStartEvent)
+_ends = (MappingEndEvent, SequenceEndEvent)
+
+
+class _NotIndexable(Exception):
+    "The document cannot be loaded lazily"
+
+
+class lazynamespace(namespace):
+    """
+    A namespace whose top level values are parsed from their
+    YAML source text the first time they are accessed
+    as attribute, as item, or while iterating values or items.
+
+    Dumping it emits the original text of the values not yet accessed.
+    """
+
+    def __init__(self, *args, **kwds):
+        super(lazynamespace, self).__init__(*args, **kwds)
+        self._source = None
+        self._spans = {}
+        self._options = {}
+        self._lock = threading.Lock()
+
+    def _materialize(self, key):
+        with self._lock:
+            span = self._spans.get(key)
+            if span is None:  # Parsed meanwhile
+                return _dictgetitem(self, key)
+            start, end = span
+            parsed = namespace.loads(self._source[start:end], **self._options)
+            value = next(iter(dict.values(parsed)))
+            self._setitem(key, value)
+            del self._spans[key]
+            if not self._spans:
+                self._source = None
+            return value
+
+    def _materializeAll(self):
+        for key in list(self._spans):
+            self[key]
+
+    def _storedItems(self):
+        "Items as stored, with placeholders, in order also in Py2"
+        for key in _base.__iter__(self):
+            yield key, _dictgetitem(self, key)
+
+    @property
+    def unparsed(self):
+        "Keys whose values have not been parsed yet"
+        return [key for key, value in self._storedItems() if value is _unparsed]
+
+    def __getitem__(self, name):
+        try:
+            value = _dictgetitem(self, name)
+        except KeyError:
+            return super(lazynamespace, self).__getitem__(name)
+        if value is _unparsed:
+            return self._materialize(name)
+        return value
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __iter__(self):
+        # Overriden so that dict(self) does not copy placeholders
+        return _base.__iter__(self)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def items(self):
+        return ItemsView(self)
+
+    def values(self):
+        return ValuesView(self)
+
+    def pop(self, key, *default):
+        if key in self._spans:
+            self[key]
+        return super(lazynamespace, self).pop(key, *default)
+
+    def popitem(self):
+        self._materializeAll()
+        return super(lazynamespace, self).popitem()
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def copy(self):
+        return namespace(self.items())
+
+    def __eq__(self, other):
+        self._materializeAll()
+        if isinstance(other, lazynamespace):
+            other._materializeAll()
+        return super(lazynamespace, self).__eq__(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        self._materializeAll()
+        return super(lazynamespace, self).__repr__()
+
+    def __reduce__(self):
+        return namespace, (list(self.items()),)
+
+    def dump(self, target=None, engine="nodes", arrays="plain"):
+        if not self.unparsed:
+            return super(lazynamespace, self).dump(target, engine=engine, arrays=arrays)
+        _checkDumpOptions(engine, arrays)
+
+        def dumpit(stream):
+            from .serialization import streamEncoding
+
+            content = u"".join(self._dumpEntries(engine, arrays))
+            encoding = streamEncoding(stream)
+            if encoding:  # Py2, like namespace.dump
+                content = content.encode(encoding)
+            if stream is None:
+                return content
+            stream.write(content)
+
+        return _dumpTo(target, dumpit)
+
+    def _dumpEntries(self, engine, arrays):
+        for key, value in self._storedItems():
+            if value is not _unparsed:
+                entry = namespace([(key, value)]).dump(engine=engine, arrays=arrays)
+                entry = text(entry)  # Py2 dumps utf-8 bytes
+                if entry.endswith("\n...\n"):
+                    entry = entry[: -len("...\n")]
+                yield entry
+                continue
+            start, end = self._spans[key]
+            entry = self._source[start:end]
+            yield entry if entry.endswith("\n") else entry + "\n"
+
+
+converters[lazynamespace] = convertMapping
+
+
+def _skipNode(loader):
+    "Consumes the events of a node, checking it has no anchors or aliases"
+    event = loader.get_event()
+    if type(event) not in _starts and type(event) is not ScalarEvent:
+        raise _NotIndexable("alias")
+    if event.anchor:
+        raise _NotIndexable("anchor")
+    depth = 1 if type(event) in _starts else 0
+    while depth:
+        event = loader.get_event()
+        eventType = type(event)
+        if eventType in _ends:
+            depth -= 1
+            continue
+        if eventType is not ScalarEvent and eventType not in _starts:
+            raise _NotIndexable("alias")
+        if event.anchor:
+            raise _NotIndexable("anchor")
+        if eventType is not ScalarEvent:
+            depth += 1
+
+
+def _constructKey(loader, event):
+    if type(event) is not ScalarEvent or event.anchor:
+        raise _NotIndexable("complex key")
+    tag = event.tag
+    if tag is None or tag == "!":
+        tag = loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+    node = yaml.ScalarNode(
+        tag, event.value, event.start_mark, event.end_mark, style=event.style
+    )
+    key = loader.construct_object(node)
+    if hasattr(key, "split") and "." in key:
+        raise _NotIndexable("dotted key")
+    return key
+
+
+def _index(content):
+    "Returns a lazynamespace for the content or raises _NotIndexable"
+    from .serialization import NamespaceYAMLLoader
+
+    loader = NamespaceYAMLLoader(content)
+    try:
+        loader.get_event()  # StreamStart
+        if not loader.check_event(yaml.DocumentStartEvent):
+            raise _NotIndexable("empty")
+        # First entry starts after the document start, including comments
+        start = loader.get_event().end_mark.index
+        if content[start : start + 1] == "\n":
+            start += 1
+        event = loader.get_event()
+        if type(event) is not MappingStartEvent:
+            raise _NotIndexable("not a mapping")
+        if event.anchor or event.tag or event.flow_style:
+            raise _NotIndexable("not a plain block mapping")
+        result = lazynamespace()
+        result._source = content
+        while not loader.check_event(MappingEndEvent):
+            event = loader.get_event()
+            if event.start_mark.column:
+                raise _NotIndexable("indented mapping")
+            key = _constructKey(loader, event)
+            _skipNode(loader)
+            end = loader.peek_event().start_mark.index
+            result._setitem(key, _unparsed)
+            result._spans[key] = (start, end)
+            start = end
+        loader.get_event()  # MappingEnd
+        loader.get_event()  # DocumentEnd
+        if not loader.check_event(yaml.StreamEndEvent):
+            raise _NotIndexable("many documents")
+    finally:
+        loader.dispose()
+    if not result._spans:
+        result._source = None
+    return result
+
+
+def loadLazy(source, **options):
+    """
+    Loads a YAML document from a path or an open file.
+    If it is a block mapping, returns a lazynamespace,
+    otherwise it is fully loaded as namespace.load does.
+    Options are passed to namespace.loads to parse the values.
+    """
+    if hasattr(source, "read"):
+        content = text(source.read())
+    else:
+        with Path(source).open() as f:
+            content = text(f.read())
+    try:
+        result = _index(content)
+    except _NotIndexable:
+        return namespace.loads(content, **options)
+    result._options = options
+    return result
+
+
+# vim: sw=4 ts=4 noet
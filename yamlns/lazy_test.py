@@ -0,0 +1,208 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+import io
+import pickle
+import unittest
+from .core import namespace
+from .compat import py2, text
+from .dateutils import Date
+from .lazy import lazynamespace, loadLazy
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+yamlcontent = u"""\
+name: caña
+client:
+  address:
+    city: Girona
+  phones: [1, 2]
+2020-01-01: date key
+items:
+- price: 1.5
+- price: 2
+last: value # comment
+"""
+
+
+class LazyNamespace_Test(unittest.TestCase):
+
+    def setUp(self):
+        self.data = namespace.loads(yamlcontent, lazy=True)
+
+    def tearDown(self):
+        import os
+
+        try:
+            os.unlink("test.yaml")
+        except:
+            pass
+
+    def test_load_lazy(self):
+        self.assertEqual(type(self.data), lazynamespace)
+        self.assertEqual(
+            list(self.data.keys()),
+            ["name", "client", Date("2020-01-01"), "items", "last"],
+        )
+        self.assertEqual(self.data.unparsed, list(self.data.keys()))
+
+    def test_getattr_parsesOnlyThatKey(self):
+        self.assertEqual(self.data.client.address.city, "Girona")
+        self.assertEqual(type(self.data.client), namespace)
+        self.assertNotIn("client", self.data.unparsed)
+        self.assertIn("items", self.data.unparsed)
+
+    def test_getitem(self):
+        self.assertEqual(self.data["items"][0].price, 1.5)
+
+    def test_getitem_multilevel(self):
+        self.assertEqual(self.data["client.address.city"], "Girona")
+
+    def test_getitem_missing(self):
+        with self.assertRaises(KeyError):
+            self.data["missing"]
+
+    def test_getattr_missing(self):
+        with self.assertRaises(AttributeError):
+            self.data.missing
+
+    def test_get(self):
+        self.assertEqual(self.data.get("name"), u"caña")
+        self.assertEqual(self.data.get("missing", 3), 3)
+
+    def test_items(self):
+        self.assertEqual(dict(self.data.items())["last"], "value")
+        self.assertEqual(self.data.unparsed, [])
+
+    def test_values(self):
+        self.assertIn("date key", list(self.data.values()))
+
+    @unittest.skipIf(py2, "Py2 dict() copies dict subclasses ignoring __iter__")
+    def test_dictConversion(self):
+        self.assertEqual(dict(self.data)["name"], u"caña")
+
+    def test_equality(self):
+        self.assertEqual(self.data, namespace.loads(yamlcontent))
+        self.assertEqual(namespace.loads(yamlcontent), self.data)
+
+    def test_setattr_overridesUnparsed(self):
+        self.data.client = "none"
+        self.assertEqual(self.data.client, "none")
+        self.assertNotIn("client", self.data.unparsed)
+
+    def test_pop(self):
+        self.assertEqual(self.data.pop("name"), u"caña")
+        self.assertNotIn("name", self.data)
+
+    def test_copy(self):
+        result = self.data.copy()
+        self.assertEqual(type(result), namespace)
+        self.assertEqual(result, namespace.loads(yamlcontent))
+
+    def test_deepcopy(self):
+        self.assertEqual(self.data.deepcopy(), namespace.loads(yamlcontent))
+
+    def test_deep(self):
+        result = namespace.deep(self.data)
+        self.assertEqual(type(result), namespace)
+        self.assertEqual(result, namespace.loads(yamlcontent))
+
+    def test_pickle(self):
+        result = pickle.loads(pickle.dumps(self.data))
+        self.assertEqual(result, namespace.loads(yamlcontent))
+
+    def test_dump_untouched_keepsSource(self):
+        self.assertEqual(text(self.data.dump()), yamlcontent)
+
+    def test_dump_touched(self):
+        self.data.client.address.city = "Lleida"
+        self.assertEqual(
+            text(self.data.dump()),
+            yamlcontent.replace("Girona", "Lleida").replace(
+                "phones: [1, 2]", "phones:\n  - 1\n  - 2"
+            ),
+        )
+
+    def test_dump_allParsed(self):
+        self.data.client
+        self.data._materializeAll()
+        self.assertEqual(self.data.dump(), namespace.loads(yamlcontent).dump())
+
+    def test_dump_insideOtherNamespace(self):
+        self.assertEqual(
+            namespace(doc=self.data).dump(),
+            namespace(doc=namespace.loads(yamlcontent)).dump(),
+        )
+
+    def test_dump_options(self):
+        self.data.client.address.city = "Lleida"
+        for engine in "nodes", "events":
+            self.assertEqual(
+                self.data.dump(engine=engine, arrays="tagged"), self.data.dump()
+            )
+        output = io.StringIO()
+        self.data.dump(output, engine="events")
+        self.assertEqual(output.getvalue(), text(self.data.dump()))
+        self.data._materializeAll()
+        self.assertEqual(
+            self.data.dump(engine="events", arrays="base64"),
+            namespace.loads(self.data.dump()).dump(),
+        )
+
+    def test_dump_unknownOptions_fail(self):
+        with self.assertRaises(ValueError):
+            self.data.dump(engine="bad")
+        with self.assertRaises(ValueError):
+            self.data.dump(arrays="bad")
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_dump_arrays(self):
+        self.data.curve = numpy.array([1, 2], dtype="int8")
+        for engine in "nodes", "events":
+            dumped = self.data.dump(engine=engine, arrays="tagged")
+            self.assertTrue(dumped.startswith(yamlcontent))
+            self.assertEqual(namespace.loads(dumped).curve.dtype, numpy.int8)
+
+    def test_dump_toFile(self):
+        self.data.dump("test.yaml")
+        with io.open("test.yaml", encoding="utf8") as f:
+            self.assertEqual(f.read(), yamlcontent)
+
+    def test_load_fromFile(self):
+        with io.open("test.yaml", "w", encoding="utf8") as f:
+            f.write(yamlcontent)
+        data = namespace.load("test.yaml", lazy=True)
+        self.assertEqual(type(data), lazynamespace)
+        self.assertEqual(data.client.address.city, "Girona")
+
+    def test_load_explicitDocument(self):
+        data = namespace.loads("---\na: 1\n...\n", lazy=True)
+        self.assertEqual(type(data), lazynamespace)
+        self.assertEqual(data.a, 1)
+        self.assertEqual(data.dump(), "a: 1\n")
+
+    def assertEagerFallback(self, content):
+        data = namespace.loads(content, lazy=True)
+        self.assertNotEqual(type(data), lazynamespace)
+        self.assertEqual(data, namespace.loads(content))
+
+    def test_fallback_empty(self):
+        self.assertEqual(namespace.loads("", lazy=True), None)
+
+    def test_fallback_list(self):
+        self.assertEagerFallback("- a\n- b\n")
+
+    def test_fallback_flowMapping(self):
+        self.assertEagerFallback("{a: 1, b: 2}\n")
+
+    def test_fallback_aliases(self):
+        self.assertEagerFallback("a: &anchor [1]\nb: *anchor\n")
+
+    def test_fallback_dottedKeys(self):
+        self.assertEagerFallback("a.b: 1\n")
+
+
+# vim: sw=4 ts=4 noet
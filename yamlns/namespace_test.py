@@ -1,7 +1,7 @@
 #!/usr/bin/python3
 # -*- coding: utf-8 -*-
 
-from .core import namespace
+from .core import namespace, orderednamespace
 from .compat import Path, py2
 from .dateutils import Date
 import decimal
@@ -11,6 +11,11 @@ import unittest
 import io
 import sys
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class Namespace_Test(unittest.TestCase):
 
@@ -441,6 +446,129 @@ class Namespace_Test(unittest.TestCase):
             data.dump(f)
         self.assertContent(u"otra: caña\n")
 
+    @unittest.skipIf(py2, "Py2 dumps to text with yaml.dump, as bytes")
+    def test_dump_consecutive_bufferReused(self):
+        from .serialization import dumpContext
+
+        self.assertEqual(namespace(a=u"first").dump(), u"a: first\n")
+        self.assertEqual(namespace(b=1).dump(), u"b: 1\n")
+        self.assertIsNotNone(dumpContext.buffer)
+
+    def test_dump_reentrant(self):
+        class Inner(object):
+            pass
+
+        from .serialization import NamespaceYamlDumper
+
+        def represent(dumper, data):
+            return dumper.represent_str(namespace(inner=1).dump())
+
+        NamespaceYamlDumper.add_representer(Inner, represent)
+        try:
+            self.assertEqual(
+                namespace(a=Inner(), b=2).dump(),
+                u"a: |\n  inner: 1\nb: 2\n",
+            )
+        finally:
+            del NamespaceYamlDumper.yaml_representers[Inner]
+
+    def test_dump_bigBuffer_released(self):
+        from .serialization import dumpContext
+
+        namespace(a=u"x" * (dumpContext.maxBuffer + 1)).dump()
+        self.assertIsNone(dumpContext.buffer)
+
+    def test_dump_threads(self):
+        import threading
+
+        results = {}
+
+        def dump(i):
+            results[i] = namespace(value=i).dump()
+
+        threads = [threading.Thread(target=dump, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, dict((i, u"value: {}\n".format(i)) for i in range(8)))
+
+    # Numpy arrays
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_dump_array_flow(self):
+        data = namespace(a=numpy.array([1.5, 2.0, 1e20]))
+        self.assertEqual(data.dump(), "a: [1.5, 2.0, 1.0e+20]\n")
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_dump_array_nDimensional(self):
+        data = namespace(a=numpy.arange(6).reshape(2, 3))
+        self.assertEqual(data.dump(), "a: [[0, 1, 2], [3, 4, 5]]\n")
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_dump_array_keepsItemTypes(self):
+        data = namespace(
+            bools=numpy.array([True, False]),
+            floats=numpy.array([0.1, numpy.nan, -numpy.inf], dtype="float32"),
+        )
+        self.assertEqual(
+            data.dump(),
+            "bools: [true, false]\nfloats: [0.1, .nan, -.inf]\n",
+        )
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_dump_array_notNumeric(self):
+        data = namespace(a=numpy.array(["x", "y"]))
+        self.assertEqual(data.dump(), "a:\n- x\n- y\n")
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_dump_array_tagged(self):
+        data = namespace(a=numpy.zeros((2, 0), dtype="int16"))
+        self.assertEqual(
+            data.dump(arrays="tagged"),
+            "a: !ndarray\n  dtype: int16\n  shape: [2, 0]\n  data: [[], []]\n",
+        )
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_dump_array_base64(self):
+        data = namespace(a=numpy.array([1, 2], dtype="<i2"))
+        self.assertEqual(
+            data.dump(arrays="base64"),
+            "a: !ndarray\n  dtype: <i2\n  shape: [2]\n  data: !!binary |\n    AQACAA==\n",
+        )
+
+    def test_dump_unknownArraysStyle_fails(self):
+        with self.assertRaises(ValueError) as ctx:
+            namespace(a=1).dump(arrays="bad")
+        self.assertEqual(str(ctx.exception), "Unknown arrays style 'bad'")
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_load_array_roundtrip(self):
+        shared = numpy.arange(6, dtype=">f4").reshape(3, 2)
+        data = namespace(
+            shared=shared,
+            again=shared,
+            counts=numpy.array([[1, 2]], dtype="uint64"),
+            flags=numpy.array([True, False]),
+            scalar=numpy.array(2.5),
+            empty=numpy.zeros((0, 3)),
+        )
+        for arrays in "tagged", "base64":
+            for engine in "nodes", "events":
+                result = namespace.loads(data.dump(arrays=arrays), engine=engine)
+                self.assertEqual(list(result), list(data))
+                for key, value in data.items():
+                    self.assertEqual(result[key].dtype, value.dtype)
+                    self.assertEqual(result[key].shape, value.shape)
+                    self.assertEqual(result[key].tolist(), value.tolist())
+                    self.assertTrue(result[key].flags.writeable)
+                self.assertIs(result.again, result.shared)
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_load_array_plain_isList(self):
+        result = namespace.loads(namespace(a=numpy.array([[1, 2]])).dump())
+        self.assertEqual(result, namespace(a=[[1, 2]]))
+
     def test_deep_int(self):
         self.assertEqual(namespace.deep(2), 2)
 
@@ -586,11 +714,108 @@ class Namespace_Test(unittest.TestCase):
         data["a.b"] = 4
         self.assertEqual(data, namespace(a=namespace(b=4)))
 
+    def test_init_dottedKeys_nested(self):
+        # Py2 namespaces are OrderedDicts, and kwds have no order
+        expected = dict(a=namespace(b=1), c=2)
+        self.assertEqual(dict(namespace({"a.b": 1, "c": 2})), expected)
+        self.assertEqual(dict(namespace([("a.b", 1), ("c", 2)])), expected)
+        self.assertEqual(dict(namespace(**{"a.b": 1, "c": 2})), expected)
+
+    def test_update_dottedKeys_nested(self):
+        data = namespace(a=namespace(x=0))
+        data.update({"a.b": 1}, **{"c.d": 2})
+        self.assertEqual(dict(data.a), dict(x=0, b=1))
+        self.assertEqual(dict(data), dict(a=data.a, c=namespace(d=2)))
+
+    def test_update_pairs_dottedKeys_nested(self):
+        data = namespace()
+        data.update(iter([("a.b", 1)]))
+        self.assertEqual(data, namespace(a=namespace(b=1)))
+
+    def test_update_tooManyArguments(self):
+        with self.assertRaises(TypeError):
+            namespace().update({}, {})
+
+    def test_setdefault_dottedKey_missing(self):
+        data = namespace()
+        self.assertEqual(data.setdefault("a.b", 1), 1)
+        self.assertEqual(data, namespace(a=namespace(b=1)))
+
+    def test_setdefault_dottedKey_existing(self):
+        data = namespace(a=namespace(b=1))
+        self.assertEqual(data.setdefault("a.b", 2), 1)
+        self.assertEqual(data, namespace(a=namespace(b=1)))
+
+    def test_deep_dottedKeys_nested(self):
+        self.assertEqual(namespace.deep({"a.b": 1}), namespace(a=namespace(b=1)))
+
+    def test_ordered_init_dottedKeys_nested(self):
+        data = orderednamespace({"a.b": 1})
+        self.assertEqual(data.a.b, 1)
+        self.assertEqual(list(data.keys()), ["a"])
+
     def test_non_string_key(self):
         data = namespace()
         data[3, "key"] = "value"
         self.assertEqual(data[3, "key"], "value")
         namespace.loads("['key', 3]: value")
 
+    def test_getitem_literalDottedKey(self):
+        data = namespace()
+        data._setitem("a.b", 4)
+        self.assertEqual(data["a.b"], 4)
+
+    def test_getattr_multilevel(self):
+        data = namespace(a=namespace(b=4))
+        self.assertEqual(getattr(data, "a.b"), 4)
+
+    def test_getattr_multilevel_missing(self):
+        data = namespace(a=namespace(b=4))
+        with self.assertRaises(AttributeError) as ctx:
+            getattr(data, "a.c")
+        self.assertEqual(format(ctx.exception), "a.c")
+
+    @unittest.skipIf(py2, "Py2 namespaces are OrderedDicts")
+    def test_equality_ignoresOrder(self):
+        self.assertEqual(
+            namespace([("a", 1), ("b", 2)]),
+            namespace([("b", 2), ("a", 1)]),
+        )
+
+    def test_copy_keepsType(self):
+        data = namespace(a=1)
+        result = data.copy()
+        self.assertEqual(type(result), namespace)
+        self.assertEqual(result, data)
+        self.assertIsNot(result, data)
+
+    @unittest.skipIf(py2, "Py2 namespaces are OrderedDicts")
+    def test_repr(self):
+        self.assertEqual(repr(namespace()), "namespace()")
+        self.assertIn("'a': 1", repr(namespace(a=1)))
+
+    def test_ordered_equality_orderSensitive(self):
+        self.assertNotEqual(
+            orderednamespace([("a", 1), ("b", 2)]),
+            orderednamespace([("b", 2), ("a", 1)]),
+        )
+
+    @unittest.skipIf(py2, "Py2 OrderedDict has no move_to_end")
+    def test_ordered_moveToEnd(self):
+        data = orderednamespace(a=1)
+        data.b = 2
+        data.move_to_end("a")
+        self.assertEqual(list(data.keys()), ["b", "a"])
+        self.assertEqual(data.dump(), "b: 2\n" "a: 1\n")
+
+    def test_ordered_multilevel(self):
+        data = orderednamespace()
+        data["a.b"] = 4
+        self.assertEqual(data.a.b, 4)
+        self.assertEqual(data.dump(), "a:\n" "  b: 4\n")
+
+    def test_ordered_copy_keepsType(self):
+        self.assertEqual(type(orderednamespace(a=1).copy()), orderednamespace)
+
 
 # vim: sw=4 ts=4 noet
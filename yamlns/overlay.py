@@ -0,0 +1,232 @@
+"""
+Read through views of layered namespaces.
+
+An overlay resolves each key from the top layer down,
+without copying the layers:
+
+>>> from yamlns import ns
+>>> defaults = ns(db=ns(host='localhost', port=5432), debug=False)
+>>> site = ns(db=ns(host='db.example.com'))
+>>> config = ns.overlay(defaults, site)
+>>> config.db.host, config.db.port, config.debug
+('db.example.com', 5432, False)
+"""
+
+from .core import namespace
+from .copying import deepcopy
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # Py2
+    from collections import Mapping
+
+mergePolicies = ("replace", "append", "merge")
+
+
+class _Missing(object):
+    "Marks a value not in the cache"
+
+
+_missing = _Missing()
+
+
+def _steps(path):
+    "Path as a tuple of keys, from a dotted string or a sequence"
+    if isinstance(path, (list, tuple)):
+        return tuple(path)
+    if not path:
+        return ()
+    return tuple(path.split("."))
+
+
+def _topRun(found, kind):
+    "Values of the given kind from the top layer down to the first of other kind"
+    run = []
+    for source, value in reversed(found):
+        if not isinstance(value, kind):
+            break
+        run.append((source, value))
+    run.reverse()
+    return run
+
+
+def _mergeLists(lists):
+    result = list(lists[0])
+    for upper in lists[1:]:
+        result.extend([item for item in upper if item not in result])
+    return result
+
+
+class NamespaceOverlay(Mapping):
+    """
+    Read only view of a stack of layers, the later ones
+    overriding the former ones. Values can be accessed
+    as items, attributes or dotted paths like a namespace.
+
+    Mappings present in many layers are merged as views.
+    Lists are taken from the top layer, unless
+    a merge policy is given for their path:
+
+    - `replace`: the top layer value, also for mappings
+    - `append`: concatenation of the lists from the bottom up
+    - `merge`: like append, but skipping repeated items
+
+    Resolved values are cached.
+    If a layer is modified, call `invalidate` with the changed path,
+    or replace it with `setLayer`, which invalidates just
+    the paths with differences.
+    """
+
+    def __init__(self, layers, policies=None):
+        self._layers = list(layers)
+        self._sources = list(range(len(self._layers)))
+        self._path = ()
+        self._policies = {}
+        self._cache = {}
+        for path, policy in (policies or {}).items():
+            self.setPolicy(path, policy)
+
+    def _child(self, run, key):
+        child = NamespaceOverlay([])
+        child._sources = [source for source, layer in run]
+        child._layers = [layer for source, layer in run]
+        child._path = self._path + (key,)
+        child._policies = self._policies
+        return child
+
+    @property
+    def layers(self):
+        "The mappings of the layers at the path of this view"
+        return tuple(self._layers)
+
+    def setPolicy(self, path, policy):
+        "Sets the merge policy for the value at the dotted path"
+        if policy not in mergePolicies:
+            raise ValueError("Unknown merge policy {!r}".format(policy))
+        self._policies[self._path + _steps(path)] = policy
+        self.invalidate(path)
+
+    def _resolve(self, key):
+        found = [
+            (source, layer[key])
+            for source, layer in zip(self._sources, self._layers)
+            if key in layer
+        ]
+        if not found:
+            raise KeyError(key)
+        top = found[-1][1]
+        policy = self._policies.get(self._path + (key,))
+        if policy == "replace":
+            return top
+        if isinstance(top, dict):
+            return self._child(_topRun(found, dict), key)
+        if isinstance(top, list) and policy:
+            lists = [value for source, value in _topRun(found, list)]
+            if policy == "merge":
+                return _mergeLists(lists)
+            return [item for value in lists for item in value]
+        return top
+
+    def __getitem__(self, key):
+        value = self._cache.get(key, _missing)
+        if value is not _missing:
+            return value
+        try:
+            value = self._resolve(key)
+        except KeyError:
+            if not hasattr(key, "split") or "." not in key:
+                raise
+            value = self
+            for step in key.split("."):
+                value = value[step]
+            return value
+        self._cache[key] = value
+        return value
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __contains__(self, key):
+        return any(key in layer for layer in self._layers)
+
+    def __iter__(self):
+        seen = set()
+        for layer in self._layers:
+            for key in layer:
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield key
+
+    def __len__(self):
+        return len(set(key for layer in self._layers for key in layer))
+
+    def invalidate(self, path=None):
+        """
+        Forgets the cached value at the dotted path (or list of keys)
+        and the ones below it.
+        Call it after changing the value at the path in any layer.
+        Without path, the whole cache is cleared.
+        """
+        steps = _steps(path) if path is not None else ()
+        if not steps:
+            self._cache.clear()
+            return
+        view = self
+        for step in steps[:-1]:
+            cached = view._cache.get(step, _missing)
+            if not isinstance(cached, NamespaceOverlay):
+                # Lists and leaves are cached as a whole
+                view._cache.pop(step, None)
+                return
+            view = cached
+        view._cache.pop(steps[-1], None)
+
+    def setLayer(self, index, layer):
+        """
+        Replaces a layer, invalidating just the paths
+        with differences with the former one.
+        """
+        from .diffing import diff
+
+        for operation in diff(self._layers[index], layer):
+            self.invalidate(operation.path)
+            if "from" in operation:
+                self.invalidate(operation["from"])
+        self._rebind(index, layer)
+
+    def _rebind(self, source, layer):
+        "Points the views still cached to the new layer"
+        self._layers[self._sources.index(source)] = layer
+        for key, cached in self._cache.items():
+            if isinstance(cached, NamespaceOverlay) and source in cached._sources:
+                cached._rebind(source, layer[key])
+
+    def materialize(self):
+        """Returns the resolved content as a namespace.
+        Values are copied, so it can be modified
+        without affecting the layers.
+        """
+        result = namespace()
+        for key in self:
+            value = self[key]
+            if isinstance(value, NamespaceOverlay):
+                value = value.materialize()
+            else:
+                value = deepcopy(value)
+            result._setitem(key, value)  # dotted keys are literal
+        return result
+
+    def dump(self, target=None, engine="nodes", arrays="plain"):
+        return self.materialize().dump(target, engine=engine, arrays=arrays)
+
+    def __repr__(self):
+        return "NamespaceOverlay({!r})".format(self.materialize())
+
+
+# vim: sw=4 ts=4 noet
@@ -0,0 +1,185 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+import unittest
+from .core import namespace
+from .overlay import NamespaceOverlay
+
+
+def layers():
+    defaults = namespace.loads(
+        "db:\n"
+        "  host: localhost\n"
+        "  port: 5432\n"
+        "  options:\n"
+        "    timeout: 10\n"
+        "hosts: [a, b]\n"
+        "debug: false\n"
+    )
+    site = namespace.loads(
+        "db:\n"
+        "  host: db.example.com\n"
+        "  options:\n"
+        "    retries: 3\n"
+        "hosts: [b, c]\n"
+    )
+    host = namespace.loads("debug: true\nname: host1\n")
+    return defaults, site, host
+
+
+class NamespaceOverlay_Test(unittest.TestCase):
+
+    def test_topLayerWins(self):
+        config = namespace.overlay(*layers())
+        self.assertEqual(config.debug, True)
+        self.assertEqual(config["db"]["host"], "db.example.com")
+
+    def test_lowerLayersReached(self):
+        config = namespace.overlay(*layers())
+        self.assertEqual(config.db.port, 5432)
+        self.assertEqual(config.db.options.timeout, 10)
+        self.assertEqual(config.db.options.retries, 3)
+
+    def test_dottedPath(self):
+        config = namespace.overlay(*layers())
+        self.assertEqual(config["db.options.timeout"], 10)
+
+    def test_missing(self):
+        config = namespace.overlay(*layers())
+        with self.assertRaises(KeyError):
+            config["missing"]
+        with self.assertRaises(AttributeError):
+            config.missing
+        self.assertEqual(config.get("missing", 3), 3)
+
+    def test_keys_inLayerOrder(self):
+        config = namespace.overlay(*layers())
+        self.assertEqual(list(config), ["db", "hosts", "debug", "name"])
+        self.assertEqual(len(config), 4)
+        self.assertIn("name", config)
+
+    def test_noCopies(self):
+        defaults, site, host = layers()
+        config = namespace.overlay(defaults, site, host)
+        self.assertIs(config.hosts, site.hosts)
+        self.assertEqual(config.db.layers, (defaults.db, site.db))
+
+    def test_scalarShadowsLowerMappings(self):
+        config = namespace.overlay(namespace(a=namespace(b=1)), namespace(a=2))
+        self.assertEqual(config.a, 2)
+
+    def test_mappingOverScalar_notMerged(self):
+        config = namespace.overlay(
+            namespace(a=namespace(b=1)), namespace(a=2), namespace(a=namespace(c=3))
+        )
+        self.assertEqual(config.a.materialize(), namespace(c=3))
+
+    def test_policy_append(self):
+        config = namespace.overlay(*layers(), policies={"hosts": "append"})
+        self.assertEqual(config.hosts, ["a", "b", "b", "c"])
+
+    def test_policy_merge(self):
+        config = namespace.overlay(*layers(), policies={"hosts": "merge"})
+        self.assertEqual(config.hosts, ["a", "b", "c"])
+
+    def test_policy_replaceMapping(self):
+        config = namespace.overlay(*layers(), policies={"db.options": "replace"})
+        self.assertEqual(config.db.options, namespace(retries=3))
+
+    def test_policy_unknown(self):
+        with self.assertRaises(ValueError) as ctx:
+            namespace.overlay(*layers(), policies={"hosts": "bad"})
+        self.assertEqual(format(ctx.exception), "Unknown merge policy 'bad'")
+
+    def test_cached(self):
+        config = namespace.overlay(*layers())
+        self.assertIs(config.db, config.db)
+        self.assertIs(config.db.options, config.db.options)
+
+    def test_invalidate(self):
+        defaults, site, host = layers()
+        config = namespace.overlay(defaults, site, host)
+        options = config.db.options
+        config.db.port
+        site.db.port = 6000
+        self.assertEqual(config.db.port, 5432)  # cached
+        config.invalidate("db.port")
+        self.assertEqual(config.db.port, 6000)
+        self.assertIs(config.db.options, options)
+
+    def test_invalidate_all(self):
+        defaults, site, host = layers()
+        config = namespace.overlay(defaults, site, host)
+        config.debug
+        host.debug = False
+        config.invalidate()
+        self.assertEqual(config.debug, False)
+
+    def test_setLayer(self):
+        defaults, site, host = layers()
+        config = namespace.overlay(defaults, site, host)
+        db = config.db
+        options = config.db.options
+        newSite = site.deepcopy()
+        newSite.hosts.append("d")
+        newSite.db.host = "other.example.com"
+        config.setLayer(1, newSite)
+        self.assertEqual(config.hosts, ["b", "c", "d"])
+        self.assertEqual(config.db.host, "other.example.com")
+        self.assertIs(config.db, db)
+        self.assertIs(config.db.options, options)
+        self.assertEqual(config.layers, (defaults, newSite, host))
+
+    def test_setLayer_rebindsUnchangedViews(self):
+        defaults, site, host = layers()
+        config = namespace.overlay(defaults, site, host)
+        config.db.options.retries
+        newSite = site.deepcopy()
+        config.setLayer(1, newSite)
+        newSite.db.options.retries = 5
+        config.invalidate("db.options.retries")
+        self.assertEqual(config.db.options.retries, 5)
+
+    def test_materialize(self):
+        defaults, site, host = layers()
+        result = namespace.overlay(defaults, site, host).materialize()
+        self.assertEqual(type(result), namespace)
+        self.assertEqual(
+            result.dump(),
+            "db:\n"
+            "  host: db.example.com\n"
+            "  port: 5432\n"
+            "  options:\n"
+            "    timeout: 10\n"
+            "    retries: 3\n"
+            "hosts:\n"
+            "- b\n"
+            "- c\n"
+            "debug: true\n"
+            "name: host1\n",
+        )
+        result.hosts.append("x")
+        self.assertEqual(site.hosts, ["b", "c"])
+
+    def test_equality(self):
+        config = namespace.overlay(namespace(a=namespace(b=1)), namespace(c=2))
+        self.assertEqual(config, namespace(a=namespace(b=1), c=2))
+
+    def test_dump(self):
+        config = NamespaceOverlay([namespace(a=1), namespace(b=2)])
+        self.assertEqual(config.dump(), "a: 1\nb: 2\n")
+
+    def test_dump_options(self):
+        config = NamespaceOverlay([namespace(a=[1]), namespace(b=2)])
+        self.assertEqual(
+            config.dump(engine="events", arrays="tagged"), "a:\n- 1\nb: 2\n"
+        )
+        with self.assertRaises(ValueError):
+            config.dump(engine="bad")
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: sw=4 ts=4 noet
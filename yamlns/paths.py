@@ -0,0 +1,172 @@
+"""
+Dotted paths like 'client.address.city' or 'items.3.price',
+parsed once and reused to access nested values.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+
+_sequences = (list, tuple)
+
+
+class _LruCache(object):
+    """
+    Thread safe mapping that keeps at most `size` entries,
+    dropping the least recently used ones.
+
+    Hits do not lock nor reorder: they just flag the entry as used.
+    On misses, when full, the oldest entries flagged are kept,
+    moved to the end with the flag cleared, and the oldest one
+    not used since is dropped (second chance, close to LRU).
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self._used = set()
+
+    def get(self, key, factory):
+        """Returns the value for key, building it with factory(key) if missing"""
+        try:
+            value = self._data[key]
+        except KeyError:
+            pass
+        else:
+            self._used.add(key)
+            return value
+        value = factory(key)
+        with self._lock:
+            data = self._data
+            used = self._used
+            data[key] = value
+            while len(data) > self.size:
+                oldest, kept = data.popitem(last=False)
+                if oldest in used:
+                    used.discard(oldest)
+                    data[oldest] = kept
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._used.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+_integer = re.compile(r"-?[0-9]+$")
+
+
+def _index(step):
+    "Returns the step as list index, or None if it cannot be one"
+    if _integer.match(step):
+        return int(step)
+    return None
+
+
+class NamespacePath(object):
+    """
+    A dotted path to a nested value.
+    Each step is a key for mappings.
+    Numeric steps are indexes for lists.
+
+    >>> from yamlns import ns
+    >>> city = NamespacePath('clients.0.address.city')
+    >>> data = ns(clients=[ns(address=ns(city='Girona'))])
+    >>> city.get(data)
+    'Girona'
+    >>> city.set(data, 'Lleida')
+    >>> data.clients[0].address.city
+    'Lleida'
+    """
+
+    __slots__ = ("path", "_steps")
+
+    def __init__(self, path):
+        self.path = path
+        self._steps = tuple((step, _index(step)) for step in path.split("."))
+
+    def __repr__(self):
+        return "NamespacePath({!r})".format(self.path)
+
+    @property
+    def steps(self):
+        "The keys or indexes, in order"
+        return [step if index is None else index for step, index in self._steps]
+
+    def _container(self, data, create=False):
+        """Returns the container of the last step and the key in it.
+        If create is set, missing intermediate mappings are added.
+        """
+        for key, index in self._steps[:-1]:
+            if index is not None and isinstance(data, _sequences):
+                data = data[index]
+                continue
+            try:
+                data = data[key]
+            except KeyError:
+                if not create:
+                    raise
+                from .core import namespace
+
+                # Read back, the container may convert what it stores
+                data[key] = namespace()
+                data = data[key]
+        key, index = self._steps[-1]
+        if index is not None and isinstance(data, _sequences):
+            return data, index
+        return data, key
+
+    def get(self, data, *default):
+        """Returns the value at the path.
+        If a default is given, it is returned when the path is missing.
+        """
+        try:
+            for key, index in self._steps:
+                if index is not None and isinstance(data, _sequences):
+                    key = index
+                data = data[key]
+        except (KeyError, IndexError):
+            if default:
+                return default[0]
+            raise
+        return data
+
+    def set(self, data, value):
+        """Sets the value at the path, creating missing intermediate namespaces"""
+        container, key = self._container(data, create=True)
+        container[key] = value
+
+    def delete(self, data):
+        """Removes the value at the path"""
+        container, key = self._container(data)
+        del container[key]
+
+    def setdefault(self, data, default=None):
+        """Returns the value at the path,
+        setting it to default before if missing.
+        """
+        container, key = self._container(data, create=True)
+        try:
+            return container[key]
+        except KeyError:
+            container[key] = default
+            return default
+
+
+_compiled = _LruCache(1024)
+
+
+def compilePath(path):
+    """Returns the NamespacePath for the dotted path.
+    Recently used paths are cached.
+    """
+    if isinstance(path, NamespacePath):
+        return path
+    return _compiled.get(path, NamespacePath)
+
+
+# vim: sw=4 ts=4 noet
@@ -0,0 +1,180 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+import unittest
+from .core import namespace
+from .paths import NamespacePath, compilePath, _LruCache
+
+
+class NamespacePath_Test(unittest.TestCase):
+
+    def data(self):
+        return namespace.loads(
+            "client:\n"
+            "  address:\n"
+            "    city: Girona\n"
+            "items:\n"
+            "- price: 3\n"
+            "- price: 4\n"
+        )
+
+    def test_get(self):
+        path = NamespacePath("client.address.city")
+        self.assertEqual(path.get(self.data()), "Girona")
+
+    def test_get_singleStep(self):
+        path = NamespacePath("client")
+        self.assertEqual(
+            path.get(self.data()), namespace.loads("address: {city: Girona}")
+        )
+
+    def test_get_listIndex(self):
+        path = NamespacePath("items.1.price")
+        self.assertEqual(path.get(self.data()), 4)
+
+    def test_get_negativeListIndex(self):
+        path = NamespacePath("items.-1.price")
+        self.assertEqual(path.get(self.data()), 4)
+
+    def test_get_numericKeyInMapping(self):
+        data = namespace()
+        data._setitem("3", "value")
+        self.assertEqual(NamespacePath("3").get(data), "value")
+
+    def test_get_missing(self):
+        path = NamespacePath("client.phone")
+        with self.assertRaises(KeyError) as ctx:
+            path.get(self.data())
+        self.assertEqual(ctx.exception.args, ("phone",))
+
+    def test_get_missingIndex(self):
+        path = NamespacePath("items.5.price")
+        with self.assertRaises(IndexError):
+            path.get(self.data())
+
+    def test_get_default(self):
+        path = NamespacePath("client.phone.number")
+        self.assertEqual(path.get(self.data(), None), None)
+
+    def test_get_plainDicts(self):
+        path = NamespacePath("a.b")
+        self.assertEqual(path.get(dict(a=dict(b=2))), 2)
+
+    def test_set(self):
+        data = self.data()
+        NamespacePath("client.address.city").set(data, "Lleida")
+        self.assertEqual(data.client.address.city, "Lleida")
+
+    def test_set_createsLevels(self):
+        data = namespace()
+        NamespacePath("a.b.c").set(data, 1)
+        self.assertEqual(data, namespace(a=namespace(b=namespace(c=1))))
+        self.assertEqual(type(data.a.b), namespace)
+
+    def test_set_listIndex(self):
+        data = self.data()
+        NamespacePath("items.0.price").set(data, 5)
+        self.assertEqual(data["items"][0].price, 5)
+
+    def test_set_listElement(self):
+        data = self.data()
+        NamespacePath("items.0").set(data, 5)
+        self.assertEqual(data["items"], [5, namespace(price=4)])
+
+    def test_delete(self):
+        data = self.data()
+        NamespacePath("client.address.city").delete(data)
+        self.assertEqual(data.client.address, namespace())
+
+    def test_delete_listElement(self):
+        data = self.data()
+        NamespacePath("items.0").delete(data)
+        self.assertEqual(data["items"], [namespace(price=4)])
+
+    def test_delete_missing(self):
+        data = self.data()
+        with self.assertRaises(KeyError):
+            NamespacePath("client.phone.number").delete(data)
+        self.assertNotIn("phone", data.client)
+
+    def test_setdefault_missing(self):
+        data = self.data()
+        result = NamespacePath("client.phone.number").setdefault(data, "555")
+        self.assertEqual(result, "555")
+        self.assertEqual(data.client.phone.number, "555")
+
+    def test_setdefault_existing(self):
+        data = self.data()
+        result = NamespacePath("client.address.city").setdefault(data, "Lleida")
+        self.assertEqual(result, "Girona")
+        self.assertEqual(data.client.address.city, "Girona")
+
+    def test_steps_notIntegers_areKeys(self):
+        self.assertEqual(
+            NamespacePath("a.--1.\u00b2.1_0.-2").steps,
+            ["a", "--1", "\u00b2", "1_0", -2],
+        )
+
+    def test_steps(self):
+        self.assertEqual(NamespacePath("items.3.price").steps, ["items", 3, "price"])
+
+    def test_compilePath_cached(self):
+        self.assertIs(compilePath("a.b.c"), compilePath("a.b.c"))
+
+    def test_compilePath_fromCompiled(self):
+        path = NamespacePath("a.b")
+        self.assertIs(compilePath(path), path)
+
+    def test_lruCache_dropsLeastRecentlyUsed(self):
+        cache = _LruCache(2)
+        cache.get("a", str.upper)
+        cache.get("b", str.upper)
+        cache.get("a", lambda key: "unused")
+        cache.get("c", str.upper)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get("a", lambda key: "rebuilt"), "A")
+        self.assertEqual(cache.get("b", lambda key: "rebuilt"), "rebuilt")
+
+    def test_lruCache_hitsDoNotLock(self):
+        cache = _LruCache(2)
+        cache.get("a", str.upper)
+        with cache._lock:
+            self.assertEqual(cache.get("a", str.lower), "A")
+
+
+class NamespaceMultilevel_Test(unittest.TestCase):
+
+    def test_getitem_notIntegerStep_keyError(self):
+        with self.assertRaises(KeyError):
+            namespace()["x.--1"]
+
+    def test_getitem_listIndex(self):
+        data = namespace(items=[namespace(price=3)])
+        self.assertEqual(data["items.0.price"], 3)
+
+    def test_setitem_listIndex(self):
+        data = namespace(items=[namespace(price=3)])
+        data["items.0.price"] = 4
+        self.assertEqual(data["items"][0].price, 4)
+
+    def test_delitem_multilevel(self):
+        data = namespace(a=namespace(b=4, c=5))
+        del data["a.b"]
+        self.assertEqual(data, namespace(a=namespace(c=5)))
+
+    def test_delitem_missing(self):
+        data = namespace(a=namespace(b=4))
+        with self.assertRaises(KeyError):
+            del data["a.c"]
+
+    def test_delattr_multilevel(self):
+        data = namespace(a=namespace(b=4, c=5))
+        delattr(data, "a.b")
+        self.assertEqual(data, namespace(a=namespace(c=5)))
+
+    def test_compilePath(self):
+        path = namespace.compilePath("a.b")
+        self.assertEqual(path.get(namespace(a=namespace(b=4))), 4)
+
+
+# vim: sw=4 ts=4 noet
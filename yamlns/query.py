@@ -0,0 +1,350 @@
+"""
+Wildcard queries over namespace trees.
+
+A query is a dotted path whose steps can be:
+
+- `key`: the value for the key, or the item if it is a list index
+- `*` or `[*]`: every value of a mapping or item of a list
+- `**`: the node itself and all its descendants
+- `[3]`, `[-1]`: a list item
+- `[1:5]`, `[::2]`: a slice of the list items
+- `['a.b']`: a key containing dots
+- `[?field op literal]`: the values or items whose field,
+  a dotted path relative to them, or `@` for themselves,
+  compares to the literal with `==`, `!=`, `<`, `<=`, `>` or `>=`.
+  Literals are YAML scalars.
+- `[?field]`: the values or items whose field is present and true
+
+>>> from yamlns import ns
+>>> data = ns(contracts=[
+...     ns(name='A', periods=[ns(kwh=10), ns(kwh=20)]),
+...     ns(name='B', periods=[ns(kwh=30)]),
+... ])
+>>> list(compileQuery('contracts.*.periods.*.kwh').find(data))
+[10, 20, 30]
+>>> list(compileQuery('contracts[?name == B].periods[0].kwh').find(data, paths=True))
+[(['contracts', 1, 'periods', 0, 'kwh'], 30)]
+"""
+
+import re
+import numbers
+import operator
+from .compat import py2
+from .paths import _LruCache, _index
+
+_sequences = (list, tuple)
+_texts = (type(u""), str)
+
+
+def _children(value):
+    if isinstance(value, dict):
+        return value.items()
+    if isinstance(value, _sequences):
+        return enumerate(value)
+    return ()
+
+
+def _join(path, key):
+    if path is None:
+        return None
+    return path + (key,)
+
+
+class _Key(object):
+    __slots__ = ("key", "index", "dotted")
+
+    def __init__(self, key, index=None):
+        self.key = key
+        self.index = index
+        self.dotted = "." in key
+
+    def apply(self, nodes):
+        key = self.key
+        index = self.index
+        dotted = self.dotted
+        for path, value in nodes:
+            if isinstance(value, dict):
+                # Literal key, namespaces would resolve dotted ones as paths
+                if dotted and key not in value:
+                    continue
+                try:
+                    child = value[key]
+                except KeyError:
+                    continue
+                yield _join(path, key), child
+            elif index is not None and isinstance(value, _sequences):
+                try:
+                    child = value[index]
+                except IndexError:
+                    continue
+                position = index if index >= 0 else index + len(value)
+                yield _join(path, position), child
+
+
+class _Wildcard(object):
+    __slots__ = ()
+
+    def apply(self, nodes):
+        for path, value in nodes:
+            if path is None:
+                if isinstance(value, dict):
+                    for child in value.values():
+                        yield None, child
+                elif isinstance(value, _sequences):
+                    for child in value:
+                        yield None, child
+                continue
+            for key, child in _children(value):
+                yield path + (key,), child
+
+
+class _Descendants(object):
+    __slots__ = ()
+
+    def apply(self, nodes):
+        for node in nodes:
+            stack = [node]
+            while stack:
+                path, value = stack.pop()
+                yield path, value
+                children = [
+                    (_join(path, key), child) for key, child in _children(value)
+                ]
+                children.reverse()
+                stack.extend(children)
+
+
+class _Slice(object):
+    __slots__ = ("slice",)
+
+    def __init__(self, start, stop, step):
+        self.slice = slice(start, stop, step)
+
+    def apply(self, nodes):
+        for path, value in nodes:
+            if not isinstance(value, _sequences):
+                continue
+            for index in range(*self.slice.indices(len(value))):
+                yield _join(path, index), value[index]
+
+
+_comparisons = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+_equalities = (operator.eq, operator.ne)
+
+_missing = object()
+
+
+def _orderable(a, b):
+    "Whether Py3 orders a and b, since Py2 orders any two values"
+    if isinstance(a, numbers.Number) and isinstance(b, numbers.Number):
+        return True
+    if isinstance(a, _texts) and isinstance(b, _texts):
+        return True
+    return isinstance(a, type(b)) or isinstance(b, type(a))
+
+
+class _Filter(object):
+    __slots__ = ("field", "compare", "literal")
+
+    def __init__(self, field, compare=None, literal=None):
+        self.field = field
+        self.compare = compare
+        self.literal = literal
+
+    def _field(self, value):
+        for step in self.field:
+            if isinstance(value, dict):
+                value = value.get(step, _missing)
+            elif isinstance(value, _sequences) and _index(step) is not None:
+                try:
+                    value = value[_index(step)]
+                except IndexError:
+                    return _missing
+            else:
+                return _missing
+            if value is _missing:
+                break
+        return value
+
+    def matches(self, value):
+        value = self._field(value)
+        if value is _missing:
+            return False
+        if self.compare is None:
+            return bool(value)
+        if py2 and self.compare not in _equalities:
+            if not _orderable(value, self.literal):
+                return False
+        try:
+            return self.compare(value, self.literal)
+        except TypeError:  # Not comparable types
+            return False
+
+    def apply(self, nodes):
+        matches = self.matches
+        for path, value in nodes:
+            for key, child in _children(value):
+                if matches(child):
+                    yield _join(path, key), child
+
+
+_predicate = re.compile(r"^\s*(@|[^\s=!<>]+)\s*(==|!=|<=|>=|<|>)\s*(.*?)\s*$")
+
+
+def _literal(content):
+    import yaml
+    from .serialization import NamespaceYAMLLoader
+
+    return yaml.load(content, Loader=NamespaceYAMLLoader)
+
+
+def _parseFilter(content, expression):
+    match = _predicate.match(content)
+    if match:
+        field, comparison, literal = match.groups()
+    else:
+        field, comparison, literal = content.strip(), None, None
+    if not field:
+        raise ValueError("Invalid query filter in {!r}".format(expression))
+    field = () if field == "@" else tuple(field.split("."))
+    if comparison is None:
+        return _Filter(field)
+    return _Filter(field, _comparisons[comparison], _literal(literal))
+
+
+def _parseBracket(content, expression):
+    stripped = content.strip()
+    if stripped == "*":
+        return _Wildcard()
+    if stripped.startswith("?"):
+        return _parseFilter(stripped[1:], expression)
+    if (
+        stripped[:1] in ("'", '"')
+        and stripped[-1:] == stripped[:1]
+        and len(stripped) > 1
+    ):
+        return _Key(stripped[1:-1])
+    if ":" in stripped:
+        bounds = stripped.split(":")
+        if len(bounds) > 3:
+            raise ValueError("Invalid query slice in {!r}".format(expression))
+        try:
+            bounds = [int(bound) if bound.strip() else None for bound in bounds]
+        except ValueError:
+            raise ValueError("Invalid query slice in {!r}".format(expression))
+        return _Slice(*(bounds + [None] * (3 - len(bounds))))
+    index = _index(stripped)
+    if index is None:
+        raise ValueError("Invalid query index in {!r}".format(expression))
+    return _Key(stripped, index)
+
+
+def _closing(expression, start):
+    "Position of the bracket closing the one at start, skipping quoted text"
+    quote = None
+    for position in range(start + 1, len(expression)):
+        char = expression[position]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char == "]":
+            return position
+    raise ValueError("Unclosed bracket in query {!r}".format(expression))
+
+
+def _parse(expression):
+    steps = []
+    position = 0
+    length = len(expression)
+    expectStep = True
+    while position < length:
+        char = expression[position]
+        if char == ".":
+            if expectStep:
+                raise ValueError("Empty step in query {!r}".format(expression))
+            expectStep = True
+            position += 1
+            continue
+        if char == "[":
+            end = _closing(expression, position)
+            steps.append(_parseBracket(expression[position + 1 : end], expression))
+            position = end + 1
+            expectStep = False
+            continue
+        if not expectStep:
+            raise ValueError("Missing dot in query {!r}".format(expression))
+        end = position
+        while end < length and expression[end] not in ".[":
+            end += 1
+        name = expression[position:end]
+        if name == "*":
+            steps.append(_Wildcard())
+        elif name == "**":
+            steps.append(_Descendants())
+        else:
+            steps.append(_Key(name, _index(name)))
+        position = end
+        expectStep = False
+    if expectStep and steps:
+        raise ValueError("Empty step in query {!r}".format(expression))
+    return steps
+
+
+class NamespaceQuery(object):
+    """
+    A compiled query, see the module documentation for the syntax.
+    Matching is lazy: values are generated while
+    walking the tree, so stopping early saves the rest of the walk.
+    """
+
+    __slots__ = ("expression", "_steps")
+
+    def __init__(self, expression):
+        self.expression = expression
+        self._steps = _parse(expression)
+
+    def __repr__(self):
+        return "NamespaceQuery({!r})".format(self.expression)
+
+    def find(self, data, paths=False):
+        """
+        Generates the values matching the query.
+        If paths is set, generates (path, value) pairs instead,
+        paths being lists of keys and indexes.
+        """
+        nodes = iter([((), data) if paths else (None, data)])
+        for step in self._steps:
+            nodes = step.apply(nodes)
+        if paths:
+            return ((list(path), value) for path, value in nodes)
+        return (value for path, value in nodes)
+
+    def first(self, data, default=None):
+        "Returns the first matching value, or default if none"
+        for value in self.find(data):
+            return value
+        return default
+
+
+_compiled = _LruCache(256)
+
+
+def compileQuery(expression):
+    """Returns the NamespaceQuery for the expression.
+    Recently used queries are cached.
+    """
+    if isinstance(expression, NamespaceQuery):
+        return expression
+    return _compiled.get(expression, NamespaceQuery)
+
+
+# vim: sw=4 ts=4 noet
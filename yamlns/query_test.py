@@ -0,0 +1,159 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+import decimal
+import unittest
+from .core import namespace
+from .dateutils import Date
+from .query import compileQuery, NamespaceQuery
+
+
+def sample():
+    return namespace.loads(
+        "contracts:\n"
+        "- name: A\n"
+        "  active: true\n"
+        "  start: 2020-01-01\n"
+        "  periods:\n"
+        "  - kwh: 10\n"
+        "  - kwh: 20.5\n"
+        "- name: B\n"
+        "  active: false\n"
+        "  start: 2022-06-01\n"
+        "  periods:\n"
+        "  - kwh: 30\n"
+        "owner:\n"
+        "  name: Someone\n"
+        "  address:\n"
+        "    city: Girona\n"
+    )
+
+
+class Query_Test(unittest.TestCase):
+
+    def assertQuery(self, expression, expected, paths=False):
+        self.assertEqual(
+            list(compileQuery(expression).find(sample(), paths=paths)), expected
+        )
+
+    def test_key(self):
+        self.assertQuery("owner.name", ["Someone"])
+
+    def test_missingKey(self):
+        self.assertQuery("owner.missing", [])
+
+    def test_empty_isRoot(self):
+        self.assertEqual(list(compileQuery("").find(3)), [3])
+
+    def test_index(self):
+        self.assertQuery("contracts.1.name", ["B"])
+        self.assertQuery("contracts[1].name", ["B"])
+
+    def test_negativeIndex(self):
+        self.assertQuery("contracts[-1].name", [(["contracts", 1, "name"], "B")], True)
+
+    def test_indexOutOfRange(self):
+        self.assertQuery("contracts[5].name", [])
+
+    def test_wildcard(self):
+        self.assertQuery("contracts.*.periods.*.kwh", [10, decimal.Decimal("20.5"), 30])
+        self.assertQuery("contracts[*].name", ["A", "B"])
+
+    def test_wildcard_mapping(self):
+        self.assertQuery("owner.*", ["Someone", namespace(city="Girona")])
+
+    def test_descendants(self):
+        self.assertQuery("**.name", ["A", "B", "Someone"])
+        self.assertQuery("**.city", ["Girona"])
+
+    def test_slice(self):
+        self.assertQuery("contracts[0:1].name", ["A"])
+        self.assertQuery("contracts[::-1].name", ["B", "A"])
+
+    def test_filter_equal(self):
+        self.assertQuery("contracts[?name == B].periods.*.kwh", [30])
+
+    def test_filter_typedLiteral(self):
+        self.assertQuery("contracts[?active == true].name", ["A"])
+        self.assertQuery("contracts[?start >= 2021-01-01].name", ["B"])
+        self.assertQuery(
+            "contracts.*.periods[?kwh > 15].kwh", [decimal.Decimal("20.5"), 30]
+        )
+
+    def test_filter_self(self):
+        self.assertQuery("contracts.*.periods.*.kwh", [10, decimal.Decimal("20.5"), 30])
+        self.assertEqual(list(compileQuery("[?@ > 2]").find([1, 3, 5])), [3, 5])
+
+    def test_filter_nestedField(self):
+        self.assertQuery("[?address.city == Girona].name", ["Someone"])
+
+    def test_filter_existence(self):
+        self.assertQuery("contracts[?active].name", ["A"])
+
+    def test_filter_incomparable_notMatching(self):
+        self.assertQuery("contracts[?name > 3].name", [])
+
+    def test_quotedKey(self):
+        data = namespace()
+        data._setitem("a.b", namespace(c=1))
+        self.assertEqual(list(compileQuery("['a.b'].c").find(data)), [1])
+
+    def test_quotedKey_notAPath(self):
+        data = namespace(a=namespace(b=1))
+        self.assertEqual(list(compileQuery("['a.b']").find(data, paths=True)), [])
+
+    def test_paths(self):
+        self.assertQuery(
+            "contracts.*.periods.*.kwh",
+            [
+                (["contracts", 0, "periods", 0, "kwh"], 10),
+                (["contracts", 0, "periods", 1, "kwh"], decimal.Decimal("20.5")),
+                (["contracts", 1, "periods", 0, "kwh"], 30),
+            ],
+            paths=True,
+        )
+
+    def test_lazy(self):
+        data = namespace(items=[1, 2, "stop"])
+        found = compileQuery("items.*").find(data)
+        self.assertEqual(next(found), 1)
+        data["items"][1] = 5
+        self.assertEqual(list(found), [5, "stop"])
+
+    def test_first(self):
+        query = compileQuery("contracts.*.name")
+        self.assertEqual(query.first(sample()), "A")
+        self.assertEqual(compileQuery("missing").first(sample(), 3), 3)
+
+    def test_compiledOnce(self):
+        self.assertIs(compileQuery("a.*.b"), compileQuery("a.*.b"))
+        query = NamespaceQuery("a")
+        self.assertIs(compileQuery(query), query)
+
+    def test_namespaceMethods(self):
+        self.assertEqual(list(sample().query("owner.address.city")), ["Girona"])
+        self.assertIs(namespace.compileQuery("x.y"), compileQuery("x.y"))
+
+    def assertInvalid(self, expression, message):
+        with self.assertRaises(ValueError) as ctx:
+            NamespaceQuery(expression)
+        self.assertEqual(format(ctx.exception), message)
+
+    def test_invalid(self):
+        self.assertInvalid("a..b", "Empty step in query 'a..b'")
+        self.assertInvalid("a.", "Empty step in query 'a.'")
+        self.assertInvalid("a[1", "Unclosed bracket in query 'a[1'")
+        self.assertInvalid("a[x]", "Invalid query index in 'a[x]'")
+        self.assertInvalid("a[1:x]", "Invalid query slice in 'a[1:x]'")
+        self.assertInvalid("a[0]b", "Missing dot in query 'a[0]b'")
+        self.assertInvalid("a[?]", "Invalid query filter in 'a[?]'")
+
+    def test_repr(self):
+        self.assertEqual(repr(NamespaceQuery("a.*")), "NamespaceQuery('a.*')")
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: sw=4 ts=4 noet
@@ -0,0 +1,266 @@
+"""
+Slotted record classes with a fixed set of fields.
+
+Many records with the same shape take several times less memory
+as `__slots__` based objects than as namespaces.
+Record classes are generated from a skeleton,
+a sample namespace or the result of `namespace.fromTemplateVars`:
+
+>>> from yamlns import ns
+>>> Invoice = recordClass(ns(code='', owner=ns(name='', vat='')), 'Invoice')
+>>> invoice = Invoice(code='F001', owner=dict(name='Someone'))
+>>> invoice.owner.name
+'Someone'
+>>> invoice['owner.vat'] = 'ES1'
+>>> print(invoice.dump(), end='')
+code: F001
+owner:
+  name: Someone
+  vat: ES1
+"""
+
+import io
+import keyword
+import yaml
+from .core import namespace, _base, _strtypes, _dump
+from .compat import Path, text
+from .paths import compilePath
+from .serialization import NamespaceYamlDumper, NamespaceYAMLLoader
+
+
+class record(object):
+    """
+    Base of the generated record classes.
+    Fields are accessed as attributes, items or dotted paths,
+    like in a namespace. Unset fields are missing, as absent keys.
+    Setting a field not in the class raises KeyError or AttributeError.
+    """
+
+    __slots__ = ()
+    _fields = ()
+    _fieldSet = frozenset()
+    # Record classes for fields holding a mapping or a list of mappings
+    _nested = {}
+    _lists = frozenset()
+
+    def __init__(self, *args, **kwds):
+        for key, value in _base(*args, **kwds).items():
+            self[key] = value
+
+    def _convert(self, key, value):
+        nested = self._nested.get(key)
+        if nested is None:
+            return value
+        if key in self._lists and isinstance(value, list):
+            return [nested(item) if isinstance(item, dict) else item for item in value]
+        if isinstance(value, dict):
+            return nested(value)
+        return value
+
+    def __setitem__(self, key, value):
+        if key not in self._fieldSet:
+            if type(key) in _strtypes and "." in key:
+                return compilePath(key).set(self, value)
+            raise KeyError(key)
+        object.__setattr__(self, key, self._convert(key, value))
+
+    def __setattr__(self, name, value):
+        try:
+            self[name] = value
+        except KeyError:
+            raise AttributeError(name)
+
+    def __getitem__(self, key):
+        if key in self._fieldSet:
+            try:
+                return object.__getattribute__(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        if type(key) in _strtypes and "." in key:
+            return compilePath(key).get(self)
+        raise KeyError(key)
+
+    def __delitem__(self, key):
+        if key in self._fieldSet:
+            try:
+                return object.__delattr__(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        if type(key) in _strtypes and "." in key:
+            return compilePath(key).delete(self)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        if key not in self._fieldSet:
+            return False
+        try:
+            object.__getattribute__(self, key)
+        except AttributeError:
+            return False
+        return True
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def items(self):
+        result = []
+        for field in self._fields:
+            try:
+                result.append((field, object.__getattribute__(self, field)))
+            except AttributeError:
+                pass
+        return result
+
+    def keys(self):
+        return [key for key, value in self.items()]
+
+    def values(self):
+        return [value for key, value in self.items()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.items())
+
+    def __eq__(self, other):
+        if not isinstance(other, (record, dict)):
+            return NotImplemented
+        return dict(self.items()) == dict(other.items())
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "{}({})".format(type(self).__name__, dict(self.items()))
+
+    def asNamespace(self):
+        """Returns the content as namespaces and lists"""
+        return _plain(self)
+
+    def dump(self, target=None):
+        return _dump(self, target)
+
+    @classmethod
+    def loads(cls, yamlContent):
+        return cls.load(io.StringIO(text(yamlContent)))
+
+    @classmethod
+    def load(cls, source):
+        """Loads a YAML document from a path or an open file,
+        constructing the records directly, without intermediate namespaces.
+        A sequence at the root is loaded as a list of records.
+        """
+        if hasattr(source, "read"):
+            return _loadRecords(source, cls)
+        with Path(source).open() as f:
+            return _loadRecords(f, cls)
+
+
+NamespaceYamlDumper.add_multi_representer(record, NamespaceYamlDumper.represent_dict)
+
+
+def _plain(data):
+    if isinstance(data, record):
+        return namespace((key, _plain(value)) for key, value in data.items())
+    if isinstance(data, list):
+        return [_plain(item) for item in data]
+    return data
+
+
+def _construct(loader, node, cls):
+    if isinstance(node, yaml.SequenceNode):
+        return [_construct(loader, item, cls) for item in node.value]
+    if not isinstance(node, yaml.MappingNode):
+        raise yaml.constructor.ConstructorError(
+            None,
+            None,
+            "expected a mapping for {}, but found {}".format(cls.__name__, node.id),
+            node.start_mark,
+        )
+    loader.flatten_mapping(node)
+    result = cls.__new__(cls)
+    for keyNode, valueNode in node.value:
+        key = loader.construct_object(keyNode, deep=True)
+        if key not in cls._fieldSet:
+            raise yaml.constructor.ConstructorError(
+                "while constructing a {}".format(cls.__name__),
+                node.start_mark,
+                "found unknown field {!r}".format(key),
+                keyNode.start_mark,
+            )
+        nested = cls._nested.get(key)
+        if nested is not None and isinstance(
+            valueNode, (yaml.MappingNode, yaml.SequenceNode)
+        ):
+            value = _construct(loader, valueNode, nested)
+        else:
+            value = loader.construct_object(valueNode, deep=True)
+        object.__setattr__(result, key, value)
+    return result
+
+
+def _loadRecords(stream, cls):
+    loader = NamespaceYAMLLoader(stream)
+    try:
+        node = loader.get_single_node()
+        if node is None:
+            return None
+        return _construct(loader, node, cls)
+    finally:
+        loader.dispose()
+
+
+def _validField(name):
+    try:
+        identifier = name.isidentifier()
+    except AttributeError:  # Py2
+        import re
+
+        identifier = bool(re.match(r"^[a-z_][a-z0-9_]*$", name, re.I))
+    return identifier and not keyword.iskeyword(name) and not name.startswith("_")
+
+
+def recordClass(skeleton, name="Record"):
+    """
+    Returns a record class with the keys of the skeleton as fields.
+    Fields whose skeleton value is a mapping, or a list starting
+    with a mapping, hold records of nested classes, named
+    after the parent class and the field: 'RecordOwner'.
+    Field names must be identifiers not starting with underscore
+    nor clashing with record methods.
+    """
+    fields = []
+    nested = {}
+    lists = set()
+    for field, value in skeleton.items():
+        if type(field) not in _strtypes or not _validField(field):
+            raise ValueError("Invalid record field name {!r}".format(field))
+        if hasattr(record, field):
+            raise ValueError("Record field {!r} clashes with a method".format(field))
+        fields.append(field)
+        className = name + field[:1].upper() + field[1:]
+        if isinstance(value, dict):
+            nested[field] = recordClass(value, className)
+        elif isinstance(value, list) and value and isinstance(value[0], dict):
+            nested[field] = recordClass(value[0], className)
+            lists.add(field)
+    return type(
+        str(name),
+        (record,),
+        dict(
+            __slots__=tuple(str(field) for field in fields),
+            _fields=tuple(fields),
+            _fieldSet=frozenset(fields),
+            _nested=nested,
+            _lists=frozenset(lists),
+        ),
+    )
+
+
+# vim: sw=4 ts=4 noet
@@ -0,0 +1,230 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+import copy
+import decimal
+import unittest
+import yaml
+from .core import namespace
+from .dateutils import Date
+from .records import record, recordClass
+
+
+def invoiceClass():
+    # Pairs, since Py2 keyword arguments have no order
+    return recordClass(
+        namespace(
+            [
+                ("code", ""),
+                ("date", ""),
+                ("owner", namespace([("name", ""), ("vat", "")])),
+                ("lines", [namespace([("concept", ""), ("amount", 0)])]),
+            ]
+        ),
+        "Invoice",
+    )
+
+
+class RecordClass_Test(unittest.TestCase):
+
+    def test_fields(self):
+        Invoice = invoiceClass()
+        self.assertEqual(Invoice.__name__, "Invoice")
+        self.assertEqual(Invoice._fields, ("code", "date", "owner", "lines"))
+        self.assertTrue(issubclass(Invoice, record))
+        self.assertEqual(Invoice._nested["owner"].__name__, "InvoiceOwner")
+        self.assertEqual(Invoice._nested["lines"].__name__, "InvoiceLines")
+
+    def test_slotted(self):
+        invoice = invoiceClass()(code="A")
+        self.assertFalse(hasattr(invoice, "__dict__"))
+
+    def test_fromTemplateVars(self):
+        Letter = recordClass(
+            namespace.fromTemplateVars("Dear {person.name}, {amount}"), "Letter"
+        )
+        letter = Letter(amount=3, person=dict(name="Someone"))
+        self.assertEqual(letter.person.name, "Someone")
+
+    def test_invalidField(self):
+        for field in ["1a", "a.b", "_a", "class", 3]:
+            with self.assertRaises(ValueError) as ctx:
+                recordClass({field: 1})
+            self.assertEqual(
+                format(ctx.exception), "Invalid record field name {!r}".format(field)
+            )
+
+    def test_fieldClashingWithMethod(self):
+        with self.assertRaises(ValueError) as ctx:
+            recordClass(namespace(items=[]))
+        self.assertEqual(
+            format(ctx.exception), "Record field 'items' clashes with a method"
+        )
+
+
+class Record_Test(unittest.TestCase):
+
+    def setUp(self):
+        self.Invoice = invoiceClass()
+
+    def sample(self):
+        return self.Invoice(
+            code="F001",
+            owner=dict(name="Someone"),
+            lines=[dict(concept="energy", amount=decimal.Decimal("1.5"))],
+        )
+
+    def test_attributeAccess(self):
+        invoice = self.sample()
+        self.assertEqual(invoice.code, "F001")
+        self.assertEqual(invoice.owner.name, "Someone")
+        self.assertEqual(invoice.lines[0].concept, "energy")
+
+    def test_nestedConverted(self):
+        invoice = self.sample()
+        self.assertEqual(type(invoice.owner).__name__, "InvoiceOwner")
+        self.assertEqual(type(invoice.lines[0]).__name__, "InvoiceLines")
+        invoice.owner = namespace(vat="ES1")
+        self.assertEqual(type(invoice.owner).__name__, "InvoiceOwner")
+
+    def test_unsetField_missing(self):
+        invoice = self.sample()
+        with self.assertRaises(AttributeError):
+            invoice.date
+        with self.assertRaises(KeyError):
+            invoice["date"]
+        self.assertNotIn("date", invoice)
+        self.assertEqual(invoice.get("date", 3), 3)
+        self.assertEqual(invoice.keys(), ["code", "owner", "lines"])
+
+    def test_unknownField(self):
+        invoice = self.sample()
+        with self.assertRaises(AttributeError):
+            invoice.unknown = 1
+        with self.assertRaises(KeyError):
+            invoice["unknown"] = 1
+        with self.assertRaises(KeyError):
+            invoice["unknown"]
+
+    def test_dottedPaths(self):
+        invoice = self.sample()
+        self.assertEqual(invoice["owner.name"], "Someone")
+        self.assertEqual(invoice["lines.0.concept"], "energy")
+        invoice["owner.vat"] = "ES1"
+        self.assertEqual(invoice.owner.vat, "ES1")
+        del invoice["owner.vat"]
+        self.assertNotIn("vat", invoice.owner)
+
+    def test_dottedPaths_createsNested(self):
+        invoice = self.Invoice()
+        invoice["owner.name"] = "Someone"
+        self.assertEqual(type(invoice.owner).__name__, "InvoiceOwner")
+
+    def test_delete(self):
+        invoice = self.sample()
+        del invoice["code"]
+        self.assertNotIn("code", invoice)
+        with self.assertRaises(KeyError):
+            del invoice["code"]
+
+    def test_equality(self):
+        self.assertEqual(
+            self.sample(),
+            namespace(
+                code="F001",
+                owner=namespace(name="Someone"),
+                lines=[namespace(concept="energy", amount=decimal.Decimal("1.5"))],
+            ),
+        )
+        self.assertEqual(self.sample(), self.sample())
+        other = self.sample()
+        other.owner.name = "Other"
+        self.assertNotEqual(self.sample(), other)
+
+    def test_dump_sameAsNamespace(self):
+        self.assertEqual(self.sample().dump(), self.sample().asNamespace().dump())
+        self.assertEqual(
+            namespace(invoice=self.sample()).dump(),
+            namespace(invoice=self.sample().asNamespace()).dump(),
+        )
+
+    def test_asNamespace(self):
+        result = self.sample().asNamespace()
+        self.assertEqual(type(result), namespace)
+        self.assertEqual(type(result.lines[0]), namespace)
+
+    def test_deepcopy(self):
+        invoice = self.sample()
+        result = copy.deepcopy(invoice)
+        self.assertEqual(result, invoice)
+        result.owner.name = "Other"
+        self.assertEqual(invoice.owner.name, "Someone")
+
+    def test_repr(self):
+        self.assertEqual(repr(self.Invoice(code="A")), "Invoice({'code': 'A'})")
+
+
+class RecordLoad_Test(unittest.TestCase):
+
+    def setUp(self):
+        self.Invoice = invoiceClass()
+
+    def test_loads(self):
+        invoice = self.Invoice.loads(
+            "code: F001\n"
+            "date: 2020-01-02\n"
+            "owner:\n"
+            "  name: Someone\n"
+            "lines:\n"
+            "- concept: energy\n"
+            "  amount: 1.5\n"
+        )
+        self.assertEqual(type(invoice), self.Invoice)
+        self.assertEqual(invoice.date, Date("2020-01-02"))
+        self.assertEqual(type(invoice.owner).__name__, "InvoiceOwner")
+        self.assertEqual(type(invoice.lines[0]).__name__, "InvoiceLines")
+        self.assertEqual(invoice.lines[0].amount, decimal.Decimal("1.5"))
+
+    def test_loads_list(self):
+        invoices = self.Invoice.loads("- code: A\n- code: B\n")
+        self.assertEqual([i.code for i in invoices], ["A", "B"])
+        self.assertEqual(type(invoices[0]), self.Invoice)
+
+    def test_loads_roundTrip(self):
+        invoice = self.Invoice(code="A", owner=dict(vat="ES1"), lines=[dict(amount=1)])
+        self.assertEqual(self.Invoice.loads(invoice.dump()), invoice)
+
+    def test_loads_unknownField(self):
+        with self.assertRaises(yaml.constructor.ConstructorError) as ctx:
+            self.Invoice.loads("code: A\nbad: 1\n")
+        self.assertIn("found unknown field 'bad'", format(ctx.exception))
+
+    def test_loads_notMapping(self):
+        with self.assertRaises(yaml.constructor.ConstructorError) as ctx:
+            self.Invoice.loads("3")
+        self.assertIn("expected a mapping for Invoice", format(ctx.exception))
+
+    def test_loads_mergeKeys(self):
+        invoices = self.Invoice.loads(
+            "- &base\n  code: A\n  date: 2020-01-01\n- <<: *base\n  code: B\n"
+        )
+        self.assertEqual(invoices[1].code, "B")
+        self.assertEqual(invoices[1].date, Date("2020-01-01"))
+
+    def test_load_path(self):
+        import tempfile, os
+
+        handle, filename = tempfile.mkstemp(suffix=".yaml")
+        os.close(handle)
+        try:
+            self.Invoice(code="A").dump(filename)
+            self.assertEqual(self.Invoice.load(filename).code, "A")
+        finally:
+            os.unlink(filename)
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: sw=4 ts=4 noet
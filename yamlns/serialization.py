@@ -1,8 +1,11 @@
+import io
 import decimal
 import datetime
-from .core import namespace
+import threading
+from .core import namespace, _base
 from .dateutils import Date
-from .compat import text
+from .decimals import parseDecimal, parseFloat, LazyDecimal
+from .compat import text, py2
 
 try:
     import numpy as np
@@ -16,21 +19,11 @@ try:
 except ImportError:
     from yaml import SafeLoader, SafeDumper
 
+# Tag of numpy arrays dumped with their dtype and shape
+ndarrayTag = u"!ndarray"
 
-class NamespaceYamlDumper(SafeDumper):
-
-    def __init__(self, *args, **kwargs):
-        super(NamespaceYamlDumper, self).__init__(*args, **kwargs)
-        self.add_representer(namespace, NamespaceYamlDumper.represent_dict)
-        self.add_representer(decimal.Decimal, NamespaceYamlDumper.represent_float)
-        self.add_representer(Date, NamespaceYamlDumper.represent_date)
-        if np:
-            self.add_representer(np.ndarray, NamespaceYamlDumper.represent_np)
-
-        self.add_representer(type(u""), NamespaceYamlDumper.represent_str)
-        if type(u"") != type(""):  # Py2 compat
-            self.add_representer(type(""), NamespaceYamlDumper.represent_str)
 
+class NamespaceYamlDumper(SafeDumper):
     def represent_str(self, data):
         if "\n" in data:  # check for multiline string
             return self.represent_scalar("tag:yaml.org,2002:str", data, style="|")
@@ -51,10 +44,84 @@ class NamespaceYamlDumper(SafeDumper):
 
         return self.represent_scalar("tag:yaml.org,2002:float", value)
 
+    def represent_lazy_decimal(self, data):
+        return self.represent_scalar("tag:yaml.org,2002:float", data.literal)
+
+    # How numpy arrays are dumped: 'plain', 'tagged' or 'base64'
+    arrays = "plain"
+
+    _floatSpecials = {u"nan": u".nan", u"inf": u".inf", u"-inf": u"-.inf"}
+
+    def _floatText(self, value):
+        "YAML literal from the shortest text numpy gives for a float item"
+        if u"e" in value and u"." not in value:  # YAML 1.1 needs the dot
+            return value.replace(u"e", u".0e", 1)
+        return self._floatSpecials.get(value, value)
+
+    def _arrayNode(self, data):
+        "Nested flow sequences with the array items, built in a single pass"
+        kind = data.dtype.kind
+        if kind == "f":
+            tag = u"tag:yaml.org,2002:float"
+            texts = [
+                self._floatText(value) for value in data.astype(u"U").ravel().tolist()
+            ]
+        elif kind == "b":
+            tag = u"tag:yaml.org,2002:bool"
+            texts = [u"true" if value else u"false" for value in data.ravel().tolist()]
+        else:
+            tag = u"tag:yaml.org,2002:int"
+            texts = [text(value) for value in data.ravel().tolist()]
+        nodes = [yaml.nodes.ScalarNode(tag, value) for value in texts]
+        return self._nestedNode(nodes, data.shape)
+
+    def _nestedNode(self, nodes, shape):
+        if not shape:
+            return nodes[0]
+        if len(shape) > 1:
+            step = len(nodes) // shape[0] if shape[0] else 0
+            nodes = [
+                self._nestedNode(nodes[i * step : (i + 1) * step], shape[1:])
+                for i in range(shape[0])
+            ]
+        return yaml.nodes.SequenceNode(u"tag:yaml.org,2002:seq", nodes, flow_style=True)
+
     def represent_np(self, data):
-        return self.represent_sequence(
-            "tag:yaml.org,2002:seq", [float(x) for x in data]
-        )
+        if data.dtype.kind not in "biuf":  # Not numeric, item by item
+            return self.represent_sequence(u"tag:yaml.org,2002:seq", data.tolist())
+        if self.arrays == "base64":
+            content = self.represent_binary(np.ascontiguousarray(data).tobytes())
+            dtype = data.dtype.str
+        else:
+            content = self._arrayNode(data)
+            dtype = data.dtype.name if data.dtype.isnative else data.dtype.str
+        if self.arrays == "plain":
+            node = content
+        else:
+            shape = [
+                yaml.nodes.ScalarNode(u"tag:yaml.org,2002:int", text(size))
+                for size in data.shape
+            ]
+            node = yaml.nodes.MappingNode(
+                ndarrayTag,
+                [
+                    (self._str(u"dtype"), self._str(text(dtype))),
+                    (
+                        self._str(u"shape"),
+                        yaml.nodes.SequenceNode(
+                            u"tag:yaml.org,2002:seq", shape, flow_style=True
+                        ),
+                    ),
+                    (self._str(u"data"), content),
+                ],
+                flow_style=False,
+            )
+        if self.alias_key is not None:
+            self.represented_objects[self.alias_key] = node
+        return node
+
+    def _str(self, value):
+        return yaml.nodes.ScalarNode(u"tag:yaml.org,2002:str", value)
 
     # Kludge: This is a rewritten version of yaml.representer.Representer.represent_mapping
     # to avoid sorting pairs by key
@@ -91,34 +158,51 @@ class NamespaceYamlDumper(SafeDumper):
 
 class NamespaceYAMLLoader(SafeLoader):
 
-    def __init__(self, *args, **kwargs):
-        super(NamespaceYAMLLoader, self).__init__(*args, **kwargs)
-        self.add_constructor("tag:yaml.org,2002:map", type(self).construct_yaml_map)
-        self.add_constructor("tag:yaml.org,2002:omap", type(self).construct_yaml_map)
-        self.add_constructor("tag:yaml.org,2002:float", type(self).construct_decimal)
-        self.add_constructor(
-            "tag:yaml.org,2002:timestamp", type(self).construct_yaml_timestamp
-        )
+    # Builds the value of YAML float literals
+    floatParser = staticmethod(parseDecimal)
 
     def construct_decimal(self, node):
-        value = self.construct_scalar(node)
-        value = value.replace("_", "").lower()
-        sign = +1
-        if value[0] == "-":
-            sign = -1
-        if value[0] in "+-":
-            value = value[1:]
-        if value == ".inf":
-            return sign * decimal.Decimal("Infinity")
-        if value == ".nan":
-            return decimal.Decimal("NaN")
-        return sign * decimal.Decimal(value)
+        return self.floatParser(self.construct_scalar(node))
+
+    def construct_ndarray(self, node):
+        """
+        Rebuilds a numpy array dumped with its dtype and shape,
+        parsing the items straight from the nodes.
+        """
+        if np is None:
+            raise yaml.constructor.ConstructorError(
+                None, None, "numpy is required to load arrays", node.start_mark
+            )
+        fields = dict((self.construct_scalar(key), value) for key, value in node.value)
+        dtype = np.dtype(self.construct_scalar(fields["dtype"]))
+        shape = tuple(int(size.value) for size in fields["shape"].value)
+        content = fields["data"]
+        if content.tag == u"tag:yaml.org,2002:binary":
+            buffer = self.construct_yaml_binary(content)
+            return np.frombuffer(buffer, dtype=dtype).reshape(shape).copy()
+        values = []
+        stack = [iter([content])]
+        while stack:
+            for item in stack[-1]:
+                if isinstance(item, yaml.SequenceNode):
+                    stack.append(iter(item.value))
+                    break
+                values.append(item.value)
+            else:
+                stack.pop()
+        if dtype.kind == "b":
+            values = [self.bool_values[value.lower()] for value in values]
+        elif dtype.kind in "iu":
+            values = [int(value.replace("_", "")) for value in values]
+        else:
+            values = [parseFloat(value) for value in values]
+        return np.array(values, dtype=dtype).reshape(shape)
 
     def construct_yaml_map(self, node):
         data = namespace()
         yield data
         value = self.construct_mapping(node)
-        data.update(value)
+        _base.update(data, value)  # Keys are already expanded
 
     def construct_yaml_timestamp(self, node):
         result = super(NamespaceYAMLLoader, self).construct_yaml_timestamp(node)
@@ -156,3 +240,156 @@ class NamespaceYAMLLoader(SafeLoader):
             value = self.construct_object(value_node, deep=deep)
             mapping[key] = value
         return mapping
+
+
+def streamEncoding(stream):
+    """
+    Encoding for a dumper writing into the stream.
+    Like yaml.dump, Py2 writes utf-8 unless the stream takes text.
+    """
+    if py2 and not isinstance(stream, io.TextIOBase):
+        return "utf-8"
+    return None
+
+
+def dumpStream(data, stream, arrays="plain"):
+    """
+    Dumps data into the stream, like yaml.dump with
+    the yamlns options but without its generic setup.
+    """
+    Dumper = arraysDumper(NamespaceYamlDumper, arrays)
+    dumper = Dumper(
+        stream,
+        default_flow_style=False,
+        allow_unicode=True,
+        encoding=streamEncoding(stream),
+    )
+    try:
+        dumper.open()
+        dumper.represent(data)
+        dumper.close()
+    finally:
+        dumper.dispose()
+
+
+class DumpContext(threading.local):
+    """
+    Per thread state reused by dumps to text:
+    the output buffer, emptied between documents.
+    Big buffers are not kept, to release their memory.
+
+    The dumper is not reused: the C emitter is bound
+    to its stream and cannot be reopened once closed.
+    """
+
+    maxBuffer = 1 << 16
+
+    def __init__(self):
+        self.buffer = None
+
+    def dumps(self, data, dump=dumpStream, **options):
+        "Returns as text what dump(data, stream, **options) writes"
+        # Taken while in use, so that reentrant dumps get their own
+        buffer, self.buffer = self.buffer or io.StringIO(), None
+        try:
+            dump(data, buffer, **options)
+            return buffer.getvalue()
+        finally:
+            if buffer.tell() <= self.maxBuffer:
+                buffer.seek(0)
+                buffer.truncate()
+                self.buffer = buffer
+
+
+dumpContext = DumpContext()
+
+
+# Registered once for the classes, not on every instantiation,
+# as add_representer and add_constructor copy the class registry.
+# Subclasses inherit the registry when they register their own.
+
+NamespaceYamlDumper.add_representer(namespace, NamespaceYamlDumper.represent_dict)
+NamespaceYamlDumper.add_multi_representer(namespace, NamespaceYamlDumper.represent_dict)
+NamespaceYamlDumper.add_multi_representer(list, NamespaceYamlDumper.represent_list)
+NamespaceYamlDumper.add_representer(
+    decimal.Decimal, NamespaceYamlDumper.represent_float
+)
+NamespaceYamlDumper.add_representer(Date, NamespaceYamlDumper.represent_date)
+NamespaceYamlDumper.add_representer(
+    LazyDecimal, NamespaceYamlDumper.represent_lazy_decimal
+)
+if np:
+    NamespaceYamlDumper.add_representer(np.ndarray, NamespaceYamlDumper.represent_np)
+NamespaceYamlDumper.add_representer(type(u""), NamespaceYamlDumper.represent_str)
+if type(u"") != type(""):  # Py2 compat
+    NamespaceYamlDumper.add_representer(type(""), NamespaceYamlDumper.represent_str)
+
+NamespaceYAMLLoader.add_constructor(
+    "tag:yaml.org,2002:map", NamespaceYAMLLoader.construct_yaml_map
+)
+NamespaceYAMLLoader.add_constructor(
+    "tag:yaml.org,2002:omap", NamespaceYAMLLoader.construct_yaml_map
+)
+NamespaceYAMLLoader.add_constructor(
+    "tag:yaml.org,2002:float", NamespaceYAMLLoader.construct_decimal
+)
+NamespaceYAMLLoader.add_constructor(
+    "tag:yaml.org,2002:timestamp", NamespaceYAMLLoader.construct_yaml_timestamp
+)
+NamespaceYAMLLoader.add_constructor(ndarrayTag, NamespaceYAMLLoader.construct_ndarray)
+
+
+_floatParsers = dict(
+    float=parseFloat,
+    lazy=LazyDecimal,
+)
+_floatLoaders = {}
+
+
+def floatsLoader(Loader, floats):
+    """
+    Returns a subclass of the Loader that constructs YAML floats
+    as Decimal ('decimal', the Loader's own behaviour),
+    as float ('float') or as LazyDecimal ('lazy').
+    """
+    if floats == "decimal":
+        return Loader
+    key = Loader, floats
+    try:
+        return _floatLoaders[key]
+    except KeyError:
+        pass
+    subclass = type(
+        str(Loader.__name__ + floats.title()),
+        (Loader,),
+        dict(floatParser=staticmethod(_floatParsers[floats])),
+    )
+    return _floatLoaders.setdefault(key, subclass)
+
+
+_arraysDumpers = {}
+
+
+def arraysDumper(Dumper, arrays):
+    """
+    Returns a subclass of the Dumper that dumps numpy arrays
+    as flow sequences ('plain', the Dumper's own behaviour),
+    as ndarrayTag mappings with dtype, shape and the items ('tagged')
+    or with the raw buffer in base64 ('base64').
+    """
+    if arrays == "plain":
+        return Dumper
+    key = Dumper, arrays
+    try:
+        return _arraysDumpers[key]
+    except KeyError:
+        pass
+    subclass = type(
+        str(Dumper.__name__ + arrays.title()),
+        (Dumper,),
+        dict(arrays=arrays),
+    )
+    return _arraysDumpers.setdefault(key, subclass)
+
+
+# vim: sw=4 ts=4 noet
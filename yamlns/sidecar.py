@@ -0,0 +1,234 @@
+"""
+Binary sidecar caches of big YAML files, in the spirit of `.pyc` files.
+
+Loading a YAML file with `sidecar=True` writes the loaded document,
+pickled, into a `.yamlc` file next to the source,
+or into a cache directory if `sidecar` is its path.
+Later loads read the sidecar instead of parsing the YAML,
+while it matches the source size and modification time
+(or its content hash, if just the time changed),
+the yamlns version and the sidecar format version.
+Stale, corrupt or unreadable sidecars are ignored and rewritten.
+
+>>> import os, tempfile
+>>> from yamlns import ns
+>>> folder = tempfile.mkdtemp()
+>>> source = os.path.join(folder, 'tariffs.yaml')
+>>> ns(price=ns(p1=1.5)).dump(source)
+>>> ns.load(source, sidecar=True)
+namespace({'price': namespace({'p1': Decimal('1.5')})})
+>>> os.path.exists(os.path.join(folder, 'tariffs.yamlc'))
+True
+>>> ns.load(source, sidecar=True)
+namespace({'price': namespace({'p1': Decimal('1.5')})})
+"""
+
+import hashlib
+import io
+import os
+import pickle
+import struct
+from .compat import text, py2
+
+_magic = b"YNSC"
+_formatVersion = 1
+# magic, format, flags, source size, source mtime_ns, sha256, version length
+_header = struct.Struct("<4sHHQq32sH")
+
+_COLUMNAR = 1
+_floatFlags = dict(decimal=0, float=2, lazy=4)
+
+_replace = getattr(os, "replace", os.rename)  # Py2
+
+if py2:
+    # Py2 PyYAML timezones pickle as tzinfo, without their offset
+    import copy_reg
+    from yaml.constructor import timezone as _yamlTimezone
+
+    copy_reg.pickle(_yamlTimezone, lambda tz: (_yamlTimezone, (tz.utcoffset(),)))
+
+
+def _yamlnsVersion():
+    try:
+        from importlib.metadata import version
+    except ImportError:  # Py2 and Py<3.8
+        try:
+            from pkg_resources import get_distribution
+        except ImportError:
+            return u"unknown"
+        version = lambda name: get_distribution(name).version
+    try:
+        return text(version("yamlns"))
+    except Exception:  # Not installed
+        return u"unknown"
+
+
+yamlnsVersion = _yamlnsVersion().encode("utf8")
+
+
+# Globals a sidecar may refer to, as module and name
+allowedGlobals = set(
+    [
+        ("yamlns.core", "namespace"),
+        ("yamlns.core", "orderednamespace"),
+        ("yamlns.columnar", "columnarlist"),
+        ("yamlns.dateutils", "Date"),
+        ("yamlns.decimals", "LazyDecimal"),
+        ("decimal", "Decimal"),
+        ("datetime", "date"),
+        ("datetime", "datetime"),
+        ("datetime", "time"),
+        ("datetime", "timedelta"),
+        ("datetime", "timezone"),
+        ("collections", "OrderedDict"),
+        ("builtins", "set"),
+        ("builtins", "frozenset"),
+        ("__builtin__", "set"),  # Py2
+        ("__builtin__", "frozenset"),  # Py2
+        ("yaml.constructor", "timezone"),  # Py2 PyYAML
+    ]
+    + [
+        (module, name)
+        for module in ("numpy.core.multiarray", "numpy._core.multiarray")
+        for name in ("_reconstruct", "scalar")
+    ]
+    + [
+        (module, "_frombuffer")
+        for module in ("numpy.core.numeric", "numpy._core.numeric")
+    ]
+    + [("numpy", "ndarray"), ("numpy", "dtype")]
+)
+
+
+class _Unpickler(pickle.Unpickler):
+    "Unpickler restricted to the types a YAML document loads into"
+
+    def find_class(self, module, name):
+        if (module, name) not in allowedGlobals:
+            raise pickle.UnpicklingError(
+                "Global not allowed in a sidecar: {}.{}".format(module, name)
+            )
+        return pickle.Unpickler.find_class(self, module, name)
+
+
+def sidecarPath(source, cacheDir=None):
+    """
+    Returns the path of the sidecar for the source path:
+    the source with the extension ending in 'c', or,
+    with a cacheDir, a file there named after the resolved source.
+    """
+    source = str(source)
+    base, extension = os.path.splitext(source)
+    if cacheDir is None:
+        return base + (extension or ".yaml") + "c"
+    resolved = os.path.realpath(source).encode("utf8")
+    return os.path.join(
+        str(cacheDir),
+        "{}-{}{}c".format(
+            os.path.basename(base),
+            hashlib.sha256(resolved).hexdigest()[:16],
+            extension or ".yaml",
+        ),
+    )
+
+
+def _mtime(stat):
+    mtime = getattr(stat, "st_mtime_ns", None)
+    if mtime is None:  # Py2
+        mtime = int(stat.st_mtime * 1e9)
+    return mtime
+
+
+def _readHeader(f):
+    "Returns the header fields of the open sidecar, or None if not valid"
+    fields = f.read(_header.size)
+    if len(fields) != _header.size:
+        return None
+    magic, formatVersion, flags, size, mtime, digest, versionLength = _header.unpack(
+        fields
+    )
+    if magic != _magic or formatVersion != _formatVersion:
+        return None
+    if f.read(versionLength) != yamlnsVersion:
+        return None
+    return flags, size, mtime, digest
+
+
+def _packHeader(flags, size, mtime, digest):
+    return _header.pack(
+        _magic, _formatVersion, flags, size, mtime, digest, len(yamlnsVersion)
+    )
+
+
+def _write(path, data, flags, mtime, content):
+    "Writes the sidecar atomically, ignoring failures as .pyc do"
+    temporary = "{}.{}.tmp".format(path, os.getpid())
+    try:
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        with io.open(temporary, "wb") as f:
+            digest = hashlib.sha256(content).digest()
+            f.write(_packHeader(flags, len(content), mtime, digest))
+            f.write(yamlnsVersion)
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        _replace(temporary, path)
+    except Exception:
+        try:
+            os.unlink(temporary)
+        except OSError:
+            pass
+
+
+def _retime(path, header, mtime):
+    "Updates the source time in the header, so the hash is not checked again"
+    flags, size, _, digest = header
+    try:
+        with io.open(path, "r+b") as f:
+            f.write(_packHeader(flags, size, mtime, digest))
+    except Exception:
+        pass
+
+
+def loadWithSidecar(
+    cls, source, cacheDir=None, columnar=False, engine="nodes", floats="decimal"
+):
+    """
+    Returns what cls.load(source, **options) would return,
+    reading it from the sidecar if it is valid,
+    or loading the YAML and writing the sidecar otherwise.
+    """
+    if hasattr(source, "read"):
+        raise ValueError("Only files given by path can have a sidecar")
+    source = str(source)
+    path = sidecarPath(source, cacheDir)
+    flags = (_COLUMNAR if columnar else 0) | _floatFlags[floats]
+    stat = os.stat(source)
+    content = None
+    try:
+        with io.open(path, "rb") as f:
+            header = _readHeader(f)
+            if header is not None and header[:2] == (flags, stat.st_size):
+                if header[2] == _mtime(stat):
+                    return _Unpickler(f).load()
+                # Touched or copied sources may keep the content
+                with io.open(source, "rb") as s:
+                    content = s.read()
+                if hashlib.sha256(content).digest() == header[3]:
+                    result = _Unpickler(f).load()
+                    _retime(path, header, _mtime(stat))
+                    return result
+    except Exception:  # Missing, stale, corrupt or not readable
+        pass
+
+    if content is None:
+        with io.open(source, "rb") as s:
+            content = s.read()
+    result = cls.loads(content, columnar=columnar, engine=engine, floats=floats)
+    # The time before reading: if the source changes meanwhile,
+    # the next load checks the hash of the content loaded now
+    _write(path, result, flags, _mtime(stat), content)
+    return result
+
+
+# vim: sw=4 ts=4 noet
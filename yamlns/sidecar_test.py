@@ -0,0 +1,221 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+import datetime
+import io
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from decimal import Decimal
+from .core import namespace
+from .dateutils import Date
+from .columnar import columnarlist
+from .sidecar import sidecarPath, loadWithSidecar, _header
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+yamlContent = u"""\
+name: caña
+kwh: 1.50
+day: 2024-01-31
+time: 2024-01-31 10:00:00+02:00
+zeta: 1
+alpha: 2
+records:
+- id: 1
+- id: 2
+tags: !!set {a: null}
+"""
+
+
+class Sidecar_Test(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        # Whole seconds, which float times keep exactly
+        self.source = self.write(yamlContent, mtime=1000)
+        self.sidecar = os.path.join(self.dir, "data.yamlc")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, content, mtime=None):
+        filename = os.path.join(self.dir, "data.yaml")
+        with io.open(filename, "w", encoding="utf8") as f:
+            f.write(content)
+        if mtime is not None:
+            os.utime(filename, (mtime, mtime))
+        return filename
+
+    def load(self, **options):
+        return namespace.load(self.source, sidecar=True, **options)
+
+    def assertFromSidecar(self, fromSidecar=True):
+        "Checks whether the next load reads the sidecar, by poisoning the source"
+        with io.open(self.source, encoding="utf8") as f:
+            content = f.read()
+        stat = os.stat(self.source)
+        self.write(content.replace(u"name:", u"nam@:"))
+        os.utime(self.source, (stat.st_atime, stat.st_mtime))
+        self.assertEqual(self.load().get("name") is not None, fromSidecar)
+
+    def test_sidecarPath(self):
+        self.assertEqual(sidecarPath("a/b.yaml"), "a/b.yamlc")
+        self.assertEqual(sidecarPath("a/b.yml"), "a/b.ymlc")
+        self.assertEqual(sidecarPath("a/b"), "a/b.yamlc")
+
+    def test_sidecarPath_cacheDir(self):
+        path = sidecarPath("a/b.yaml", "cache")
+        self.assertTrue(path.startswith(os.path.join("cache", "b-")))
+        self.assertTrue(path.endswith(".yamlc"))
+        self.assertNotEqual(path, sidecarPath("c/b.yaml", "cache"))
+
+    def test_first_writesSidecar(self):
+        result = self.load()
+        self.assertEqual(result, namespace.load(self.source))
+        self.assertTrue(os.path.exists(self.sidecar))
+
+    def test_second_readsSidecar(self):
+        self.load()
+        self.assertFromSidecar()
+
+    def test_keepsTypesAndOrder(self):
+        self.load()
+        result = self.load()
+        expected = namespace.load(self.source)
+        self.assertEqual(repr(result), repr(expected))
+        self.assertEqual(list(result), list(expected))
+        self.assertIs(type(result.kwh), Decimal)
+        self.assertEqual(str(result.kwh), "1.50")
+        self.assertIs(type(result.day), Date)
+        self.assertEqual(result.time.utcoffset(), datetime.timedelta(hours=2))
+        self.assertIs(type(result.records[0]), namespace)
+
+    def test_columnar(self):
+        self.load()
+        result = self.load(columnar=True)
+        self.assertIsInstance(result.records, columnarlist)
+        result = self.load(columnar=True)
+        self.assertIsInstance(result.records, columnarlist)
+        self.assertIsInstance(self.load().records, list)
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_numpy(self):
+        from .sidecar import _Unpickler
+
+        data = namespace(a=numpy.array([[1.5, 2]]), b=numpy.float32(1.5))
+        result = _Unpickler(
+            io.BytesIO(pickle.dumps(data, pickle.HIGHEST_PROTOCOL))
+        ).load()
+        self.assertEqual(result.a.tolist(), [[1.5, 2]])
+        self.assertEqual(result.b.dtype, numpy.float32)
+
+    def test_modified_reloads(self):
+        self.write(u"a: 1\n", mtime=1000)
+        self.load()
+        self.write(u"a: 2\n", mtime=2000)
+        self.assertEqual(self.load(), namespace(a=2))
+        self.assertEqual(self.load(), namespace(a=2))
+
+    def test_sameSizeAndTime_trustsSidecar(self):
+        self.write(u"a: 1\n", mtime=1000)
+        self.load()
+        self.write(u"a: 2\n", mtime=1000)
+        self.assertEqual(self.load(), namespace(a=1))
+
+    def test_touched_checksHash(self):
+        self.write(yamlContent, mtime=1000)
+        self.load()
+        inode = os.stat(self.sidecar).st_ino
+        os.utime(self.source, (2000, 2000))
+        self.assertEqual(self.load(), namespace.load(self.source))
+        self.assertEqual(os.stat(self.sidecar).st_ino, inode)  # Not rewritten
+
+    def test_touched_retimesHeader(self):
+        self.write(yamlContent, mtime=1000)
+        self.load()
+        os.utime(self.source, (2000, 2000))
+        self.load()
+        with io.open(self.sidecar, "rb") as f:
+            mtime = _header.unpack(f.read(_header.size))[4]
+        self.assertEqual(mtime, 2000 * 10**9)
+
+    def test_corrupt_reloads(self):
+        self.load()
+        with io.open(self.sidecar, "r+b") as f:
+            f.seek(_header.size + 20)
+            f.write(b"garbage")
+        self.assertEqual(self.load(), namespace.load(self.source))
+        self.assertFromSidecar()
+
+    def test_truncated_reloads(self):
+        self.load()
+        with io.open(self.sidecar, "wb") as f:
+            f.write(b"YNSC")
+        self.assertEqual(self.load(), namespace.load(self.source))
+
+    def test_otherVersion_reloads(self):
+        from . import sidecar
+
+        self.load()
+        version = sidecar.yamlnsVersion
+        sidecar.yamlnsVersion = b"0.0.0"
+        try:
+            self.assertFromSidecar(False)
+        finally:
+            sidecar.yamlnsVersion = version
+
+    def test_forbiddenGlobals_reloads(self):
+        self.load()
+        with io.open(self.sidecar, "rb") as f:
+            fields = f.read(_header.size)
+            header = fields + f.read(_header.unpack(fields)[-1])
+        with io.open(self.sidecar, "wb") as f:
+            f.write(header)
+            pickle.dump(namespace(a=os.getcwd), f)
+        self.assertEqual(self.load(), namespace.load(self.source))
+
+    def test_cacheDir(self):
+        cacheDir = os.path.join(self.dir, "cache")
+        namespace.load(self.source, sidecar=cacheDir)
+        self.assertFalse(os.path.exists(self.sidecar))
+        self.assertEqual(len(os.listdir(cacheDir)), 1)
+        self.assertEqual(
+            namespace.load(self.source, sidecar=cacheDir), namespace.load(self.source)
+        )
+
+    def test_unwritable_stillLoads(self):
+        result = namespace.load(
+            self.source, sidecar=os.path.join(self.source, "notadir")
+        )
+        self.assertEqual(result, namespace.load(self.source))
+
+    def test_openFile_fails(self):
+        with io.open(self.source, encoding="utf8") as f:
+            with self.assertRaises(ValueError) as ctx:
+                namespace.load(f, sidecar=True)
+        self.assertEqual(
+            format(ctx.exception), "Only files given by path can have a sidecar"
+        )
+
+    def test_lazy_fails(self):
+        with self.assertRaises(ValueError) as ctx:
+            namespace.load(self.source, sidecar=True, lazy=True)
+        self.assertEqual(format(ctx.exception), "Lazy loads cannot use a sidecar")
+
+    def test_loadWithSidecar(self):
+        self.assertEqual(
+            loadWithSidecar(namespace, self.source), namespace.load(self.source)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: sw=4 ts=4 noet
@@ -0,0 +1,284 @@
+"""
+Streams of many YAML documents, processed one at a time.
+
+>>> from yamlns import ns
+>>> content = ns.dump_all(ns(id=i, kwh=i * 1.5) for i in range(2))
+>>> print(content, end='')
+id: 0
+kwh: 0.0
+---
+id: 1
+kwh: 1.5
+>>> import io
+>>> [record.kwh for record in ns.load_all(io.StringIO(content))]
+[Decimal('0.0'), Decimal('1.5')]
+
+Items of a huge list inside a single document can be iterated too:
+
+>>> export = ns.iterload(io.StringIO(
+...     'source: meters\\nitems:\\n- id: 1\\n- id: 2\\n'), 'items')
+>>> export.header
+namespace({'source': 'meters'})
+>>> [item.id for item in export]
+[1, 2]
+"""
+
+import yaml
+from yaml.events import (
+    ScalarEvent,
+    AliasEvent,
+    MappingStartEvent,
+    MappingEndEvent,
+    SequenceStartEvent,
+    SequenceEndEvent,
+    StreamEndEvent,
+    CollectionStartEvent,
+    CollectionEndEvent,
+)
+from .core import namespace, _dumpTo, loadEngines, dumpEngines, floatPolicies
+from .core import arrayStyles
+from .compat import Path
+
+
+def _checkEngine(engine, engines, operation):
+    if engine not in engines:
+        raise ValueError("Unknown {} engine {!r}".format(operation, engine))
+
+
+def _loadDocuments(stream, columnar, engine, floats):
+    if engine == "events":
+        from .eventloader import loadAllEvents
+
+        for document in loadAllEvents(stream, columnar=columnar, floats=floats):
+            yield document
+        return
+
+    from .eventloader import _nodeLoader
+
+    loader = _nodeLoader(columnar, floats)(stream)
+    try:
+        while loader.check_data():
+            yield loader.get_data()
+    finally:
+        loader.dispose()
+
+
+def _loadAll(source, columnar, engine, floats):
+    # Already open read file
+    if hasattr(source, "read"):
+        for document in _loadDocuments(source, columnar, engine, floats):
+            yield document
+        return
+
+    with Path(source).open() as f:
+        for document in _loadDocuments(f, columnar, engine, floats):
+            yield document
+
+
+def loadAll(source, columnar=False, engine="nodes", floats="decimal"):
+    """
+    Generates the documents of a '---' separated YAML stream,
+    from a path or an open file.
+    Each document is parsed when it is requested,
+    so memory does not grow with the number of documents.
+    Options are the ones of namespace.load.
+    """
+    _checkEngine(engine, loadEngines, "load")
+    if floats not in floatPolicies:
+        raise ValueError("Unknown floats policy {!r}".format(floats))
+    return _loadAll(source, columnar, engine, floats)
+
+
+def dumpAll(documents, target=None, engine="nodes", arrays="plain"):
+    """
+    Dumps the documents of an iterable as a '---' separated
+    YAML stream into the target: a path, an open file,
+    or None to return it as text.
+    Each document is written as it comes from the iterable.
+    Numpy arrays are dumped as namespace.dump does.
+    """
+    _checkEngine(engine, dumpEngines, "dump")
+    if arrays not in arrayStyles:
+        raise ValueError("Unknown arrays style {!r}".format(arrays))
+
+    def dumpit(stream):
+        from .serialization import NamespaceYamlDumper, arraysDumper, streamEncoding
+
+        encoding = streamEncoding(stream)
+        if engine == "events":
+            from .eventdumper import dumpAllEvents
+
+            result = dumpAllEvents(documents, stream, arrays=arrays)
+            if result is not None and encoding:  # Py2 text, as yaml.dump_all
+                result = result.encode(encoding)
+            return result
+
+        return yaml.dump_all(
+            documents,
+            stream=stream,
+            default_flow_style=False,
+            allow_unicode=True,
+            encoding=encoding,
+            Dumper=arraysDumper(NamespaceYamlDumper, arrays),
+        )
+
+    return _dumpTo(target, dumpit)
+
+
+def _skip(loader, anchors):
+    """
+    Consumes the events of the next node.
+    Anchored nodes in it are built and kept in anchors,
+    as aliases after it may refer to them.
+    """
+    from .eventloader import _value, _Unsupported
+
+    depth = 0
+    while True:
+        event = loader.peek_event()
+        if not isinstance(event, AliasEvent) and getattr(event, "anchor", None):
+            try:
+                _value(loader, anchors)
+            except _Unsupported:
+                raise yaml.constructor.ConstructorError(
+                    None,
+                    None,
+                    "found an anchored tagged collection, not supported",
+                    event.start_mark,
+                )
+        else:
+            loader.get_event()
+            if isinstance(event, CollectionStartEvent):
+                depth += 1
+            elif isinstance(event, CollectionEndEvent):
+                depth -= 1
+        if not depth:
+            return
+
+
+class NamespaceStream(object):
+    """
+    Iterator over the items of the sequence at a dotted path
+    of a single big document, parsing them one at a time,
+    without building the enclosing document.
+
+    Scalar values found before the sequence, in the mappings
+    along the path, are available as the `header` namespace.
+    Collections found before are skipped,
+    as everything after the sequence.
+
+    Path steps match keys by their source text,
+    so `2024` matches the integer key 2024.
+    The columnar and floats options are the ones of namespace.load.
+
+    It keeps the source open until the sequence ends,
+    or it is closed, also as context manager.
+    """
+
+    def __init__(self, source, path="items", columnar=False, floats="decimal"):
+        from .eventloader import _nodeLoader
+
+        if floats not in floatPolicies:
+            raise ValueError("Unknown floats policy {!r}".format(floats))
+        self.path = path
+        self.header = namespace()
+        self._columnar = columnar
+        self._file = None
+        self._anchors = {}
+        if not hasattr(source, "read"):
+            source = self._file = Path(source).open()
+        self._loader = _nodeLoader(False, floats)(source)
+        try:
+            self._seek()
+        except:
+            self.close()
+            raise
+
+    def _seek(self):
+        from .eventloader import _scalar, _value, _merge
+
+        loader = self._loader
+        loader.get_event()  # Stream start
+        if loader.check_event(StreamEndEvent):
+            raise KeyError(self.path)
+        loader.get_event()  # Document start
+        header = self.header
+        steps = self.path.split(".") if self.path else []
+        for position, step in enumerate(steps):
+            if not loader.check_event(MappingStartEvent):
+                raise KeyError(self.path)
+            loader.get_event()
+            while True:
+                if loader.check_event(MappingEndEvent):
+                    raise KeyError(self.path)
+                if loader.check_event(ScalarEvent) and not loader.peek_event().anchor:
+                    event = loader.get_event()
+                    key = _scalar(loader, event, True)
+                    found = key == step or event.value == step
+                else:
+                    key = _value(loader, self._anchors)
+                    found = key == step
+                if found:
+                    break
+                if not loader.check_event(ScalarEvent, AliasEvent):
+                    _skip(loader, self._anchors)
+                    continue
+                value = _value(loader, self._anchors)
+                if key is not _merge and not isinstance(value, (dict, list)):
+                    header[key] = value
+            if position < len(steps) - 1:
+                header[key] = namespace()
+                header = header[key]
+        if not loader.check_event(SequenceStartEvent):
+            raise ValueError("Value at {!r} is not a sequence".format(self.path))
+        loader.get_event()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        from .eventloader import _value, _Unsupported
+
+        loader = self._loader
+        if loader is None:
+            raise StopIteration
+        if loader.check_event(SequenceEndEvent):
+            self.close()
+            raise StopIteration
+        event = loader.peek_event()
+        try:
+            return _value(loader, self._anchors, self._columnar)
+        except _Unsupported:
+            raise yaml.constructor.ConstructorError(
+                "while iterating the items at {!r}".format(self.path),
+                event.start_mark,
+                "found a tagged collection, not supported",
+                None,
+            )
+
+    next = __next__  # Py2
+
+    def close(self):
+        if self._loader is not None:
+            self._loader.dispose()
+            self._loader = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iterload(source, path="items", columnar=False, floats="decimal"):
+    """
+    Returns a NamespaceStream over the items of the sequence
+    at the dotted path of the document in the path or open file.
+    """
+    return NamespaceStream(source, path, columnar=columnar, floats=floats)
+
+
+# vim: sw=4 ts=4 noet
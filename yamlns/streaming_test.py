@@ -0,0 +1,269 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+import io
+import os
+import tempfile
+import types
+import unittest
+import yaml
+from decimal import Decimal
+from .core import namespace
+from .dateutils import Date
+from .columnar import columnarlist
+from .streaming import NamespaceStream
+
+yamlStream = u"""\
+id: 1
+kwh: 1.50
+day: 2024-01-01
+---
+id: 2
+kwh: 2.25
+day: 2024-01-02
+"""
+
+
+class LoadAll_Test(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.filename = tempfile.mkstemp(suffix=".yaml")
+        os.close(handle)
+
+    def tearDown(self):
+        os.unlink(self.filename)
+
+    def test_generator(self):
+        documents = namespace.load_all(io.StringIO(yamlStream))
+        self.assertIsInstance(documents, types.GeneratorType)
+        self.assertEqual(
+            list(documents),
+            [
+                namespace(
+                    [("id", 1), ("kwh", Decimal("1.50")), ("day", Date(2024, 1, 1))]
+                ),
+                namespace(
+                    [("id", 2), ("kwh", Decimal("2.25")), ("day", Date(2024, 1, 2))]
+                ),
+            ],
+        )
+
+    def test_types(self):
+        for engine in ("nodes", "events"):
+            document = next(namespace.load_all(io.StringIO(yamlStream), engine=engine))
+            self.assertIs(type(document), namespace)
+            self.assertIs(type(document.kwh), Decimal)
+            self.assertIs(type(document.day), Date)
+
+    def test_lazy_parsesOnDemand(self):
+        for engine in ("nodes", "events"):
+            documents = namespace.load_all(
+                io.StringIO(u"a: 1\n---\na: [\n"), engine=engine
+            )
+            self.assertEqual(next(documents), namespace(a=1))
+            with self.assertRaises(yaml.YAMLError):
+                next(documents)
+
+    def test_path(self):
+        with io.open(self.filename, "w", encoding="utf8") as f:
+            f.write(yamlStream)
+        self.assertEqual([d.id for d in namespace.load_all(self.filename)], [1, 2])
+
+    def test_empty(self):
+        self.assertEqual(list(namespace.load_all(io.StringIO(u""))), [])
+
+    def test_events_sameAsNodes(self):
+        content = u"a: &x {b: 1}\nc: *x\n---\n- 1\n--- text\n---\n<<: {z: 1}\n"
+        self.assertEqual(
+            repr(list(namespace.load_all(io.StringIO(content), engine="events"))),
+            repr(list(namespace.load_all(io.StringIO(content)))),
+        )
+
+    def test_events_unsupportedDocument_resumes(self):
+        content = u"a: 1\n---\na: !!set {x}\n---\na: 3\n"
+        self.assertEqual(
+            list(namespace.load_all(io.StringIO(content), engine="events")),
+            [namespace(a=1), namespace(a={"x"}), namespace(a=3)],
+        )
+
+    def test_columnar(self):
+        documents = namespace.load_all(
+            io.StringIO(u"- a: 1\n---\n- a: 2\n"), columnar=True
+        )
+        self.assertTrue(all(isinstance(d, columnarlist) for d in documents))
+
+    def test_unknownEngine(self):
+        with self.assertRaises(ValueError) as ctx:
+            namespace.load_all(io.StringIO(yamlStream), engine="bad")
+        self.assertEqual(format(ctx.exception), "Unknown load engine 'bad'")
+
+
+class DumpAll_Test(unittest.TestCase):
+
+    def documents(self):
+        for document in namespace.load_all(io.StringIO(yamlStream)):
+            yield document
+
+    def test_text(self):
+        self.assertEqual(namespace.dump_all(self.documents()), yamlStream)
+
+    def test_events(self):
+        self.assertEqual(
+            namespace.dump_all(self.documents(), engine="events"), yamlStream
+        )
+
+    def test_scalarDocuments(self):
+        documents = [1, "text", namespace(a=1), [1]]
+        self.assertEqual(
+            namespace.dump_all(documents, engine="events"),
+            namespace.dump_all(documents),
+        )
+
+    def test_stream(self):
+        output = io.StringIO()
+        namespace.dump_all(self.documents(), output)
+        self.assertEqual(output.getvalue(), yamlStream)
+
+    def test_path_roundtrip(self):
+        handle, filename = tempfile.mkstemp(suffix=".yaml")
+        os.close(handle)
+        try:
+            namespace.dump_all(self.documents(), filename, engine="events")
+            self.assertEqual(list(namespace.load_all(filename)), list(self.documents()))
+        finally:
+            os.unlink(filename)
+
+    def test_unknownEngine(self):
+        with self.assertRaises(ValueError) as ctx:
+            namespace.dump_all([], engine="bad")
+        self.assertEqual(format(ctx.exception), "Unknown dump engine 'bad'")
+
+
+yamlExport = u"""\
+source: meters
+created: 2024-01-31
+options: {a: 1}
+export:
+  version: 2
+  items:
+  - id: 1
+    kwh: 1.50
+    periods: [1, 2]
+  - id: 2
+    kwh: 2.25
+  - &last
+    id: 3
+  total: 3
+trailer: ignored
+"""
+
+
+class IterLoad_Test(unittest.TestCase):
+
+    def test_items(self):
+        items = namespace.iterload(io.StringIO(yamlExport), "export.items")
+        self.assertIsInstance(items, NamespaceStream)
+        self.assertEqual(
+            list(items),
+            [
+                namespace([("id", 1), ("kwh", Decimal("1.50")), ("periods", [1, 2])]),
+                namespace([("id", 2), ("kwh", Decimal("2.25"))]),
+                namespace(id=3),
+            ],
+        )
+
+    def test_header_scalarsBeforeSequence(self):
+        items = namespace.iterload(io.StringIO(yamlExport), "export.items")
+        self.assertEqual(
+            items.header,
+            namespace(
+                [
+                    ("source", "meters"),
+                    ("created", Date(2024, 1, 31)),
+                    ("export", namespace(version=2)),
+                ]
+            ),
+        )
+
+    def test_options(self):
+        content = u"items:\n- [{a: 1.5}, {a: 2.5}]\n"
+        items = list(namespace.iterload(io.StringIO(content), columnar=True))
+        self.assertIsInstance(items[0], columnarlist)
+        items = list(namespace.iterload(io.StringIO(content), floats="float"))
+        self.assertIs(type(items[0][0].a), float)
+        with self.assertRaises(ValueError):
+            namespace.iterload(io.StringIO(content), floats="bad")
+
+    def test_nonStringKeys(self):
+        content = u"2024:\n  true: [1, 2]\n"
+        items = namespace.iterload(io.StringIO(content), "2024.true")
+        self.assertEqual(list(items), [1, 2])
+
+    def test_oneAtATime(self):
+        items = namespace.iterload(io.StringIO(yamlExport + u"  - [\n"), "export.items")
+        self.assertEqual(next(items).id, 1)
+
+    def test_defaultPath(self):
+        items = namespace.iterload(io.StringIO(u"count: 2\nitems: [1, 2]\n"))
+        self.assertEqual(list(items), [1, 2])
+        self.assertEqual(items.header, namespace(count=2))
+
+    def test_rootSequence(self):
+        self.assertEqual(
+            list(namespace.iterload(io.StringIO(u"- 1\n- 2\n"), "")), [1, 2]
+        )
+
+    def test_emptySequence(self):
+        self.assertEqual(list(namespace.iterload(io.StringIO(u"items: []\n"))), [])
+
+    def test_aliasesBetweenItems(self):
+        items = list(namespace.iterload(io.StringIO(u"items:\n- &a {x: 1}\n- *a\n")))
+        self.assertIs(items[0], items[1])
+
+    def test_aliasesToSkippedCollections(self):
+        content = (
+            u"base: &b {k: 1}\nother: [&n 2, {x: &s [3]}]\nitems:\n- *b\n- *n\n- *s\n"
+        )
+        items = list(namespace.iterload(io.StringIO(content)))
+        self.assertEqual(items, [namespace(k=1), 2, [3]])
+
+    def test_aliasesToSkippedCollections_nestedPath(self):
+        content = u"export:\n  base: &b {k: 1}\n  items:\n  - *b\n"
+        items = list(namespace.iterload(io.StringIO(content), "export.items"))
+        self.assertEqual(items, [namespace(k=1)])
+
+    def test_aliasesToAnchoredKeys(self):
+        content = u"&k key: 1\nitems:\n- *k\n"
+        export = namespace.iterload(io.StringIO(content))
+        self.assertEqual(export.header, namespace(key=1))
+        self.assertEqual(list(export), [u"key"])
+
+    def test_missingPath(self):
+        for content in [u"", u"other: 1\n", u"- 1\n"]:
+            with self.assertRaises(KeyError):
+                namespace.iterload(io.StringIO(content), "items")
+
+    def test_notSequence(self):
+        with self.assertRaises(ValueError) as ctx:
+            namespace.iterload(io.StringIO(u"items: 3\n"))
+        self.assertEqual(format(ctx.exception), "Value at 'items' is not a sequence")
+
+    def test_path_closesFile(self):
+        handle, filename = tempfile.mkstemp(suffix=".yaml")
+        os.close(handle)
+        try:
+            with io.open(filename, "w", encoding="utf8") as f:
+                f.write(yamlExport)
+            with namespace.iterload(filename, "export.items") as items:
+                self.assertEqual(next(items).id, 1)
+            self.assertIsNone(items._file)
+            self.assertEqual(list(items), [])
+        finally:
+            os.unlink(filename)
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: sw=4 ts=4 noet